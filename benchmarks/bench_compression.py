@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+"""
+Compare the compression ratio and throughput of the Huffman and LZ77 codecs
+against zlib on the package's data files. Run `python -m benchmarks.bench_compression`
+from the project's root directory.
+"""
+
+import time
+import zlib
+from pathlib import Path
+
+from rich.table import Table
+from src.lolicon.compsci import compression
+from src.lolicon.utils import CONSOLE
+
+CORPUS = [
+    Path('src/lolicon/data/dictionary.txt'),
+    Path('src/lolicon/data/quadgrams.db'),
+    Path('src/lolicon/data/planets.db'),
+    Path('src/lolicon/compsci/cryptography.py'),
+]
+
+CODECS = {
+    'huffman': (compression.huffman_encode, compression.huffman_decode),
+    'lz77': (compression.lz77_encode, compression.lz77_decode),
+    'zlib': (zlib.compress, zlib.decompress),
+}
+
+def measure(function, data: bytes):
+    start = time.perf_counter()
+    result = function(data)
+    return result, time.perf_counter() - start
+
+def main() -> None:
+    table = Table(title="Compression")
+    table.add_column('File', style='cyan')
+    table.add_column('Size')
+    table.add_column('Codec')
+    table.add_column('Ratio', style='green')
+    table.add_column('Encode')
+    table.add_column('Decode')
+
+    for path in CORPUS:
+        data = path.read_bytes()
+        megabytes = len(data) / (1 << 20)
+        for name, (encode, decode) in CODECS.items():
+            compressed, encode_time = measure(encode, data)
+            restored, decode_time = measure(decode, compressed)
+            assert restored == data, f"{name} failed to restore {path.name}"
+            table.add_row(
+                path.name, f"{len(data) / 1024:.0f} KiB", name, f"{len(compressed) / len(data):.3f}",
+                f"{megabytes / encode_time:.2f} MB/s", f"{megabytes / decode_time:.2f} MB/s"
+            )
+
+    CONSOLE.print(table)
+
+if __name__ == '__main__':
+    main()
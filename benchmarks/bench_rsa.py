@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+"""
+Compare the running time of RSA decryption with and without the Chinese remainder
+theorem. Run `python -m benchmarks.bench_rsa` from the project's root directory.
+"""
+
+import timeit
+
+from rich.table import Table
+from src.lolicon.compsci import cryptography as crypto
+from src.lolicon.utils import CONSOLE
+
+
+def main(repeat: int=20) -> None:
+    table = Table(title="RSA Decryption")
+    table.add_column('Key Size', style='cyan')
+    table.add_column('pow(c, d, n)')
+    table.add_column('CRT')
+    table.add_column('Speedup', style='green')
+
+    for bits in (1024, 2048, 3072, 4096):
+        public_key, private_key = crypto.generate_rsa_keys(bits)
+        cypher = crypto.encrypt_rsa(int.from_bytes(b'The essence of mathematics lies in its freedom.', 'big'), public_key)
+        plain = min(timeit.repeat(lambda: crypto.decrypt_rsa(cypher, private_key, crt=False), number=1, repeat=repeat))
+        crt = min(timeit.repeat(lambda: crypto.decrypt_rsa(cypher, private_key, crt=True), number=1, repeat=repeat))
+        table.add_row(f"{bits} bits", f"{plain * 1000:.2f} ms", f"{crt * 1000:.2f} ms", f"{plain / crt:.2f}x")
+
+    CONSOLE.print(table)
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,7 @@
 #!/usr/bin/env python3
 
 from .compsci import *
+from .checksum import *
+from .compression import *
+from .profiler import *
 from .cryptography import *
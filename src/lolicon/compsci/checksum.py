@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+from ..utils import logger
+
+#region crc
+
+# width, polynomial, init, reflect, xorout and the checksum of b'123456789'
+# for each preset, see https://reveng.sourceforge.io/crc-catalogue/
+_crc_presets = {
+    'crc8': (8, 0x07, 0x00, False, 0x00, 0xF4),
+    'crc8-maxim': (8, 0x31, 0x00, True, 0x00, 0xA1),
+    'crc16-arc': (16, 0x8005, 0x0000, True, 0x0000, 0xBB3D),
+    'crc16-xmodem': (16, 0x1021, 0x0000, False, 0x0000, 0x31C3),
+    'crc16-ibm-3740': (16, 0x1021, 0xFFFF, False, 0x0000, 0x29B1),
+    'crc32': (32, 0x04C11DB7, 0xFFFFFFFF, True, 0xFFFFFFFF, 0xCBF43926),
+    'crc32c': (32, 0x1EDC6F41, 0xFFFFFFFF, True, 0xFFFFFFFF, 0xE3069283),
+    'crc32-bzip2': (32, 0x04C11DB7, 0xFFFFFFFF, False, 0xFFFFFFFF, 0xFC891918),
+    'crc64-xz': (64, 0x42F0E1EBA9EA3693, 2**64 - 1, True, 2**64 - 1, 0x995DC9BBDF1939FA),
+    'crc64-ecma-182': (64, 0x42F0E1EBA9EA3693, 0, False, 0, 0x6C40DF5F0B497347),
+}
+
+# inputs shorter than this are processed byte by byte in Python
+_crc_block_threshold = 1 << 14
+
+def _reflect(value: int, width: int) -> int:
+    return int(f"{value:0{width}b}"[::-1], 2)
+
+@lru_cache(maxsize=32)
+def _crc_table(width: int, poly: int, reflect: bool) -> Tuple[List[int], np.ndarray]:
+    """
+    Return the register update for each byte value as list and as `uint64` array.
+    """
+    mask, table = (1 << width) - 1, []
+    for byte in range(256):
+        if reflect:
+            crc = byte
+            for _ in range(8):
+                crc = (crc >> 1) ^ _reflect(poly, width) if crc & 1 else crc >> 1
+        else:
+            crc = byte << (width - 8)
+            for _ in range(8):
+                crc = ((crc << 1) ^ poly) & mask if crc >> (width - 1) else (crc << 1) & mask
+        table.append(crc)
+    return table, np.array(table, dtype=np.uint64)
+
+def _crc_bytewise(register: int, data: memoryview, width: int, poly: int, reflect: bool) -> int:
+    table, mask = _crc_table(width, poly, reflect)[0], (1 << width) - 1
+    if reflect:
+        for byte in data:
+            register = table[(register ^ byte) & 0xFF] ^ (register >> 8)
+    else:
+        shift = width - 8
+        for byte in data:
+            register = table[((register >> shift) ^ byte) & 0xFF] ^ ((register << 8) & mask)
+    return register
+
+def _apply_matrix(matrix: List[int], vector: int) -> int:
+    # the matrix over GF(2) is given as list of columns
+    result, i = 0, 0
+    while vector:
+        if vector & 1:
+            result ^= matrix[i]
+        vector >>= 1
+        i += 1
+    return result
+
+@lru_cache(maxsize=64)
+def _crc_shift_tables(width: int, poly: int, reflect: bool, length: int) -> np.ndarray:
+    """
+    Return the linear map that feeds `length` zero bytes into the register,
+    split into one lookup table per register byte.
+    """
+    # feeding a zero byte is linear in the register, its columns are the images of the unit vectors
+    step = [_crc_bytewise(1 << i, memoryview(b'\x00'), width, poly, reflect) for i in range(width)]
+    result = [1 << i for i in range(width)]
+    while length:
+        if length & 1:
+            result = [_apply_matrix(step, column) for column in result]
+        step = [_apply_matrix(step, column) for column in step]
+        length >>= 1
+    mask = (1 << width) - 1
+    return np.array([[_apply_matrix(result, (value << (8 * k)) & mask) for value in range(256)] for k in range((width + 7) // 8)], dtype=np.uint64)
+
+@lru_cache(maxsize=32)
+def _crc_slice_tables(width: int, poly: int, reflect: bool) -> np.ndarray:
+    """
+    Return the slicing-by-8 tables: row `m` holds the register after feeding each
+    byte value followed by `m` zero bytes into a cleared register.
+    """
+    table, mask = _crc_table(width, poly, reflect)[1], np.uint64((1 << width) - 1)
+    tables = [table]
+    for _ in range(7):
+        if reflect:
+            tables.append(table[tables[-1] & np.uint64(0xFF)] ^ (tables[-1] >> np.uint64(8)))
+        else:
+            tables.append(table[(tables[-1] >> np.uint64(width - 8)) & np.uint64(0xFF)] ^ ((tables[-1] << np.uint64(8)) & mask))
+    return np.array(tables)
+
+def _crc_blockwise(register: int, data: memoryview, width: int, poly: int, reflect: bool) -> int:
+    """
+    Split `data` into a power of two lanes of equal length and advance the
+    registers of all lanes in lockstep with NumPy, eight bytes at a time with
+    slicing-by-8 tables. Then merge neighbouring lanes pairwise by shifting the
+    left register past the right lane's bytes.
+    """
+    lanes = min(1 << 14, 1 << ((len(data) // 256).bit_length() - 1))
+    length = len(data) // (8 * lanes)
+    head = 8 * lanes * length
+    rows = np.frombuffer(data, dtype='<u8', count=head // 8).reshape(lanes, length).T.copy()
+    tables = _crc_slice_tables(width, poly, reflect)
+
+    registers = np.zeros(lanes, dtype=np.uint64)
+    registers[0] = register
+    for row in rows:
+        # the register overlaps with the first width / 8 bytes of the next word
+        if reflect:
+            word, shifts = row ^ registers, range(0, 64, 8)
+        else:
+            word, shifts = row.byteswap() ^ (registers << np.uint64(64 - width)), range(56, -8, -8)
+        registers = np.zeros(lanes, dtype=np.uint64)
+        for lookup, shift in zip(tables[::-1], shifts):
+            registers ^= lookup[(word >> np.uint64(shift)) & np.uint64(0xFF)]
+
+    length *= 8
+    while len(registers) > 1:
+        shift_tables, left = _crc_shift_tables(width, poly, reflect, length), registers[0::2]
+        shifted = np.zeros_like(left)
+        for k, lookup in enumerate(shift_tables):
+            shifted ^= lookup[(left >> np.uint64(8 * k)) & np.uint64(0xFF)]
+        registers, length = shifted ^ registers[1::2], 2 * length
+
+    return _crc_bytewise(int(registers[0]), data[head:], width, poly, reflect)
+
+def _crc_register(register: int, data, width: int, poly: int, reflect: bool) -> int:
+    data = memoryview(data).cast('B')
+    if len(data) < _crc_block_threshold:
+        return _crc_bytewise(register, data, width, poly, reflect)
+    return _crc_blockwise(register, data, width, poly, reflect)
+
+class CRC(object):
+    """
+    CRC
+    ===
+
+    Basic Usage
+    -----------
+        >>> from lolicon.compsci import CRC
+        >>> crc = CRC.preset('crc32')
+        >>> crc.update(b'1234').update(b'56789').value == 0xCBF43926
+        True
+        >>> hex(CRC(width=16, poly=0x1021, init=0xFFFF, reflect=False).checksum(b'123456789'))
+        '0x29b1'
+
+    Cyclic redundancy check of any width from 8 to 64 bits with an arbitrary
+    polynomial, initial register, reflection of input and output bits (which
+    are either both reflected or both not) and final XOR value. See
+    `_crc_presets` for common parameter sets.
+
+    The lookup tables of each parameter set are computed once and cached.
+    Inputs of at least 16 KiB are processed in up to 16384 equally long lanes at
+    once with NumPy and slicing-by-8 tables, and the lane registers are merged
+    with cached tables that represent appending a run of zero bytes.
+    """
+    def __init__(self, width: int=32, poly: int=0x04C11DB7, init: int=0xFFFFFFFF, reflect: bool=True, xorout: int=0xFFFFFFFF) -> CRC:
+        if not 8 <= width <= 64:
+            logger.error(f"Unsupported CRC width: {width=}")
+            raise ValueError(f"{width=} must be in range of [8, 64].")
+        self.__width, self.__poly, self.__reflect, self.__xorout = width, poly, reflect, xorout
+        self.__init = _reflect(init, width) if reflect else init
+        self.__register = self.__init
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(Width={self.__width}, Poly={self.__poly:#x}, Reflect={self.__reflect}, Value={self.value:#x})"
+
+    @staticmethod
+    def preset(name: str) -> CRC:
+        """
+        Create a CRC with one of the parameter sets in `_crc_presets`.
+        """
+        if name not in _crc_presets:
+            logger.error(f"Unknown CRC preset: {name=}")
+            raise ValueError(f"{name=} must be one of {', '.join(_crc_presets)}.")
+        width, poly, init, reflect, xorout, _ = _crc_presets[name]
+        return CRC(width, poly, init, reflect, xorout)
+
+    #region property
+
+    @property
+    def value(self) -> int:
+        """
+        Return the checksum of all data passed to `update` so far.
+        """
+        return self.__register ^ self.__xorout
+
+    #endregion
+
+    #region methods
+
+    def update(self, data) -> CRC:
+        """
+        Feed the bytes-like object `data` into the checksum and return `self`.
+        """
+        self.__register = _crc_register(self.__register, data, self.__width, self.__poly, self.__reflect)
+        return self
+
+    def reset(self) -> CRC:
+        """
+        Start over with the initial register.
+        """
+        self.__register = self.__init
+        return self
+
+    def checksum(self, data, value: int=None) -> int:
+        """
+        Return the checksum of `data` without changing the state of this object.
+        Pass the checksum of the preceding data as `value` to continue it, like
+        the `value` argument of `zlib.crc32`.
+        """
+        register = self.__init if value is None else value ^ self.__xorout
+        return _crc_register(register, data, self.__width, self.__poly, self.__reflect) ^ self.__xorout
+
+    #endregion
+
+def crc8(data, value: int=None) -> int:
+    """
+    Return the CRC-8 (SMBus) checksum of `data`, continuing `value` if given.
+    """
+    return CRC.preset('crc8').checksum(data, value)
+
+def crc16(data, value: int=None) -> int:
+    """
+    Return the CRC-16/ARC checksum of `data`, continuing `value` if given.
+    """
+    return CRC.preset('crc16-arc').checksum(data, value)
+
+def crc32(data, value: int=0) -> int:
+    """
+    Return the CRC-32 checksum of `data` as in `zlib.crc32`, continuing `value`.
+    """
+    return CRC.preset('crc32').checksum(data, value)
+
+def crc64(data, value: int=None) -> int:
+    """
+    Return the CRC-64/XZ checksum of `data`, continuing `value` if given.
+    """
+    return CRC.preset('crc64-xz').checksum(data, value)
+
+#endregion
+
+#region checksums
+
+def __running_sums(data: np.ndarray, first: int, second: int, modulus: int, block_size: int=1 << 16) -> Tuple[int, int]:
+    """
+    Add every element of `data` to `first` and every intermediate `first` to
+    `second`, both modulo `modulus`. Each block is reduced with two dot products:
+    the element `i` of a block of size `n` contributes `n - i` times to `second`.
+    """
+    for start in range(0, len(data), block_size):
+        block = data[start:start+block_size].astype(np.uint64)
+        weights = np.arange(len(block), 0, -1, dtype=np.uint64)
+        second = (second + len(block) * first + int(np.dot(block, weights) % np.uint64(modulus))) % modulus
+        first = (first + int(block.sum())) % modulus
+    return first, second
+
+def adler32(data, value: int=1) -> int:
+    """
+    Return the Adler-32 checksum of `data` as in `zlib.adler32`, continuing `value`.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import adler32
+    >>> hex(adler32(b'Wikipedia'))
+    '0x11e60398'
+    ```
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Adler-32>
+    """
+    data = np.frombuffer(memoryview(data).cast('B'), dtype=np.uint8)
+    first, second = __running_sums(data, value & 0xFFFF, value >> 16, 65521)
+    return second << 16 | first
+
+def fletcher(data, width: int=16, value: int=0) -> int:
+    """
+    Return the Fletcher checksum of `data` with a `width` of 16, 32 or 64 bits,
+    which sums little-endian words of half that width modulo `2^(width/2) - 1`.
+    The last word is filled with zero bytes. Pass the checksum of the preceding
+    data as `value` to continue it, which requires that the preceding data was
+    a multiple of the word size long.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import fletcher
+    >>> hex(fletcher(b'abcde', width=16)), hex(fletcher(b'abcde', width=32))
+    ('0xc8f0', '0xf04fc729')
+    ```
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Fletcher%27s_checksum>
+    """
+    if width not in (16, 32, 64):
+        logger.error(f"Unsupported Fletcher width: {width=}")
+        raise ValueError(f"{width=} must be one of 16, 32 or 64.")
+    half = width // 2
+    data = bytes(memoryview(data).cast('B'))
+    data += bytes(-len(data) % (half // 8))
+    words = np.frombuffer(data, dtype=f"<u{half // 8}")
+    first, second = __running_sums(words, value & ((1 << half) - 1), value >> half, (1 << half) - 1, block_size=1 << 12 if width == 64 else 1 << 16)
+    return second << half | first
+
+#endregion
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import heapq
+import io
+from typing import BinaryIO, List, Tuple
+
+import numpy as np
+
+from ..utils import logger
+
+#region bit streams
+
+class BitWriter(object):
+    """
+    BitWriter
+    =========
+
+    Basic Usage
+    -----------
+        >>> from lolicon.compsci import BitWriter
+        >>> writer = BitWriter()
+        >>> writer.write(0b101, 3)
+        >>> writer.write(0b11111, 5)
+        >>> writer.getvalue()
+        b'\\xbf'
+
+    Packs bit fields most significant bit first. Single fields are collected in
+    an integer accumulator that is drained into a byte buffer every few hundred
+    bits, while `write_codes` packs a whole array of variable-length codes at
+    once with NumPy. If a `target` file object is given, complete bytes are
+    written to it on `flush` and `close`, else `getvalue` returns all bytes.
+    """
+    def __init__(self, target: BinaryIO=None) -> BitWriter:
+        self.__target = target
+        self.__buffer = bytearray()
+        self.__accumulator = 0
+        self.__count = 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(Pending={8 * len(self.__buffer) + self.__count} bits)"
+
+    def write(self, value: int, nbits: int) -> None:
+        """
+        Append the `nbits` lowest bits of `value`.
+        """
+        self.__accumulator = (self.__accumulator << nbits) | (value & ((1 << nbits) - 1))
+        self.__count += nbits
+        if self.__count >= 256:
+            self.__drain()
+
+    def write_codes(self, codes: np.ndarray, lengths: np.ndarray) -> None:
+        """
+        Append `codes[i]` with `lengths[i]` bits for every `i`, which must not
+        exceed 32 bits each.
+        """
+        self.__drain()
+        shifts = np.arange(31, -1, -1, dtype=np.uint32)
+        bits = ((codes.astype(np.uint32)[:, None] >> shifts) & 1).astype(np.uint8)
+        bits = bits[shifts[None, :] < lengths[:, None]]
+        pending = np.array([(self.__accumulator >> i) & 1 for i in range(self.__count - 1, -1, -1)], dtype=np.uint8)
+        bits = np.concatenate((pending, bits))
+        complete = len(bits) & ~7
+        self.__buffer += np.packbits(bits[:complete]).tobytes()
+        self.__accumulator = int(''.join(map(str, bits[complete:].tolist())) or '0', 2)
+        self.__count = len(bits) - complete
+
+    def flush(self) -> None:
+        """
+        Write all complete bytes to the target.
+        """
+        self.__drain()
+        if self.__target is not None:
+            self.__target.write(self.__buffer)
+            self.__buffer.clear()
+
+    def close(self) -> None:
+        """
+        Pad the last byte with zero bits and flush.
+        """
+        if self.__count & 7:
+            self.write(0, 8 - (self.__count & 7))
+        self.flush()
+
+    def getvalue(self) -> bytes:
+        """
+        Close the stream and return the packed bytes if there is no target.
+        """
+        self.close()
+        return bytes(self.__buffer)
+
+    def __drain(self) -> None:
+        remainder, nbytes = self.__count & 7, self.__count >> 3
+        self.__buffer += (self.__accumulator >> remainder).to_bytes(nbytes, 'big')
+        self.__accumulator &= (1 << remainder) - 1
+        self.__count = remainder
+
+class BitReader(object):
+    """
+    BitReader
+    =========
+
+    Basic Usage
+    -----------
+        >>> from lolicon.compsci import BitReader
+        >>> reader = BitReader(b'\\xbf')
+        >>> reader.read(3), reader.read(5)
+        (5, 31)
+
+    Reads bit fields most significant bit first from `bytes` or a file object,
+    which is consumed in chunks. `peek` may look past the end of the stream,
+    the missing bits read as zeros, but consuming them raises an `EOFError`.
+    This allows table-driven decoders to always peek at their maximum code
+    length.
+    """
+    def __init__(self, source, chunksize: int=1 << 16) -> BitReader:
+        self.__source = io.BytesIO(source) if isinstance(source, (bytes, bytearray, memoryview)) else source
+        self.__chunksize = chunksize
+        self.__chunk, self.__position = b'', 0
+        self.__accumulator, self.__count, self.__padding = 0, 0, 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(Buffered={self.__count - self.__padding} bits)"
+
+    def peek(self, nbits: int) -> int:
+        """
+        Return the next `nbits` bits without consuming them.
+        """
+        if self.__count < nbits:
+            self.__refill(nbits)
+        return (self.__accumulator >> (self.__count - nbits)) & ((1 << nbits) - 1)
+
+    def skip(self, nbits: int) -> None:
+        """
+        Consume `nbits` bits.
+        """
+        if self.__count < nbits:
+            self.__refill(nbits)
+        self.__count -= nbits
+        if self.__count < self.__padding:
+            logger.error("Unexpected end of bit stream")
+            raise EOFError("Unexpected end of bit stream.")
+
+    def read(self, nbits: int) -> int:
+        """
+        Consume and return the next `nbits` bits.
+        """
+        value = self.peek(nbits)
+        self.skip(nbits)
+        return value
+
+    def __refill(self, nbits: int) -> None:
+        accumulator = self.__accumulator & ((1 << self.__count) - 1)
+        while self.__count < nbits:
+            if self.__position >= len(self.__chunk):
+                self.__chunk, self.__position = self.__source.read(self.__chunksize), 0
+                if not self.__chunk:
+                    self.__padding += nbits - self.__count
+                    accumulator <<= nbits - self.__count
+                    self.__count = nbits
+                    break
+            piece = self.__chunk[self.__position:self.__position + 8]
+            accumulator = (accumulator << (8 * len(piece))) | int.from_bytes(piece, 'big')
+            self.__count += 8 * len(piece)
+            self.__position += len(piece)
+        self.__accumulator = accumulator
+
+#endregion
+
+#region huffman
+
+def _huffman_lengths(frequencies: np.ndarray, limit: int=15) -> np.ndarray:
+    """
+    Return the code length of each symbol in an optimal prefix code for the
+    given `frequencies`. If a code exceeds `limit` bits, the frequencies are
+    halved (rounding up) until the tree is flat enough.
+    """
+    frequencies = frequencies.astype(np.int64)
+    symbols = np.flatnonzero(frequencies).tolist()
+    lengths = np.zeros(len(frequencies), dtype=np.int64)
+    if len(symbols) == 1:
+        lengths[symbols[0]] = 1
+        return lengths
+
+    while True:
+        heap = [(int(frequencies[symbol]), symbol, [symbol]) for symbol in symbols]
+        heapq.heapify(heap)
+        lengths[:] = 0
+        while len(heap) > 1:
+            weight1, tie, left = heapq.heappop(heap)
+            weight2, _, right = heapq.heappop(heap)
+            lengths[left + right] += 1
+            heapq.heappush(heap, (weight1 + weight2, tie, left + right))
+        if lengths.max(initial=0) <= limit:
+            return lengths
+        frequencies = np.where(frequencies > 0, (frequencies + 1) >> 1, 0)
+
+def _canonical_codes(lengths: np.ndarray) -> Tuple[np.ndarray, List[int]]:
+    """
+    Assign canonical codes: shorter codes come first, codes of equal length
+    are ordered by symbol. Return the codes and the symbols in code order.
+    """
+    order = sorted(np.flatnonzero(lengths).tolist(), key=lambda symbol: (lengths[symbol], symbol))
+    codes, code, previous = np.zeros(len(lengths), dtype=np.uint32), 0, 0
+    for symbol in order:
+        code <<= int(lengths[symbol]) - previous
+        codes[symbol], code, previous = code, code + 1, int(lengths[symbol])
+    return codes, order
+
+def _huffman_decode_table(lengths: np.ndarray) -> Tuple[List[int], int]:
+    """
+    Return a lookup table indexed by the next `width` bits of the stream, whose
+    entries hold the decoded symbol and its code length as `symbol << 4 | length`.
+    """
+    codes, order = _canonical_codes(lengths)
+    width = int(lengths.max(initial=1))
+    table = [0] * (1 << width)
+    for symbol in order:
+        length = int(lengths[symbol])
+        start, span = int(codes[symbol]) << (width - length), 1 << (width - length)
+        table[start:start + span] = [symbol << 4 | length] * span
+    return table, width
+
+def huffman_encode_stream(source: BinaryIO, target: BinaryIO, chunksize: int=1 << 16) -> None:
+    """
+    Compress the file object `source` chunk by chunk with canonical Huffman
+    codes and write the result to `target`. Each chunk is stored as its length
+    in 24 bits, the 4-bit code length of all 256 byte values and the codes,
+    and a zero length terminates the stream.
+    """
+    if not 0 < chunksize < 1 << 24:
+        logger.error(f"Unsupported Huffman chunk size: {chunksize=}")
+        raise ValueError(f"{chunksize=} must be in range of [1, 2^24).")
+    writer = BitWriter(target)
+    while chunk := source.read(chunksize):
+        symbols = np.frombuffer(chunk, dtype=np.uint8)
+        lengths = _huffman_lengths(np.bincount(symbols, minlength=256))
+        codes, _ = _canonical_codes(lengths)
+        writer.write(len(chunk), 24)
+        for length in lengths.tolist():
+            writer.write(length, 4)
+        writer.write_codes(codes[symbols], lengths[symbols])
+        writer.flush()
+    writer.write(0, 24)
+    writer.close()
+
+def huffman_decode_stream(source: BinaryIO, target: BinaryIO) -> None:
+    """
+    Decompress a stream written by `huffman_encode_stream`. Every symbol is
+    decoded with a single lookup of the next `max(code length)` bits.
+    """
+    reader = BitReader(source)
+    while size := reader.read(24):
+        lengths = np.array([reader.read(4) for _ in range(256)])
+        table, width = _huffman_decode_table(lengths)
+        peek, skip, output = reader.peek, reader.skip, bytearray(size)
+        for i in range(size):
+            entry = table[peek(width)]
+            output[i] = entry >> 4
+            skip(entry & 15)
+        target.write(output)
+
+def huffman_encode(data: bytes, chunksize: int=1 << 16) -> bytes:
+    """
+    Compress `data` with canonical Huffman codes, see `huffman_encode_stream`.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import huffman_encode, huffman_decode
+    >>> huffman_decode(huffman_encode(b'abracadabra'))
+    b'abracadabra'
+    ```
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Canonical_Huffman_code>
+    """
+    target = io.BytesIO()
+    huffman_encode_stream(io.BytesIO(data), target, chunksize)
+    return target.getvalue()
+
+def huffman_decode(data: bytes) -> bytes:
+    """
+    Decompress `data` that was compressed by `huffman_encode`.
+    """
+    target = io.BytesIO()
+    huffman_decode_stream(io.BytesIO(data), target)
+    return target.getvalue()
+
+#endregion
+
+#region lz77
+
+__min_match, __max_match = 3, 258
+
+def lz77_encode_stream(source: BinaryIO, target: BinaryIO, window_bits: int=15, max_chain: int=64, chunksize: int=1 << 16) -> None:
+    """
+    Compress the file object `source` with LZ77 over a sliding window of
+    `2^window_bits` bytes and write the result to `target`.
+
+    Matches are found with hash chains as in zlib: `head` maps each 3-byte
+    prefix onto its latest position and `chain` links every position in the
+    window to the previous one with the same prefix. At most `max_chain`
+    candidates are compared per position, the longest match wins. A token is
+    either a zero bit followed by a literal byte, or a one bit followed by the
+    match length minus 3 in 8 bits and the distance minus 1 in `window_bits`
+    bits. Each chunk is prefixed by its length in 24 bits, and the window
+    carries over from one chunk to the next.
+    """
+    if not 8 <= window_bits <= 15:
+        logger.error(f"Unsupported LZ77 window size: {window_bits=}")
+        raise ValueError(f"{window_bits=} must be in range of [8, 15].")
+    if not 0 < chunksize < 1 << 24:
+        logger.error(f"Unsupported LZ77 chunk size: {chunksize=}")
+        raise ValueError(f"{chunksize=} must be in range of [1, 2^24).")
+
+    window, writer = 1 << window_bits, BitWriter(target)
+    mask, match_flag = window - 1, 1 << (8 + window_bits)
+    head, chain = {}, [-1] * window
+    # buffer[0] is the byte at the absolute stream position base
+    buffer, base = bytearray(), 0
+    writer.write(window_bits, 4)
+
+    while chunk := source.read(chunksize):
+        position = base + len(buffer)
+        buffer += chunk
+        end = base + len(buffer)
+        writer.write(len(chunk), 24)
+
+        while position < end:
+            i, best_length, best_distance = position - base, 0, 0
+            limit = min(__max_match, end - position)
+            if limit >= __min_match:
+                candidate, budget = head.get(bytes(buffer[i:i+3]), -1), max_chain
+                while candidate >= 0 and position - candidate <= window and budget:
+                    j = candidate - base
+                    # only compare candidates that can beat the best match
+                    if buffer[j + best_length] == buffer[i + best_length]:
+                        length = __min_match
+                        while length + 16 <= limit and buffer[j+length:j+length+16] == buffer[i+length:i+length+16]:
+                            length += 16
+                        while length < limit and buffer[j + length] == buffer[i + length]:
+                            length += 1
+                        if length > best_length:
+                            best_length, best_distance = length, position - candidate
+                            if length == limit:
+                                break
+                    previous = chain[candidate & mask]
+                    candidate, budget = previous if previous < candidate else -1, budget - 1
+
+            if best_length >= __min_match:
+                writer.write(match_flag | (best_length - __min_match) << window_bits | (best_distance - 1), 9 + window_bits)
+            else:
+                best_length = 1
+                writer.write(buffer[i], 9)
+
+            for inserted in range(position, min(position + best_length, end - 2)):
+                key = bytes(buffer[inserted - base:inserted - base + 3])
+                chain[inserted & mask] = head.get(key, -1)
+                head[key] = inserted
+            position += best_length
+
+        writer.flush()
+        if len(buffer) > 2 * window:
+            base += len(buffer) - window
+            del buffer[:len(buffer) - window]
+
+    writer.write(0, 24)
+    writer.close()
+
+def lz77_decode_stream(source: BinaryIO, target: BinaryIO) -> None:
+    """
+    Decompress a stream written by `lz77_encode_stream`.
+    """
+    reader = BitReader(source)
+    window_bits = reader.read(4)
+    window, mask = 1 << window_bits, (1 << window_bits) - 1
+    history = bytearray()
+
+    while size := reader.read(24):
+        start = len(history)
+        while len(history) - start < size:
+            if not reader.read(1):
+                history.append(reader.read(8))
+                continue
+            token = reader.read(8 + window_bits)
+            length, distance = (token >> window_bits) + __min_match, (token & mask) + 1
+            offset = len(history) - distance
+            if distance >= length:
+                history += history[offset:offset + length]
+            else:
+                # the match overlaps with its own output, i.e. repeats the last distance bytes
+                history += (history[offset:] * (length // distance + 1))[:length]
+        target.write(history[start:])
+        if len(history) > 2 * window:
+            del history[:len(history) - window]
+
+def lz77_encode(data: bytes, window_bits: int=15, max_chain: int=64) -> bytes:
+    """
+    Compress `data` with LZ77, see `lz77_encode_stream`.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import lz77_encode, lz77_decode
+    >>> lz77_decode(lz77_encode(b'abcabcabcabc'))
+    b'abcabcabcabc'
+    ```
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/LZ77_and_LZ78>
+    - <https://github.com/madler/zlib/blob/master/doc/algorithm.txt>
+    """
+    target = io.BytesIO()
+    lz77_encode_stream(io.BytesIO(data), target, window_bits, max_chain)
+    return target.getvalue()
+
+def lz77_decode(data: bytes) -> bytes:
+    """
+    Decompress `data` that was compressed by `lz77_encode`.
+    """
+    target = io.BytesIO()
+    lz77_decode_stream(io.BytesIO(data), target)
+    return target.getvalue()
+
+#endregion
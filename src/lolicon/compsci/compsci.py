@@ -2,24 +2,631 @@
 
 from __future__ import annotations
 
-import math
+import mmap
+import os
+import string
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from ..utils import logger
+
+__digits = string.digits + string.ascii_lowercase
+
+# digit values of '0'-'9', 'a'-'z' and 'A'-'Z', 255 marks characters outside of any base
+__digit_values = np.full(128, 255, dtype=np.uint8)
+__digit_values[np.frombuffer((string.digits + string.ascii_lowercase).encode(), dtype=np.uint8)] = np.arange(36)
+__digit_values[np.frombuffer(string.ascii_uppercase.encode(), dtype=np.uint8)] = np.arange(10, 36)
+
+# numbers with at most this many digits are converted directly, larger ones are split in halves
+__leaf_digits = 512
+
+def __validate_base(base: int) -> None:
+    if not 2 <= base <= 36:
+        logger.error(f"Unsupported base: {base=}")
+        raise ValueError(f"{base=} must be in range of [2, 36].")
+
+def __leaf_to_base(n: int, base: int) -> str:
+    digits = []
+    while n:
+        n, r = divmod(n, base)
+        digits.append(__digits[r])
+    return ''.join(reversed(digits))
+
+def to_base(n: int, base: int=2, padding: int=0) -> str:
+    """
+    Convert the integer `n` into its representation in `base` in range of
+    `[2, 36]` with the digits `0-9a-z`, filled with zeros to at least `padding`
+    digits. Negative numbers are prefixed with a minus sign.
+
+    Large numbers are converted by divide and conquer: `n` is split at the
+    largest power `base^(k * 2^i)` below it, and both halves are converted
+    recursively, so that most of the work is done by a few big divisions
+    instead of one division per digit.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import to_base
+    >>> to_base(255, 16)
+    'ff'
+    >>> to_base(-5, 2, padding=8)
+    '-00000101'
+    ```
+    """
+    __validate_base(base)
+    if n < 0:
+        return '-' + to_base(-n, base, padding)
+    if base in (2, 8, 16):
+        return format(n, {2: 'b', 8: 'o', 16: 'x'}[base]).rjust(padding, '0')
+
+    powers = [base ** __leaf_digits]
+    while powers[-1] ** 2 <= n:
+        powers.append(powers[-1] ** 2)
+
+    def convert(n: int, i: int, width: int) -> str:
+        # n < powers[i]^2, the result is padded to width digits unless width is zero
+        if i < 0:
+            return __leaf_to_base(n, base).rjust(width, '0')
+        high, low = divmod(n, powers[i])
+        low_width = __leaf_digits << i
+        if not width and not high:
+            return convert(low, i - 1, 0)
+        return convert(high, i - 1, max(width - low_width, 0)) + convert(low, i - 1, low_width)
+
+    return (convert(n, len(powers) - 1, 0) or '0').rjust(padding, '0')
+
+def from_base(digits: str, base: int=2) -> int:
+    """
+    Convert the string `digits` in `base` in range of `[2, 36]` into an integer.
+    Digits are case-insensitive and may be preceded by a minus sign.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import from_base
+    >>> from_base('ff', 16)
+    255
+    ```
+
+    Note
+    ----
+    - Bases that are powers of two are parsed by `int` in linear time. Other
+    bases are split in halves recursively, which also sidesteps the limit on
+    the length of decimal strings that `int` accepts since Python 3.11.
+    """
+    __validate_base(base)
+    sign, digits = (-1, digits[1:]) if digits.startswith('-') else (1, digits)
+    if not digits or digits.lower().translate(dict.fromkeys(map(ord, __digits[:base]))):
+        logger.error(f"Invalid digits for {base=}: {digits=}")
+        raise ValueError(f"{digits=} is not a valid number in {base=}.")
+    if base & (base - 1) == 0:
+        return sign * int(digits, base)
+
+    def convert(digits: str) -> int:
+        if len(digits) <= __leaf_digits:
+            return int(digits, base)
+        middle = len(digits) // 2
+        return convert(digits[:middle]) * base ** (len(digits) - middle) + convert(digits[middle:])
+
+    return sign * convert(digits)
+
+def to_base_array(values: np.ndarray, base: int=2, width: int=None) -> np.ndarray:
+    """
+    Convert an array of non-negative integers into an array of digit strings in
+    `base`, each zero-filled to `width` digits. By default, `width` is the
+    number of digits of the largest value. Negative values must be mapped onto
+    unsigned ones with `twos_complement` first.
+
+    Example
+    -------
+    ```
+    >>> import numpy as np
+    >>> from lolicon.compsci import to_base_array
+    >>> to_base_array(np.array([1, 5, 10]), 2)
+    array(['0001', '0101', '1010'], dtype='<U4')
+    ```
+    """
+    __validate_base(base)
+    values = np.asarray(values)
+    if values.size and values.min() < 0:
+        logger.error(f"Negative values in array: {values.min()=}")
+        raise ValueError("Values must be non-negative, use twos_complement for signed integers.")
+    values = values.astype(np.uint64)
+    if width is None:
+        width = max(len(to_base(int(values.max()), base)) if values.size else 1, 1)
+
+    # one column per digit, most significant first
+    digits = np.empty(values.shape + (width,), dtype=np.uint32)
+    remainder = values.copy()
+    for column in range(width - 1, -1, -1):
+        digits[..., column] = remainder % base
+        remainder //= base
+    if remainder.any():
+        logger.error(f"Values don't fit into {width=} digits in {base=}")
+        raise ValueError(f"Values don't fit into {width=} digits in {base=}.")
+
+    codes = np.frombuffer(__digits.encode('utf-32-le'), dtype=np.uint32)[digits]
+    return np.ascontiguousarray(codes).view(f'<U{width}').reshape(values.shape)
+
+def from_base_array(strings: np.ndarray, base: int=2) -> np.ndarray:
+    """
+    Convert an array of digit strings in `base` into an array of `np.uint64`,
+    the inverse of `to_base_array`. Values beyond 64 bits raise a `ValueError`.
+
+    Example
+    -------
+    ```
+    >>> import numpy as np
+    >>> from lolicon.compsci import from_base_array
+    >>> from_base_array(np.array(['ff', '10', '7']), 16)
+    array([255,  16,   7], dtype=uint64)
+    ```
+    """
+    __validate_base(base)
+    strings = np.asarray(strings, dtype=str)
+    width = max(strings.dtype.itemsize // 4, 1)
+    codes = np.ascontiguousarray(strings).view(np.uint32).reshape(strings.shape + (width,))
+    digits = __digit_values[np.minimum(codes, 127)]
+    # numpy pads shorter strings with trailing NUL characters
+    present = codes != 0
+    if np.any(present & (digits >= base)) or not present[..., 0].all():
+        logger.error(f"Invalid digits for {base=} in array")
+        raise ValueError(f"Strings contain invalid digits for {base=}.")
+
+    result, limit = np.zeros(strings.shape, dtype=np.uint64), np.uint64(2**64 - 1)
+    for column in range(width):
+        digit = digits[..., column].astype(np.uint64)
+        # result * base + digit must not exceed 2^64 - 1
+        if np.any(present[..., column] & (result > (limit - digit) // np.uint64(base))):
+            logger.error(f"Values exceed 64 bits for {base=} in array")
+            raise ValueError(f"Strings encode values that do not fit into 64 bits for {base=}.")
+        result = np.where(present[..., column], result * np.uint64(base) + digit, result)
+    return result
+
+def twos_complement(value, bits: int):
+    """
+    Return the unsigned integer whose `bits` lowest bits encode the signed
+    `value` in two's complement. `value` may be an integer or, for `bits <= 64`,
+    an integer array, in which case an `np.uint64` array is returned.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import twos_complement, to_base
+    >>> to_base(twos_complement(-5, 8), 2)
+    '11111011'
+    ```
+    """
+    low, high = -(1 << (bits - 1)), 1 << (bits - 1)
+    if isinstance(value, np.ndarray):
+        if bits > 64:
+            logger.error(f"Unsupported bit width for arrays: {bits=}")
+            raise ValueError(f"{bits=} must not exceed 64 for arrays.")
+        if value.size and (value.min() < low or value.max() >= high):
+            logger.error(f"Values out of range for {bits=}: {value.min()=}, {value.max()=}")
+            raise ValueError(f"Values must be in range of [{low}, {high}) for {bits=}.")
+        return value.astype(np.int64).view(np.uint64) & np.uint64((1 << bits) - 1)
+    if not low <= value < high:
+        logger.error(f"Value out of range: {value=}, {bits=}")
+        raise ValueError(f"{value=} must be in range of [{low}, {high}) for {bits=}.")
+    return value & ((1 << bits) - 1)
+
+def from_twos_complement(value, bits: int):
+    """
+    Return the signed integer encoded by the `bits` lowest bits of the unsigned
+    `value` in two's complement, the inverse of `twos_complement`. Arrays are
+    returned as `np.int64` arrays.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import from_twos_complement, from_base
+    >>> from_twos_complement(from_base('11111011'), 8)
+    -5
+    ```
+    """
+    if isinstance(value, np.ndarray):
+        if bits > 64:
+            logger.error(f"Unsupported bit width for arrays: {bits=}")
+            raise ValueError(f"{bits=} must not exceed 64 for arrays.")
+        sign = np.uint64(1 << (bits - 1))
+        value = value.astype(np.uint64)
+        if bits < 64 and np.any(value >> np.uint64(bits)):
+            logger.error(f"Values exceed {bits=}")
+            raise ValueError(f"Values must be in range of [0, 2^{bits}).")
+        return ((value ^ sign) - sign).view(np.int64)
+    if not 0 <= value < 1 << bits:
+        logger.error(f"Value out of range: {value=}, {bits=}")
+        raise ValueError(f"{value=} must be in range of [0, 2^{bits}).")
+    return value - (1 << bits) if value >> (bits - 1) else value
 
 def dec2bin(dec: int, padding: int=8) -> str:
     """
     Suppose that `dec` is an unsigned integer. Convert this number into its
     binary representation. Adjust `padding` to fill the binary number string
-    with zeros (set to one byte by default).
+    with zeros (set to one byte by default). See `to_base` for other bases.
     """
-    bin_ = []
-    while dec != 0:
-        dec, r = divmod(dec, 2)
-        bin_.append(str(r))
-    return ''.join(reversed(bin_)).rjust(padding, '0')
+    return to_base(dec, 2, padding)
 
 
 def bin2dec(bin_: str) -> int:
     """
     Suppose that `bin` is a valid binary number. Convert this number into its
-    decimal representation.
+    decimal representation. See `from_base` for other bases.
+    """
+    return from_base(bin_, 2)
+
+def _popcounts(words: np.ndarray) -> np.ndarray:
+    """
+    Return the number of set bits in each element of the `uint64` array `words`.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).astype(np.uint64)
+    # SWAR: sum neighbouring bit fields of doubling width in parallel
+    words = words - ((words >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    words = (words & np.uint64(0x3333333333333333)) + ((words >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    words = (words + (words >> np.uint64(4))) & np.uint64(0x0f0f0f0f0f0f0f0f)
+    return (words * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+def _popcount(words: np.ndarray, chunksize: int=1 << 20) -> int:
+    """
+    Return the total number of set bits in the `uint64` array `words`, processed
+    in chunks to keep the temporaries small.
+    """
+    return sum(int(_popcounts(words[start:start+chunksize]).sum()) for start in range(0, len(words), chunksize))
+
+class BitVector(object):
     """
-    return int(sum(map(lambda i: int(bin_[::-1][i]) * math.pow(2, i), range(len(bin_)))))
+    BitVector
+    =========
+
+    Basic Usage
+    -----------
+        >>> from lolicon.compsci import BitVector
+        >>> bits = BitVector(1000)
+        >>> bits[10:500] = True
+        >>> bits[::3] = False
+        >>> bits.count(), bits.rank(100), bits.select(0)
+        (327, 60, 10)
+        >>> (bits >> 10).select(0)
+        0
+
+    Fixed-size array of bits packed into little-endian `uint64` words, stored in
+    a `bytearray`, any writable buffer or a memory-mapped file. Bit `i` lives in
+    bit `i % 64` of word `i // 64`, or equivalently in bit `i % 8` of byte
+    `i // 8`, so the serialized layout doesn't depend on the platform.
+
+    Slice assignments with unit step fill whole words at once, counting bits
+    uses a SWAR popcount over all words, and the bitwise operators work on the
+    word arrays. `rank` and `select` use a directory with the cumulative bit
+    count of every 512-bit block, which is built on demand and discarded by
+    every mutating method; writing through `words` or `buffer` bypasses this
+    bookkeeping, so call `rank` and `select` only afterwards.
+    """
+    __block_words = 8
+
+    def __init__(self, size: int, buffer=None) -> BitVector:
+        """
+        Create a vector of `size` cleared bits, or wrap the first `ceil(size / 64)`
+        words of `buffer` without copying. Bits beyond `size` in the last word
+        of a writable buffer are cleared.
+        """
+        if size < 0:
+            logger.error(f"Negative bit vector size: {size=}")
+            raise ValueError(f"{size=} must be non-negative.")
+        if buffer is not None and len(memoryview(buffer).cast('B')) < 8 * ((size + 63) // 64):
+            logger.error(f"Buffer is too small for {size=}: {len(memoryview(buffer).cast('B'))=}")
+            raise ValueError(f"The buffer must hold {(size + 63) // 64} words of 8 bytes for {size} bits.")
+        self.__size = size
+        self.__buffer = bytearray(8 * ((size + 63) // 64)) if buffer is None else buffer
+        self.__words = np.frombuffer(self.__buffer, dtype='<u8', count=(size + 63) // 64)
+        self.__directory = None
+        if self.__words.flags.writeable:
+            self.__clear_tail()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(Size={self.__size}, Backing={type(self.__buffer).__name__})"
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __enter__(self) -> BitVector:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # only the bytes covered by the slice are unpacked
+            positions = range(*index.indices(self.__size))
+            if not positions:
+                return BitVector(0)
+            first = min(positions[0], positions[-1]) >> 3
+            last = (max(positions[0], positions[-1]) >> 3) + 1
+            stop = positions.stop - 8 * first
+            bits = np.unpackbits(self.__words.view(np.uint8)[first:last], bitorder='little')
+            bits = bits[positions.start - 8 * first:stop if stop >= 0 else None:positions.step]
+            packed, result = np.packbits(bits, bitorder='little'), BitVector(len(bits))
+            result.words.view(np.uint8)[:len(packed)] = packed
+            return result
+        if isinstance(index, np.ndarray):
+            index = self.__check_indices(index)
+            return (self.__words[index >> 6] >> (index & 63).astype(np.uint64)) & np.uint64(1) == 1
+        index = self.__check_index(index)
+        return bool(int(self.__words[index >> 6]) >> (index & 63) & 1)
+
+    def __setitem__(self, index, value: bool) -> None:
+        self.__directory = None
+        if isinstance(index, slice) and index.step in (None, 1):
+            start, stop, _ = index.indices(self.__size)
+            self.__fill(start, stop, value)
+        elif isinstance(index, slice):
+            # strided slices are set in chunks of indices to bound the memory
+            positions = range(*index.indices(self.__size))
+            positions = positions[::-1] if positions.step < 0 else positions
+            for chunk in range(0, len(positions), 1 << 20):
+                part = positions[chunk:chunk + (1 << 20)]
+                self.__set_range(np.arange(part.start, part.stop, part.step, dtype=np.int64), value)
+        elif isinstance(index, np.ndarray):
+            self.__set_indices(self.__check_indices(index), value)
+        else:
+            index = self.__check_index(index)
+            mask = np.uint64(1 << (index & 63))
+            self.__words[index >> 6] = self.__words[index >> 6] | mask if value else self.__words[index >> 6] & ~mask
+
+    def __eq__(self, other: BitVector) -> bool:
+        return isinstance(other, BitVector) and len(self) == len(other) and np.array_equal(self.__words, other.words)
+
+    def __and__(self, other: BitVector) -> BitVector:
+        return self.__combine(other, np.bitwise_and)
+
+    def __or__(self, other: BitVector) -> BitVector:
+        return self.__combine(other, np.bitwise_or)
+
+    def __xor__(self, other: BitVector) -> BitVector:
+        return self.__combine(other, np.bitwise_xor)
+
+    def __iand__(self, other: BitVector) -> BitVector:
+        return self.__combine(other, np.bitwise_and, inplace=True)
+
+    def __ior__(self, other: BitVector) -> BitVector:
+        return self.__combine(other, np.bitwise_or, inplace=True)
+
+    def __ixor__(self, other: BitVector) -> BitVector:
+        return self.__combine(other, np.bitwise_xor, inplace=True)
+
+    def __invert__(self) -> BitVector:
+        result = BitVector(self.__size)
+        np.invert(self.__words, out=result.words)
+        result.__clear_tail()
+        return result
+
+    def __lshift__(self, shift: int) -> BitVector:
+        """
+        Move bit `i` to position `i + shift`, bits shifted past the end are lost.
+        """
+        self.__check_shift(shift)
+        result, (q, r) = BitVector(self.__size), divmod(shift, 64)
+        words, target, n = self.__words, result.words, len(self.__words)
+        if q < n:
+            target[q:] = words[:n-q] << np.uint64(r)
+            if r:
+                target[q+1:] |= words[:n-q-1] >> np.uint64(64 - r)
+        result.__clear_tail()
+        return result
+
+    def __rshift__(self, shift: int) -> BitVector:
+        """
+        Move bit `i` to position `i - shift`, bits shifted past the start are lost.
+        """
+        self.__check_shift(shift)
+        result, (q, r) = BitVector(self.__size), divmod(shift, 64)
+        words, target, n = self.__words, result.words, len(self.__words)
+        if q < n:
+            target[:n-q] = words[q:] >> np.uint64(r)
+            if r:
+                target[:n-q-1] |= words[q+1:] << np.uint64(64 - r)
+        return result
+
+    @staticmethod
+    def frombuffer(buffer, size: int=None) -> BitVector:
+        """
+        Wrap `buffer` without copying, e.g. the `buffer` of another vector or the
+        bytes read from a file. By default, the vector spans the whole buffer,
+        whose length must be a multiple of 8 bytes.
+        """
+        return BitVector(8 * len(memoryview(buffer).cast('B')) if size is None else size, buffer)
+
+    @staticmethod
+    def open(path: str, size: int=None) -> BitVector:
+        """
+        Map the file at `path` into memory, so that vectors larger than the
+        available memory can be processed. The file is created or extended to
+        hold `size` bits, which defaults to all bits in an existing file.
+        """
+        path = Path(path)
+        if size is None:
+            size = 8 * path.stat().st_size
+        with open(path, mode='r+b' if path.exists() else 'w+b') as file_handler:
+            nbytes = 8 * ((size + 63) // 64)
+            if os.fstat(file_handler.fileno()).st_size < nbytes:
+                file_handler.truncate(nbytes)
+            return BitVector(size, mmap.mmap(file_handler.fileno(), 0)) if nbytes else BitVector(0)
+
+    #region property
+
+    @property
+    def words(self) -> np.ndarray:
+        """
+        Return the little-endian `uint64` words, a view into the underlying buffer.
+        """
+        return self.__words
+
+    @property
+    def buffer(self) -> memoryview:
+        """
+        Return a byte view into the underlying buffer, e.g. to write it to a file
+        without copying.
+        """
+        return self.__words.view(np.uint8).data
+
+    #endregion
+
+    #region methods
+
+    def count(self) -> int:
+        """
+        Return the number of set bits.
+        """
+        return _popcount(self.__words)
+
+    def rank(self, index: int) -> int:
+        """
+        Return the number of set bits in range of `[0, index)`.
+        """
+        if not 0 <= index <= self.__size:
+            raise IndexError(f"{index=} is out of range for a vector of {self.__size} bits.")
+        directory, word = self.__build_directory(), index >> 6
+        result = int(directory[word // self.__block_words])
+        result += _popcount(self.__words[word // self.__block_words * self.__block_words:word])
+        if index & 63:
+            result += bin(int(self.__words[word]) & ((1 << (index & 63)) - 1)).count('1')
+        return result
+
+    def select(self, rank: int) -> int:
+        """
+        Return the position of the set bit with the zero-based `rank`, i.e. the
+        smallest index `i` such that `rank(i + 1) == rank + 1`.
+        """
+        directory = self.__build_directory()
+        if not 0 <= rank < directory[-1]:
+            raise IndexError(f"{rank=} is out of range for a vector with {int(directory[-1])} set bits.")
+        block = int(np.searchsorted(directory, rank, side='right')) - 1
+        words = self.__words[block * self.__block_words:(block + 1) * self.__block_words]
+        counts = np.cumsum(_popcounts(words))
+        word = int(np.searchsorted(counts, rank - directory[block], side='right'))
+        remaining = int(rank - directory[block] - (counts[word - 1] if word else 0))
+        bits = np.flatnonzero(np.unpackbits(words[word:word+1].view(np.uint8), bitorder='little'))
+        return 64 * (block * self.__block_words + word) + int(bits[remaining])
+
+    def hamming(self, other: BitVector) -> int:
+        """
+        Return the number of positions at which `self` and `other` differ.
+        """
+        self.__check_size(other)
+        chunksize = 1 << 20
+        return sum(_popcount(self.__words[start:start+chunksize] ^ other.words[start:start+chunksize]) for start in range(0, len(self.__words), chunksize))
+
+    def indices(self) -> np.ndarray:
+        """
+        Return the positions of all set bits in ascending order. Words are
+        unpacked block by block to bound the memory of the temporaries.
+        """
+        chunksize, positions = 1 << 16, [np.empty(0, dtype=np.int64)]
+        for start in range(0, len(self.__words), chunksize):
+            bits = np.unpackbits(self.__words[start:start+chunksize].view(np.uint8), count=min(64 * chunksize, self.__size - 64 * start), bitorder='little')
+            positions.append(np.flatnonzero(bits) + 64 * start)
+        return np.concatenate(positions)
+
+    def tobytes(self) -> bytes:
+        """
+        Return a copy of the packed bits.
+        """
+        return self.__words.tobytes()
+
+    def flush(self) -> None:
+        """
+        Write changes to a memory-mapped file back to disk.
+        """
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.flush()
+
+    def close(self) -> None:
+        """
+        Flush and unmap a memory-mapped file. The vector can't be used afterwards.
+        """
+        self.flush()
+        self.__words = None
+        if isinstance(self.__buffer, mmap.mmap):
+            self.__buffer.close()
+
+    #endregion
+
+    #region helpers
+
+    def __check_index(self, index: int) -> int:
+        if not -self.__size <= index < self.__size:
+            raise IndexError(f"{index=} is out of range for a vector of {self.__size} bits.")
+        return index % self.__size
+
+    def __check_indices(self, index: np.ndarray) -> np.ndarray:
+        index = np.flatnonzero(index) if index.dtype == bool else index.astype(np.int64)
+        if index.size and (index.min() < -self.__size or index.max() >= self.__size):
+            raise IndexError(f"Indices are out of range for a vector of {self.__size} bits.")
+        return index % max(self.__size, 1)
+
+    def __check_shift(self, shift: int) -> None:
+        if shift < 0:
+            logger.error(f"Negative shift count: {shift=}")
+            raise ValueError(f"{shift=} must be non-negative.")
+
+    def __check_size(self, other: BitVector) -> None:
+        if len(other) != self.__size:
+            logger.error(f"Bit vector sizes differ: {self.__size=}, {len(other)=}")
+            raise ValueError(f"Bit vectors must have the same size, got {self.__size} and {len(other)}.")
+
+    def __combine(self, other: BitVector, operator: Callable, inplace: bool=False) -> BitVector:
+        self.__check_size(other)
+        result = self if inplace else BitVector(self.__size)
+        operator(self.__words, other.words, out=result.words)
+        result.__directory = None
+        return result
+
+    def __clear_tail(self) -> None:
+        if self.__size & 63:
+            self.__words[-1] &= np.uint64((1 << (self.__size & 63)) - 1)
+
+    def __set_indices(self, index: np.ndarray, value: bool) -> None:
+        masks = np.left_shift(np.uint64(1), (index & 63).astype(np.uint64))
+        if value:
+            np.bitwise_or.at(self.__words, index >> 6, masks)
+        else:
+            np.bitwise_and.at(self.__words, index >> 6, ~masks)
+
+    def __set_range(self, index: np.ndarray, value: bool) -> None:
+        # ascending indices with a constant step: each word is hit at most once
+        # for large steps, else the words in between are unpacked and repacked
+        if len(index) > 1 and index[1] - index[0] < 64:
+            first, last = index[0] >> 6, (index[-1] >> 6) + 1
+            bits = np.unpackbits(self.__words[first:last].view(np.uint8), bitorder='little')
+            bits[index - 64 * first] = value
+            self.__words[first:last] = np.packbits(bits, bitorder='little').view('<u8')
+        elif value:
+            self.__words[index >> 6] |= np.left_shift(np.uint64(1), (index & 63).astype(np.uint64))
+        else:
+            self.__words[index >> 6] &= ~np.left_shift(np.uint64(1), (index & 63).astype(np.uint64))
+
+    def __fill(self, start: int, stop: int, value: bool) -> None:
+        if start >= stop:
+            return
+        first, last = start >> 6, (stop - 1) >> 6
+        head = np.uint64(((1 << 64) - 1) ^ ((1 << (start & 63)) - 1))
+        tail = np.uint64((1 << (((stop - 1) & 63) + 1)) - 1)
+        if first == last:
+            head &= tail
+        for word, mask in ((first, head), (last, tail)) if first != last else ((first, head),):
+            self.__words[word] = self.__words[word] | mask if value else self.__words[word] & ~mask
+        self.__words[first+1:last] = np.uint64((1 << 64) - 1) if value else 0
+
+    def __build_directory(self) -> np.ndarray:
+        # cumulative number of set bits before each block of words
+        if self.__directory is None:
+            padded = np.zeros(-(-len(self.__words) // self.__block_words) * self.__block_words, dtype=np.int64)
+            padded[:len(self.__words)] = _popcounts(self.__words)
+            self.__directory = np.concatenate(([0], np.cumsum(padded.reshape(-1, self.__block_words).sum(axis=1))))
+        return self.__directory
+
+    #endregion
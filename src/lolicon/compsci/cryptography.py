@@ -25,14 +25,37 @@
 
 """
 
+from __future__ import annotations
+
 import math
+import mmap
+import os
+import secrets
 import string
-from random import randint
-from typing import Tuple
+import time
+import zlib
+from collections import namedtuple
+from bisect import bisect_right
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from importlib.resources import path as resource_path
+from itertools import chain, compress, islice, permutations
+from pathlib import Path
+from random import randint, randrange
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
 
 from .. import utils
-from ..mathematics import gcd, mod_inverse
-from ..compsci import dec2bin, bin2dec
+from ..mathematics import gcd, is_prime, mod_inverse
+from ..compsci import BitVector, dec2bin, bin2dec
 from ..utils import logger
 
 __warning_msg = "You're using an cryptographically insecure method."
@@ -97,20 +120,30 @@ def encrypt_morse_code(msg: str) -> str:
     ----------
     - <https://en.wikipedia.org/wiki/Morse_code>
     """
-    try:
-        return ' '.join((__morse_code[char if char.isdigit() else char.upper()] for char in msg.replace(' ', '')))
-    except KeyError:
-        logger.error(f"Original message contained illegal characters: {msg=}", exc_info=True)
-        raise ValueError(f"You may only use {','.join(string.ascii_letters)} and {','.join(string.digits)} in your message.")
+    func, args = __morse()
+    return func(msg, *args)
 
 def decrypt_morse_code(cypher: str) -> str:
     """
     Decrypt a in morse encrypted message by using the ITU standard. The resulting
     message will be in uppercase and stripped off all whitespaces.
     """
-    translate = {value: key for key, value in __morse_code.items()}
+    func, args = __morse(decrypt=True)
+    return func(cypher, *args)
+
+def __encrypt_morse(msg: str) -> str:
+    try:
+        return ' '.join((__morse_code[char if char.isdigit() else char.upper()] for char in msg.replace(' ', '')))
+    except KeyError:
+        logger.error(f"Original message contained illegal characters: {msg=}", exc_info=True)
+        raise ValueError(f"You may only use {','.join(string.ascii_letters)} and {','.join(string.digits)} in your message.")
+
+def __decrypt_morse(cypher: str, translate: Dict[str, str]) -> str:
     return ''.join(translate[char] for char in cypher.split(' '))
 
+def __morse(decrypt: bool=False) -> Tuple[Callable, tuple]:
+    return (__decrypt_morse, ({value: key for key, value in __morse_code.items()},)) if decrypt else (__encrypt_morse, ())
+
 @utils.raise_warning(__warning_msg)
 def encrypt_binary(msg: str) -> str:
     """
@@ -156,14 +189,25 @@ def encrypt_binary(msg: str) -> str:
     - <https://en.wikipedia.org/wiki/Character_encoding>
     - <https://en.wikipedia.org/wiki/Binary_number>
     """
-    return ' '.join((dec2bin(ord(char)) for char in msg))
+    func, args = __binary()
+    return func(msg, *args)
 
 def decrypt_binary(cypher: str) -> str:
     """
     Decrypts a binary message by mapping their value to UTF-8.
     """
+    func, args = __binary(decrypt=True)
+    return func(cypher, *args)
+
+def __encrypt_binary(msg: str) -> str:
+    return ' '.join((dec2bin(ord(char)) for char in msg))
+
+def __decrypt_binary(cypher: str) -> str:
     return ''.join((chr(bin2dec(char)) for char in cypher.split()))
 
+def __binary(decrypt: bool=False) -> Tuple[Callable, tuple]:
+    return (__decrypt_binary, ()) if decrypt else (__encrypt_binary, ())
+
 @utils.raise_warning(__warning_msg)
 def encrypt_caesar_cypher(msg: str, shift: int=3, seed: str=string.ascii_lowercase) -> str:
     """
@@ -199,14 +243,23 @@ def encrypt_caesar_cypher(msg: str, shift: int=3, seed: str=string.ascii_lowerca
     - <https://en.wikipedia.org/wiki/Caesar_cipher>
     - <https://en.wikipedia.org/wiki/Substitution_cipher>
     """
-    return msg.translate(str.maketrans(seed, ''.join((seed[shift%len(seed):], seed[:shift%len(seed)]))))
+    func, args = __caesar(shift, seed)
+    return func(msg, *args)
 
 def decrypt_caesar_cypher(cypher: str, shift: int=3, seed: str=string.ascii_lowercase) -> str:
     """
     Decrypt a in ceasar cypher encrypted message. Note that you have to pass the same `seed`
     that you used to encrypt the original message.
     """
-    return cypher.translate(str.maketrans(''.join((seed[shift%len(seed):], seed[:shift%len(seed)])), seed))
+    func, args = __caesar(shift, seed, decrypt=True)
+    return func(cypher, *args)
+
+def __translate(msg: str, table: Dict[int, int]) -> str:
+    return msg.translate(table)
+
+def __caesar(shift: int=3, seed: str=string.ascii_lowercase, decrypt: bool=False) -> Tuple[Callable, tuple]:
+    shifted = ''.join((seed[shift%len(seed):], seed[:shift%len(seed)]))
+    return __translate, (str.maketrans(shifted, seed) if decrypt else str.maketrans(seed, shifted),)
 
 @utils.raise_warning(__warning_msg)
 def encrypt_transposition_cypher(msg: str, key: int) -> str:
@@ -241,6 +294,19 @@ def encrypt_transposition_cypher(msg: str, key: int) -> str:
     - There is no restriction on the type of characters, so this encryption method
     provides international language support
     """
+    func, args = __transposition(key)
+    return func(msg, *args)
+
+def decrypt_transposition_cypher(cypher: str, key: int) -> str:
+    """
+    Decrypt a message by using the transposition cypher by calculating the number
+    of columns required to encrypt the original message and by taking into account
+    occurring placeholder characters (`-`) to prevent index out of range errors.
+    """
+    func, args = __transposition(key, decrypt=True)
+    return func(cypher, *args)
+
+def __encrypt_transposition(msg: str, key: int) -> str:
     cypher = [''] * key
     for col in range(key):
         pointer = col
@@ -249,12 +315,7 @@ def encrypt_transposition_cypher(msg: str, key: int) -> str:
             pointer += key
     return ''.join(cypher)
 
-def decrypt_transposition_cypher(cypher: str, key: int) -> str:
-    """
-    Decrypt a message by using the transposition cypher by calculating the number
-    of columns required to encrypt the original message and by taking into account
-    occurring placeholder characters (`-`) to prevent index out of range errors.
-    """
+def __decrypt_transposition(cypher: str, key: int) -> str:
     num_of_col = math.ceil(len(cypher) / key)
     msg = [''] * num_of_col
     col, row = 0, 0
@@ -266,6 +327,9 @@ def decrypt_transposition_cypher(cypher: str, key: int) -> str:
             row += 1
     return ''.join(msg)
 
+def __transposition(key: int, decrypt: bool=False) -> Tuple[Callable, tuple]:
+    return (__decrypt_transposition if decrypt else __encrypt_transposition), (key,)
+
 def __split_affine_key(key: int, seed: str) -> Tuple[int, int]:
     return (key // len(seed), key % len(seed))
 
@@ -320,20 +384,22 @@ def encrypt_affine_cypher(msg: str, key: int, seed: str=string.printable) -> str
     key combinations to crack this cypher
     - The seed dictates language support
     """
-    key1, key2 = __split_affine_key(key, seed)
-    __validate_affine_keys(key1, key2, seed)
-    encrypt = lambda char: seed[(seed.find(char) * key1 + key2) % len(seed)]
-    return ''.join((encrypt(char) if char in seed else char for char in msg))
+    func, args = __affine(key, seed)
+    return func(msg, *args)
 
 def decrypt_affine_cypher(cypher: str, key: int, seed: str=string.printable) -> str:
     """
     Decrypt an affine cypher encrypted message. Note that you need both, the key
     and seed, to decypher a message.
     """
+    func, args = __affine(key, seed, decrypt=True)
+    return func(cypher, *args)
+
+def __affine(key: int, seed: str=string.printable, decrypt: bool=False) -> Tuple[Callable, tuple]:
     key1, key2 = __split_affine_key(key, seed)
     __validate_affine_keys(key1, key2, seed)
-    decrypt = lambda char: seed[(seed.find(char) - key2) * mod_inverse(key1, len(seed)) % len(seed)]
-    return ''.join((decrypt(char) if char in seed else char for char in cypher))
+    substitution = ''.join(seed[(index * key1 + key2) % len(seed)] for index in range(len(seed)))
+    return __translate, (str.maketrans(substitution, seed) if decrypt else str.maketrans(seed, substitution),)
 
 def __validate_vigenere_key(key: str, seed: str=string.ascii_lowercase):
     if not all(char in seed for char in key):
@@ -433,35 +499,1376 @@ def encrypt_vigenere_cypher(msg: str, key: str, seed: str=string.ascii_lowercase
     If all this is true, the vigenere cypher promotes to the cryptographically
     secure one-time pad cypher (OTP).
     """    
+    func, args = __vigenere(key, seed)
+    return func(msg, *args)
+
+def decrypt_vigenere_cypher(cypher: str, key: str, seed: str=string.ascii_lowercase) -> str:
+    """
+    Decrypt a message using the vigenere cypher. Note that you need both, the key
+    and seed, to decypher a message.
+    """
+    func, args = __vigenere(key, seed, decrypt=True)
+    return func(cypher, *args)
+
+def __apply_vigenere(msg: str, seed: str, positions: Dict[str, int], shifts: List[int], start: int=0) -> str:
     cypher = []
-    offset = 0
-    __validate_vigenere_key(key, seed)
-    encrypt = lambda index: (seed.find(msg[index]) + seed.find(key[(index - offset) % len(key)])) % len(seed)
+    # start key at position `start` when msg continues a longer stream
+    offset = -start
 
-    for index in range(len(msg)):
-        if msg[index] in seed:
-            cypher.append(seed[encrypt(index)])
-        else:
-            cypher.append(msg[index])
+    for index, char in enumerate(msg):
+        position = positions.get(char)
+        if position is None:
+            cypher.append(char)
             offset += 1
+        else:
+            cypher.append(seed[(position + shifts[(index - offset) % len(shifts)]) % len(seed)])
 
     return ''.join(cypher)
 
-def decrypt_vigenere_cypher(cypher: str, key: str, seed: str=string.ascii_lowercase) -> str:
+def __vigenere(key: str, seed: str=string.ascii_lowercase, decrypt: bool=False) -> Tuple[Callable, tuple]:
+    __validate_vigenere_key(key, seed)
+    # map characters onto their first occurrence in seed, just like seed.find
+    positions = {char: index for index, char in reversed(list(enumerate(seed)))}
+    shifts = [-positions[char] if decrypt else positions[char] for char in key]
+    return __apply_vigenere, (seed, positions, shifts)
+
+def __determinant(matrix: List[List[int]]) -> int:
+    # fraction-free Gaussian elimination (Bareiss algorithm) keeps all entries integral
+    matrix, sign, previous = [list(row) for row in matrix], 1, 1
+    for k in range(len(matrix) - 1):
+        if matrix[k][k] == 0:
+            pivot = next((i for i in range(k+1, len(matrix)) if matrix[i][k] != 0), None)
+            if pivot is None:
+                return 0
+            matrix[k], matrix[pivot], sign = matrix[pivot], matrix[k], -sign
+        for i in range(k+1, len(matrix)):
+            for j in range(k+1, len(matrix)):
+                matrix[i][j] = (matrix[i][j] * matrix[k][k] - matrix[i][k] * matrix[k][j]) // previous
+        previous = matrix[k][k]
+    return sign * matrix[-1][-1]
+
+def __hill_inverse(matrix: List[List[int]], modulus: int) -> List[List[int]]:
+    det = __determinant(matrix) % modulus
+    inverse = mod_inverse(det, modulus)
+    if inverse is None:
+        logger.error(f"Hill key is not invertible: {matrix=}, {det=}, {modulus=}")
+        raise ValueError(f"The determinant of the key ({det}) and {modulus=} are not relatively prime.")
+    if len(matrix) == 1:
+        return [[inverse]]
+    minor = lambda i, j: [row[:j] + row[j+1:] for k, row in enumerate(matrix) if k != i]
+    adjugate = [[(-1) ** (i + j) * __determinant(minor(j, i)) for j in range(len(matrix))] for i in range(len(matrix))]
+    return [[value * inverse % modulus for value in row] for row in adjugate]
+
+def __apply_hill(msg: str, matrix: np.ndarray, codes: np.ndarray, positions: np.ndarray, seed: np.ndarray, decrypt: bool) -> str:
+    chars = np.frombuffer(msg.encode('utf-32-le'), dtype=np.uint32).copy()
+    slots = np.minimum(np.searchsorted(codes, chars), len(codes) - 1)
+    mask = codes[slots] == chars
+    values = positions[slots[mask]]
+    size, blocks = len(matrix), len(values) // len(matrix)
+
+    if len(values) < size:
+        logger.error(f"Message is shorter than one block: {len(values)=}, {size=}")
+        raise ValueError(f"The message must contain at least {size} characters of seed.")
+
+    # incomplete trailing blocks overlap with the last complete block, cf. cyphertext stealing
+    tail = slice(len(values) - size, len(values))
+    if decrypt and blocks * size != len(values):
+        values[tail] = matrix @ values[tail] % len(codes)
+    values[:blocks*size] = (values[:blocks*size].reshape(blocks, size) @ matrix.T % len(codes)).ravel()
+    if not decrypt and blocks * size != len(values):
+        values[tail] = matrix @ values[tail] % len(codes)
+
+    chars[mask] = seed[values]
+    return chars.tobytes().decode('utf-32-le')
+
+def __hill(key: List[List[int]], seed: str=string.ascii_lowercase, decrypt: bool=False) -> Tuple[Callable, tuple]:
+    if len(set(seed)) != len(seed) or any(len(row) != len(key) for row in key):
+        logger.error(f"Invalid hill cypher parameters: {key=}, {seed=}")
+        raise ValueError("The key must be a square matrix and seed may not contain duplicate characters.")
+    matrix = [[int(value) % len(seed) for value in row] for row in key]
+    # also validates the key when encrypting
+    inverse = __hill_inverse(matrix, len(seed))
+    codes = np.array([ord(char) for char in seed], dtype=np.uint32)
+    order = np.argsort(codes)
+    return __apply_hill, (np.array(inverse if decrypt else matrix, dtype=np.int64), codes[order], order.astype(np.int64), codes, decrypt)
+
+def generate_hill_key(size: int=3, seed: str=string.ascii_lowercase) -> List[List[int]]:
     """
-    Decrypt a message using the vigenere cypher. Note that you need both, the key
+    Generate a new invertible `size x size` key matrix for the hill cypher.
+    """
+    while True:
+        key = [[randint(0, len(seed) - 1) for _ in range(size)] for _ in range(size)]
+        if gcd(__determinant(key) % len(seed), len(seed)) == 1:
+            return key
+
+@utils.raise_warning(__warning_msg)
+def encrypt_hill_cypher(msg: str, key: List[List[int]], seed: str=string.ascii_lowercase) -> str:
+    """
+    Encrypt a message using the hill cypher. The hill cypher is a polygraphic
+    substitution cypher which splits the message into blocks of `n` characters
+    and multiplies each block (as a vector of seed indices) with an invertible
+    `n x n` key matrix modulo `len(seed)`. Use `generate_hill_key` to create a
+    key matrix.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import cryptography as crypto
+    >>> key = [[3, 3], [2, 5]]
+    >>> crypto.encrypt_hill_cypher('help', key)
+    'hiat'
+    ```
+
+    Because `[[3, 3], [2, 5]] @ [7, 4] = [33, 34] = [7, 8] (mod 26)`, `he` becomes
+    `hi`, and `lp` becomes `at` respectively.
+
+    Notes
+    -----
+    - Characters in `msg` that are not contained in `seed` escape encryption
+    - The key is only valid if its determinant and `len(seed)` are relatively prime,
+    the decryption key is its inverse modulo `len(seed)`
+    - If the number of seed characters is not a multiple of `n`, the last block is
+    formed by the last `n` seed characters and overlaps with the previous block,
+    so no padding is required (the message must span at least one block though)
+    - All blocks are encrypted with a single matrix multiplication
+    - Because the cypher is linear, it can be broken with a known plaintext attack
+    with as few as `n` linearly independent blocks
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Hill_cipher>
+    """
+    func, args = __hill(key, seed)
+    return func(msg, *args)
+
+def decrypt_hill_cypher(cypher: str, key: List[List[int]], seed: str=string.ascii_lowercase) -> str:
+    """
+    Decrypt a hill cypher encrypted message. Note that you need both, the key
     and seed, to decypher a message.
     """
-    offset = 0
-    msg = []
-    __validate_vigenere_key(key, seed)
-    decrypt = lambda index: (seed.find(cypher[index]) - seed.find(key[(index - offset) % len(key)])) % len(seed)
+    func, args = __hill(key, seed, decrypt=True)
+    return func(cypher, *args)
+
+RSAPublicKey = namedtuple('RSAPublicKey', 'n e')
+RSAPrivateKey = namedtuple('RSAPrivateKey', 'n e d p q dp dq qinv')
+
+def __random_prime(bits: int, e: int) -> int:
+    while True:
+        # setting the two most significant bits guarantees that p * q has 2 * bits bits
+        candidate = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+        if gcd(e, candidate - 1) == 1 and is_prime(candidate):
+            return candidate
+
+def generate_rsa_keys(bits: int=2048, e: int=65537) -> Tuple[RSAPublicKey, RSAPrivateKey]:
+    """
+    Generate a new RSA key pair whose modulus `n = p * q` is exactly `bits` bits
+    long. The primes `p` and `q` are drawn from `secrets.randbits` and tested with
+    `mathematics.is_prime`, i.e. trial division with a cached table of small primes
+    followed by 40 rounds of the Miller-Rabin test. Besides `d`, the private key
+    also stores the CRT parameters `dp`, `dq` and `qinv` to speed up decryption.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import cryptography as crypto
+    >>> public_key, private_key = crypto.generate_rsa_keys(bits=1024)
+    >>> msg = int.from_bytes(b'Hello, World!', 'big')
+    >>> cypher = crypto.encrypt_rsa(msg, public_key)
+    >>> print(msg == crypto.decrypt_rsa(cypher, private_key))
+    True
+    ```
 
-    for index in range(len(cypher)):
-        if cypher[index] in seed:
-            msg.append(seed[decrypt(index)])
+    Notes
+    -----
+    - This is textbook RSA without padding (such as OAEP), which is deterministic
+    and malleable, hence insecure
+    - The probability that a composite number passes 40 Miller-Rabin rounds is at
+    most `4^-40`
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/RSA_(cryptosystem)>
+    - <https://en.wikipedia.org/wiki/Miller%E2%80%93Rabin_primality_test>
+    """
+    if bits < 16 or bits % 2 != 0 or e < 3 or e % 2 == 0:
+        logger.error(f"Invalid RSA parameters: {bits=}, {e=}")
+        raise ValueError(f"{bits=} must be an even number of at least 16 and {e=} an odd number greater than 2.")
+
+    while True:
+        p, q = __random_prime(bits // 2, e), __random_prime(bits // 2, e)
+        if p != q:
+            break
+    p, q = max(p, q), min(p, q)
+    d = mod_inverse(e, (p - 1) * (q - 1))
+    return RSAPublicKey(p * q, e), RSAPrivateKey(p * q, e, d, p, q, d % (p - 1), d % (q - 1), mod_inverse(q, p))
+
+def __validate_rsa_message(msg: int, n: int) -> None:
+    if not 0 <= msg < n:
+        logger.error(f"Message out of range: {msg=}, {n=}")
+        raise ValueError("The message must be a non-negative integer less than the modulus.")
+
+def __encrypt_rsa(msg: int, n: int, e: int) -> int:
+    __validate_rsa_message(msg, n)
+    return pow(msg, e, n)
+
+def __decrypt_rsa(cypher: int, n: int, d: int) -> int:
+    __validate_rsa_message(cypher, n)
+    return pow(cypher, d, n)
+
+def __decrypt_rsa_crt(cypher: int, p: int, q: int, dp: int, dq: int, qinv: int) -> int:
+    __validate_rsa_message(cypher, p * q)
+    # two exponentiations with half-sized moduli and exponents, recombined with Garner's formula
+    m1, m2 = pow(cypher, dp, p), pow(cypher, dq, q)
+    return m2 + (qinv * (m1 - m2) % p) * q
+
+def __rsa(key: RSAPublicKey or RSAPrivateKey, crt: bool=True, decrypt: bool=False) -> Tuple[Callable, tuple]:
+    if decrypt and not isinstance(key, RSAPrivateKey):
+        logger.error(f"Attempted RSA decryption without private key: {type(key)=}")
+        raise ValueError("Decryption requires the private key.")
+    if not decrypt:
+        return __encrypt_rsa, (key.n, key.e)
+    return (__decrypt_rsa_crt, (key.p, key.q, key.dp, key.dq, key.qinv)) if crt else (__decrypt_rsa, (key.n, key.d))
+
+def encrypt_rsa(msg: int, key: RSAPublicKey) -> int:
+    """
+    Encrypt an integer `0 <= msg < n` by computing `pow(msg, e, n)`. Use `encrypt_many`
+    with `method='rsa'` to encrypt a batch of messages. See `generate_rsa_keys`
+    for more details.
+    """
+    func, args = __rsa(key)
+    return func(msg, *args)
+
+def decrypt_rsa(cypher: int, key: RSAPrivateKey, crt: bool=True) -> int:
+    """
+    Decrypt an RSA encrypted integer. By default, this function applies the Chinese
+    remainder theorem, i.e. it computes the message modulo `p` and `q` separately,
+    which is about four times faster than `pow(cypher, d, n)` (set `crt=False`).
+    """
+    func, args = __rsa(key, crt, decrypt=True)
+    return func(cypher, *args)
+
+__cyphers = {
+    'morse': __morse,
+    'binary': __binary,
+    'caesar': __caesar,
+    'transposition': __transposition,
+    'affine': __affine,
+    'vigenere': __vigenere,
+    'hill': __hill,
+    'rsa': __rsa
+}
+
+def _apply_chunk(func: Callable, args: tuple, chunk: List[Union[str, int]]) -> List[Union[str, int]]:
+    return [func(msg, *args) for msg in chunk]
+
+def __apply_many(msgs: Iterable[Union[str, int]], method: str, decrypt: bool, workers: int, chunksize: int, executor: str, kwargs: dict) -> List[Union[str, int]]:
+    if method not in __cyphers:
+        logger.error(f"Unknown encryption method: {method=}")
+        raise ValueError(f"{method=} must be one of {', '.join(__cyphers)}.")
+
+    if executor not in ('thread', 'process') or chunksize < 1 or (workers is not None and workers < 1):
+        logger.error(f"Invalid pool configuration for {executor=}, {workers=}, {chunksize=}")
+        raise ValueError(f"{executor=} must be 'thread' or 'process', {workers=} and {chunksize=} must be at least 1.")
+
+    # validates the key and builds lookup tables once for the entire batch
+    func, args = __cyphers[method](**kwargs, decrypt=decrypt)
+    msgs = iter(msgs)
+    chunks = iter(lambda: list(islice(msgs, chunksize)), [])
+
+    if workers == 1:
+        return [result for chunk in chunks for result in _apply_chunk(func, args, chunk)]
+
+    with (ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor)(max_workers=workers) as pool:
+        return list(chain.from_iterable(pool.map(partial(_apply_chunk, func, args), chunks)))
+
+@utils.raise_warning(__warning_msg)
+def encrypt_many(msgs: Iterable[Union[str, int]], method: str, workers: int=None, chunksize: int=1024, executor: str='process', **kwargs) -> List[Union[str, int]]:
+    """
+    Encrypt a batch of independent messages with the same key. `method` selects
+    one of the `morse`, `binary`, `caesar`, `transposition`, `affine`, `vigenere`,
+    `hill` or `rsa` cyphers, and `kwargs` are passed on as key parameters of the
+    corresponding `encrypt_*` function. Messages are split into chunks of `chunksize`
+    which are processed by a pool of `workers` threads or processes (depending on
+    `executor`), or sequentially if `workers=1`. The order of `msgs` is preserved.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import cryptography as crypto
+    >>> rows = ['alice,42', 'bob,37', 'carol,29']
+    >>> cyphers = crypto.encrypt_many(rows, 'vigenere', key='jacqueline')
+    >>> print(crypto.decrypt_many(cyphers, 'vigenere', key='jacqueline') == rows)
+    True
+    ```
+
+    Notes
+    -----
+    - Keys are validated and lookup tables are built once per batch instead of
+    once per message
+    - Use `executor='process'` for CPU-bound batches, threads only pay off for
+    small batches where the pool start-up cost dominates
+    - The `rsa` cypher encrypts integers into integers, all other cyphers work
+    on strings
+    """
+    return __apply_many(msgs, method, False, workers, chunksize, executor, kwargs)
+
+def decrypt_many(cyphers: Iterable[Union[str, int]], method: str, workers: int=None, chunksize: int=1024, executor: str='process', **kwargs) -> List[Union[str, int]]:
+    """
+    Decrypt a batch of messages that were encrypted with the same key. See
+    `encrypt_many` for a description of all parameters.
+    """
+    return __apply_many(cyphers, method, True, workers, chunksize, executor, kwargs)
+
+__buffer_chunksize = 1 << 20
+
+def __byte_view(buffer) -> np.ndarray:
+    view = memoryview(buffer)
+    if view.readonly:
+        logger.error(f"Cannot transform a read-only buffer in place: {type(buffer)=}")
+        raise TypeError(f"{type(buffer).__name__} is not a writable buffer.")
+    return np.frombuffer(view.cast('B'), dtype=np.uint8)
+
+def __byte_seed(seed: str) -> bytes:
+    try:
+        return seed.encode('latin-1')
+    except UnicodeEncodeError:
+        logger.error(f"Seed contains characters outside of Latin-1: {seed=}", exc_info=True)
+        raise ValueError("Buffer cyphers only support seeds whose characters are in the Latin-1 range.")
+
+def __translate_buffer(buffer, table: Dict[int, int], seed: str) -> None:
+    __byte_seed(seed)
+    lookup = np.arange(256, dtype=np.uint8)
+    for key, value in table.items():
+        lookup[key] = value
+    data = __byte_view(buffer)
+    for start in range(0, len(data), __buffer_chunksize):
+        block = data[start:start+__buffer_chunksize]
+        block[:] = lookup[block]
+
+@utils.raise_warning(__warning_msg)
+def encrypt_caesar_buffer(buffer, shift: int=3, seed: str=string.ascii_lowercase) -> None:
+    """
+    Encrypt any writable bytes-like object (e.g. `bytearray` or a writable `mmap`)
+    in place by using the caesar cypher. Every byte is interpreted as Latin-1
+    character, so `seed` may only contain characters up to `U+00FF`. See
+    `encrypt_caesar_cypher` for more details about this cypher.
+
+    Example
+    -------
+    ```
+    >>> import mmap
+    >>> from lolicon.compsci import cryptography as crypto
+    >>> with open('records.csv', mode='r+b') as file_handler:
+    >>>     with mmap.mmap(file_handler.fileno(), 0) as buffer:
+    >>>         crypto.encrypt_caesar_buffer(buffer, shift=13)
+    ```
+    """
+    _, (table,) = __caesar(shift, seed)
+    __translate_buffer(buffer, table, seed)
+
+def decrypt_caesar_buffer(buffer, shift: int=3, seed: str=string.ascii_lowercase) -> None:
+    """
+    Decrypt a caesar cypher encrypted buffer in place.
+    """
+    _, (table,) = __caesar(shift, seed, decrypt=True)
+    __translate_buffer(buffer, table, seed)
+
+@utils.raise_warning(__warning_msg)
+def encrypt_affine_buffer(buffer, key: int, seed: str=string.printable) -> None:
+    """
+    Encrypt any writable bytes-like object in place by using the affine cypher.
+    Every byte is interpreted as Latin-1 character. See `encrypt_affine_cypher`
+    for more details about this cypher.
+    """
+    _, (table,) = __affine(key, seed)
+    __translate_buffer(buffer, table, seed)
+
+def decrypt_affine_buffer(buffer, key: int, seed: str=string.printable) -> None:
+    """
+    Decrypt an affine cypher encrypted buffer in place.
+    """
+    _, (table,) = __affine(key, seed, decrypt=True)
+    __translate_buffer(buffer, table, seed)
+
+def __vigenere_buffer(buffer, key: str, seed: str, decrypt: bool) -> None:
+    _, (_, positions, shifts) = __vigenere(key, seed, decrypt)
+    symbols = np.frombuffer(__byte_seed(seed), dtype=np.uint8)
+    lookup = np.full(256, -1, dtype=np.int64)
+    for char, position in positions.items():
+        lookup[ord(char)] = position
+    shifts = np.array(shifts, dtype=np.int64)
+    data = __byte_view(buffer)
+    # number of seed characters before the current block, which determines the key offset
+    consumed = 0
+
+    for start in range(0, len(data), __buffer_chunksize):
+        block = data[start:start+__buffer_chunksize]
+        position = lookup[block]
+        mask = position >= 0
+        index = (consumed + np.cumsum(mask) - 1) % len(shifts)
+        block[mask] = symbols[(position[mask] + shifts[index[mask]]) % len(symbols)]
+        consumed += int(np.count_nonzero(mask))
+
+@utils.raise_warning(__warning_msg)
+def encrypt_vigenere_buffer(buffer, key: str, seed: str=string.ascii_lowercase) -> None:
+    """
+    Encrypt any writable bytes-like object in place by using the vigenere cypher.
+    Every byte is interpreted as Latin-1 character. Just like in `encrypt_vigenere_cypher`,
+    bytes that are not in `seed` are skipped and don't advance the key.
+    """
+    __vigenere_buffer(buffer, key, seed, decrypt=False)
+
+def decrypt_vigenere_buffer(buffer, key: str, seed: str=string.ascii_lowercase) -> None:
+    """
+    Decrypt a vigenere cypher encrypted buffer in place.
+    """
+    __vigenere_buffer(buffer, key, seed, decrypt=True)
+
+def xor_cypher(data, key) -> bytes:
+    """
+    Combine two bytes-like objects `data` and `key` with the bitwise exclusive
+    or. `key` must be at least as long as `data`; excessive key bytes are ignored.
+    Since XOR is its own inverse, this function both encrypts and decrypts.
+    """
+    data, key = memoryview(data).cast('B'), memoryview(key).cast('B')
+    if len(key) < len(data):
+        logger.error(f"Key is shorter than the data: {len(key)=}, {len(data)=}")
+        raise ValueError(f"The key must be at least {len(data)} bytes long.")
+    return np.bitwise_xor(np.frombuffer(data, dtype=np.uint8), np.frombuffer(key[:len(data)], dtype=np.uint8)).tobytes()
+
+def encrypt_one_time_pad(data) -> Tuple[bytes, bytes]:
+    """
+    Encrypt binary data by using a fresh one-time pad from `os.urandom`. Return
+    the cypher and the key, which is exactly as long as `data`.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import cryptography as crypto
+    >>> msg = b'Hello, World!'
+    >>> cypher, key = crypto.encrypt_one_time_pad(msg)
+    >>> print(msg == crypto.decrypt_one_time_pad(cypher, key))
+    True
+    ```
+
+    Notes
+    -----
+    - This is the byte-oriented counterpart of the one-time pad described in
+    `encrypt_vigenere_cypher`, the Vigenère shift becomes an XOR over `GF(2)^8`
+    - Use `OneTimePad` to share pre-generated key material between two parties
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/One-time_pad>
+    """
+    key = os.urandom(len(memoryview(data).cast('B')))
+    return xor_cypher(data, key), key
+
+def decrypt_one_time_pad(cypher, key) -> bytes:
+    """
+    Decrypt binary data that was encrypted with a one-time pad.
+    """
+    return xor_cypher(cypher, key)
+
+@contextmanager
+def _exclusive_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on the file at `path` (created on demand)
+    for the duration of the context, blocking until it is available.
+    """
+    with open(path, mode='a+b') as file_handler:
+        if fcntl is not None:
+            fcntl.flock(file_handler.fileno(), fcntl.LOCK_EX)
         else:
-            msg.append(cypher[index])
-            offset += 1
+            file_handler.seek(0)
+            # LK_LOCK gives up after ten attempts, so keep trying
+            while True:
+                try:
+                    msvcrt.locking(file_handler.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file_handler.fileno(), fcntl.LOCK_UN)
+            else:
+                file_handler.seek(0)
+                msvcrt.locking(file_handler.fileno(), msvcrt.LK_UNLCK, 1)
 
-    return ''.join(msg)
+class OneTimePad(object):
+    """
+    OneTimePad
+    ==========
+
+    Basic Usage
+    -----------
+        >>> from lolicon.compsci import cryptography as crypto
+        >>> pad = crypto.OneTimePad.generate('alice.pad', size=1 << 20)
+        >>> offset, cypher = pad.encrypt(b'Hello, World!')
+        >>> # the receiver holds a copy of alice.pad
+        >>> print(crypto.OneTimePad('bob.pad').decrypt(cypher, offset))
+        b'Hello, World!'
+
+    Memory-mapped key file for the one-time pad. Encryption consumes key bytes
+    from the current offset onwards, which is persisted in a `.offset` file next
+    to the key file before any cypher is returned. The offset is read and updated
+    under an exclusive lock on a `.lock` file, hence the same key bytes are never
+    used twice, not even across processes. Decryption reads the key at an explicit
+    offset and doesn't consume anything.
+    """
+    def __init__(self, path: str) -> OneTimePad:
+        """
+        Open an existing key file.
+        """
+        self.__path = Path(path)
+        self.__offset_path = self.__path.with_name(f"{self.__path.name}.offset")
+        self.__lock_path = self.__path.with_name(f"{self.__path.name}.lock")
+        with open(self.__path, mode='rb') as file_handler:
+            self.__key = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(Path={self.__path}, Offset={self.offset}, Size={len(self.__key)})"
+
+    def __enter__(self) -> OneTimePad:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def generate(path: str, size: int, chunksize: int=1 << 20) -> OneTimePad:
+        """
+        Write `size` random bytes from `os.urandom` to a new key file at `path`.
+        """
+        if size < 1:
+            logger.error(f"Invalid one-time pad size: {size=}")
+            raise ValueError(f"{size=} must be a positive integer.")
+        with open(path, mode='xb') as file_handler:
+            for start in range(0, size, chunksize):
+                file_handler.write(os.urandom(min(chunksize, size - start)))
+        return OneTimePad(path)
+
+    #region property
+
+    @property
+    def offset(self) -> int:
+        """
+        Return the number of key bytes that have already been consumed.
+        """
+        return int(self.__offset_path.read_text(encoding='utf-8')) if self.__offset_path.exists() else 0
+
+    @property
+    def remaining(self) -> int:
+        """
+        Return the number of unused key bytes.
+        """
+        return len(self.__key) - self.offset
+
+    #endregion
+
+    #region methods
+
+    def consume(self, size: int) -> Tuple[int, memoryview]:
+        """
+        Reserve the next `size` unused key bytes. Return their offset and a view
+        into the key file.
+        """
+        with _exclusive_lock(self.__lock_path):
+            offset = self.offset
+            if size > len(self.__key) - offset:
+                logger.error(f"One-time pad is exhausted: {size=}, {offset=}, {len(self.__key)=}")
+                raise ValueError(f"Not enough key material left to encrypt {size} bytes.")
+            temp_path = self.__offset_path.with_name(f"{self.__offset_path.name}.{os.getpid()}.{secrets.token_hex(8)}.tmp")
+            temp_path.write_text(str(offset + size), encoding='utf-8')
+            os.replace(temp_path, self.__offset_path)
+        return offset, memoryview(self.__key)[offset:offset+size]
+
+    def encrypt(self, data) -> Tuple[int, bytes]:
+        """
+        Encrypt `data` with unused key bytes. Return the key offset, which has to
+        be passed on to the receiver, and the cypher.
+        """
+        offset, key = self.consume(len(memoryview(data).cast('B')))
+        return offset, xor_cypher(data, key)
+
+    def decrypt(self, cypher, offset: int) -> bytes:
+        """
+        Decrypt `cypher` with the key bytes starting at `offset`.
+        """
+        return xor_cypher(cypher, memoryview(self.__key)[offset:offset+len(memoryview(cypher).cast('B'))])
+
+    def encrypt_stream(self, source: BinaryIO, target: BinaryIO, size: int=None, chunksize: int=1 << 20) -> int:
+        """
+        Encrypt the next `size` bytes of the file object `source` block by block
+        and write the cypher to `target`, so that files larger than memory can be
+        processed. `size` defaults to the rest of a seekable `source`. The key
+        range for the whole stream is reserved up front, such that it stays
+        contiguous even if other handles consume key bytes in the meantime.
+        Return the key offset of the first block.
+        """
+        if size is None:
+            if not source.seekable():
+                logger.error(f"Cannot determine the length of an unseekable stream: {source=}")
+                raise ValueError("Pass the number of bytes to encrypt as size for unseekable streams.")
+            position = source.tell()
+            size = source.seek(0, os.SEEK_END) - position
+            source.seek(position)
+
+        start, _ = self.consume(size)
+        offset, stop = start, start + size
+        while offset < stop and (block := source.read(min(chunksize, stop - offset))):
+            # don't hold on to the key view, else the memory map can't be closed
+            target.write(xor_cypher(block, memoryview(self.__key)[offset:offset+len(block)]))
+            offset += len(block)
+        return start
+
+    def decrypt_stream(self, source: BinaryIO, target: BinaryIO, offset: int, chunksize: int=1 << 20) -> None:
+        """
+        Decrypt the file object `source` block by block with the key bytes starting
+        at `offset` and write the result to `target`.
+        """
+        while block := source.read(chunksize):
+            target.write(self.decrypt(block, offset))
+            offset += len(block)
+
+    def close(self) -> None:
+        """
+        Release the memory map of the key file.
+        """
+        self.__key.close()
+
+    #endregion
+
+def __compose_tables(first: Dict[int, int], second: Dict[int, int]) -> Dict[int, int]:
+    composed = {key: second.get(value, value) for key, value in first.items()}
+    for key, value in second.items():
+        composed.setdefault(key, value)
+    return composed
+
+def _plan_pipeline(stages: List[Tuple[str, dict]], decrypt: bool) -> List[Tuple[Callable, tuple]]:
+    plan = []
+    for method, kwargs in (reversed(stages) if decrypt else stages):
+        func, args = __cyphers[method](**kwargs, decrypt=decrypt)
+        if func is __translate and plan and plan[-1][0] is __translate:
+            # fuse consecutive substitutions into a single translation table
+            plan[-1] = (__translate, (__compose_tables(plan[-1][1][0], args[0]),))
+        else:
+            plan.append((func, args))
+    return plan
+
+def _stream_pipeline(plan: List[Tuple[Callable, tuple]], chunks: Iterable[str]) -> Iterator[str]:
+    if any(func not in (__translate, __apply_vigenere) for func, _ in plan):
+        logger.error(f"Pipeline contains stages that can't be streamed: {plan=}")
+        raise ValueError("Only caesar, affine and vigenere stages can be streamed.")
+
+    # number of seed characters that each vigenere stage has already consumed
+    consumed = [0] * len(plan)
+    for chunk in chunks:
+        for index, (func, args) in enumerate(plan):
+            if func is __apply_vigenere:
+                text, chunk = chunk, func(chunk, *args, consumed[index])
+                consumed[index] += sum(map(args[1].__contains__, text))
+            else:
+                chunk = func(chunk, *args)
+        yield chunk
+
+def _cypher_methods() -> List[str]:
+    return list(__cyphers)
+
+class Pipeline(object):
+    """
+    Pipeline
+    ========
+
+    Basic Usage
+    -----------
+        >>> from lolicon.compsci import cryptography as crypto
+        >>> pipeline = crypto.Pipeline([('caesar', {'shift': 3}), ('affine', {'key': 1734}), ('transposition', {'key': 8})])
+        >>> cypher = pipeline.encrypt('Hello, World!')
+        >>> print(pipeline.decrypt(cypher))
+        Hello, World!
+
+    Chain several cyphers together. Each stage is a tuple of a method name (see
+    `encrypt_many`) and its key parameters, or just the method name if the cypher
+    takes no key. Keys are validated once when the pipeline is created. Consecutive
+    substitutions (`caesar` and `affine`) are fused into a single translation
+    table, so that they only take one pass over the message. The `inverse` pipeline
+    for decryption is derived once on first use.
+    """
+    def __init__(self, stages: List[Tuple[str, dict] or str], decrypt: bool=False) -> Pipeline:
+        """
+        Create a new pipeline of cyphers.
+        """
+        self.__stages = [(stage, {}) if isinstance(stage, str) else tuple(stage) for stage in stages]
+        self.__decrypt = decrypt
+        unknown = [method for method, _ in self.__stages if method not in _cypher_methods()]
+        if unknown:
+            logger.error(f"Unknown encryption methods in pipeline: {unknown=}")
+            raise ValueError(f"Pipeline stages must be one of {', '.join(_cypher_methods())}.")
+        self.__plan = _plan_pipeline(self.__stages, decrypt)
+        self.__inverse = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(Stages={[method for method, _ in self.__stages]}, Passes={len(self)}, Decrypt={self.__decrypt})"
+
+    def __len__(self) -> int:
+        """
+        Return the number of passes over a message after fusion.
+        """
+        return len(self.__plan)
+
+    @property
+    def inverse(self) -> Pipeline:
+        """
+        Return the pipeline that reverts this pipeline. It is planned on first
+        access and reused afterwards.
+        """
+        if self.__inverse is None:
+            self.__inverse = Pipeline(self.__stages, decrypt=not self.__decrypt)
+            self.__inverse.__inverse = self
+        return self.__inverse
+
+    def encrypt(self, msg: str) -> str:
+        """
+        Run `msg` through all stages of this pipeline.
+        """
+        for func, args in self.__plan:
+            msg = func(msg, *args)
+        return msg
+
+    def decrypt(self, cypher: str) -> str:
+        """
+        Run `cypher` through the inverse pipeline.
+        """
+        return self.inverse.encrypt(cypher)
+
+    def encrypt_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Lazily encrypt a stream of message chunks, e.g. the lines of a file. Every
+        chunk runs through all stages before the next one is read. Note that
+        transpositions depend on the total message length, hence only `caesar`,
+        `affine` and `vigenere` stages support streaming.
+        """
+        return _stream_pipeline(self.__plan, chunks)
+
+    def decrypt_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Lazily decrypt a stream of cypher chunks with the inverse pipeline.
+        """
+        return self.inverse.encrypt_stream(chunks)
+
+__enigma_rotors = {
+    'I': ('EKMFLGDQVZNTOWYHXUSPAIBRCJ', 'Q'),
+    'II': ('AJDKSIRUXBLHWTMCQGZNPYFVOE', 'E'),
+    'III': ('BDFHJLCPRTXVZNYEIWGAKMUSQO', 'V'),
+    'IV': ('ESOVPZJAYQUIRHXLNFTGKDCMWB', 'J'),
+    'V': ('VZBRGITYUPSDNHLXAWMJQOFECK', 'Z'),
+    'VI': ('JPGVOUMFYQBENHZRDKASXLICTW', 'ZM'),
+    'VII': ('NZJHGRCXMYSWBOUFAIVLPEKQDT', 'ZM'),
+    'VIII': ('FKQHTLXOCBJSPDZRAMEWNIUYGV', 'ZM')
+}
+
+__enigma_reflectors = {
+    'A': 'EJMZALYXVBWFCRQUONTSPIKHGD',
+    'B': 'YRUHQSLDPXNGOKMIEBFZCWVJAT',
+    'C': 'FVPJIAOYEDRZXWGCTKUQSBNMHL'
+}
+
+def __enigma_letters(text: str) -> np.ndarray:
+    return np.array([string.ascii_uppercase.find(char) for char in text.upper() if char in string.ascii_uppercase], dtype=np.int64)
+
+def _validate_enigma(rotors: Tuple[str, str, str], reflector: str, ring_settings: str, positions: str, plugboard: str) -> None:
+    pairs = plugboard.upper().split()
+    if len(rotors) != 3 or len(set(rotors)) != 3 or any(rotor not in __enigma_rotors for rotor in rotors) or reflector not in __enigma_reflectors:
+        logger.error(f"Invalid enigma wiring: {rotors=}, {reflector=}")
+        raise ValueError(f"Choose three distinct rotors from {', '.join(__enigma_rotors)} and a reflector from {', '.join(__enigma_reflectors)}.")
+
+    if len(__enigma_letters(ring_settings)) != 3 or len(__enigma_letters(positions)) != 3:
+        logger.error(f"Invalid enigma settings: {ring_settings=}, {positions=}")
+        raise ValueError(f"{ring_settings=} and {positions=} must consist of three letters each.")
+
+    if any(len(pair) != 2 for pair in pairs) or len(set(''.join(pairs))) != 2 * len(pairs) or not all(pair.isalpha() for pair in pairs):
+        logger.error(f"Invalid plugboard: {plugboard=}")
+        raise ValueError(f"{plugboard=} must consist of distinct letter pairs separated by whitespace, e.g. 'AB CD EF'.")
+
+@lru_cache(maxsize=8)
+def _enigma_tables(rotors: Tuple[str, str, str], reflector: str, ring_settings: str, plugboard: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the substitution of every key for all `26^3` rotor positions as a
+    `(17576, 26)` table, and the rotor position that follows each position after
+    a key press (including the double step of the middle rotor). Positions are
+    encoded as `26^2 * left + 26 * middle + right`.
+    """
+    states = np.arange(26 ** 3)
+    window = np.stack((states // 676, states // 26 % 26, states % 26))
+    rings = __enigma_letters(ring_settings)[:, np.newaxis]
+
+    # stepping: the right rotor always advances, a rotor at its notch takes its left neighbour along
+    at_notch = [np.isin(window[index], __enigma_letters(__enigma_rotors[rotor][1])) for index, rotor in enumerate(rotors)]
+    left_steps = at_notch[1]
+    middle_steps = at_notch[1] | at_notch[2]
+    following = (window + np.stack((left_steps, middle_steps, np.ones_like(left_steps)))) % 26
+    following = following[0] * 676 + following[1] * 26 + following[2]
+
+    plug = np.arange(26)
+    for pair in plugboard.upper().split():
+        first, second = __enigma_letters(pair)
+        plug[first], plug[second] = second, first
+
+    # substitution of each rotor for all 26 offsets between rotor position and ring setting
+    offsets = np.arange(26)[:, np.newaxis]
+    contacts = (np.arange(26) + offsets) % 26
+    wirings = [__enigma_letters(__enigma_rotors[rotor][0]) for rotor in rotors]
+    forward = [((wiring[contacts] - offsets) % 26).astype(np.uint8) for wiring in wirings]
+    backward = [((np.argsort(wiring)[contacts] - offsets) % 26).astype(np.uint8) for wiring in wirings]
+    shifts = ((window - rings) % 26)[:, :, np.newaxis]
+
+    signal = np.broadcast_to(plug.astype(np.uint8), (len(states), 26))
+    for index in (2, 1, 0):
+        signal = forward[index][shifts[index], signal]
+    signal = __enigma_letters(__enigma_reflectors[reflector]).astype(np.uint8)[signal]
+    for index in (0, 1, 2):
+        signal = backward[index][shifts[index], signal]
+    return plug.astype(np.uint8)[signal], following
+
+class Enigma(object):
+    """
+    Enigma
+    ======
+
+    Basic Usage
+    -----------
+        >>> from lolicon.compsci import cryptography as crypto
+        >>> enigma = crypto.Enigma(rotors=('I', 'II', 'III'), reflector='B', positions='AAA')
+        >>> enigma.encrypt('AAAAA')
+        'BDZGO'
+
+    Simulator of the three-rotor Enigma I used by the German Wehrmacht. Rotors
+    are listed from left to right and can be chosen from `I` to `VIII`. Ring settings
+    and start positions are given as three letters (one per rotor), the plugboard
+    as whitespace-separated letter pairs (e.g. `'AB CD'`). The machine is reset
+    to its start positions before every message. Encryption and decryption are
+    the same operation.
+
+    Notes
+    -----
+    - All rotor positions and the permutation of each position are tabulated
+    when the machine is used for the first time, so that a message is encrypted
+    by looking up its key sequence in this table
+    - Only English letters are encrypted; letters are turned into uppercase, all
+    other characters escape encryption and don't advance the rotors
+    - Because of the reflector, no letter is ever encrypted to itself, which
+    was one of the weaknesses exploited by the Polish and British codebreakers
+    (see `crack_enigma`)
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Enigma_machine>
+    - <https://en.wikipedia.org/wiki/Enigma_rotor_details>
+    """
+    def __init__(self, rotors: Tuple[str, str, str]=('I', 'II', 'III'), reflector: str='B', ring_settings: str='AAA', positions: str='AAA', plugboard: str='') -> Enigma:
+        """
+        Configure a new enigma machine.
+        """
+        _validate_enigma(tuple(rotors), reflector, ring_settings, positions, plugboard)
+        self.__rotors = tuple(rotors)
+        self.__reflector = reflector
+        self.__ring_settings = ring_settings.upper()
+        self.__positions = positions.upper()
+        self.__plugboard = ' '.join(sorted(pair.upper() for pair in plugboard.split()))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(Rotors={self.rotors}, Reflector={self.reflector}, RingSettings={self.ring_settings}, Positions={self.positions}, Plugboard={self.plugboard})"
+
+    def __eq__(self, other) -> bool:
+        return repr(self) == repr(other)
+
+    def __ne__(self, other) -> bool:
+        return repr(self) != repr(other)
+
+    #region property
+
+    @property
+    def rotors(self) -> Tuple[str, str, str]:
+        """
+        Return the rotors from left to right.
+        """
+        return self.__rotors
+
+    @property
+    def reflector(self) -> str:
+        """
+        Return the name of the reflector (Umkehrwalze).
+        """
+        return self.__reflector
+
+    @property
+    def ring_settings(self) -> str:
+        """
+        Return the ring settings (Ringstellung) from left to right.
+        """
+        return self.__ring_settings
+
+    @property
+    def positions(self) -> str:
+        """
+        Return the start positions (Grundstellung) from left to right.
+        """
+        return self.__positions
+
+    @property
+    def plugboard(self) -> str:
+        """
+        Return the letter pairs that are swapped by the plugboard (Steckerbrett).
+        """
+        return self.__plugboard
+
+    #endregion
+
+    #region methods
+
+    def key_sequence(self, length: int) -> np.ndarray:
+        """
+        Return the rotor positions that are used to encrypt the first `length`
+        letters of a message.
+        """
+        _, following = _enigma_tables(self.rotors, self.reflector, self.ring_settings, self.plugboard)
+        left, middle, right = (string.ascii_uppercase.index(char) for char in self.positions)
+        sequence = np.empty(length, dtype=np.int64)
+        state = left * 676 + middle * 26 + right
+        for index in range(length):
+            state = sequence[index] = following[state]
+        return sequence
+
+    def encrypt(self, msg: str) -> str:
+        """
+        Encrypt (or decrypt) a message with this machine.
+        """
+        table, _ = _enigma_tables(self.rotors, self.reflector, self.ring_settings, self.plugboard)
+        chars = np.frombuffer(msg.upper().encode('utf-32-le'), dtype=np.uint32).copy()
+        mask = (chars >= ord('A')) & (chars <= ord('Z'))
+        letters = chars[mask].astype(np.int64) - ord('A')
+        chars[mask] = table[self.key_sequence(len(letters)), letters] + ord('A')
+        return chars.tobytes().decode('utf-32-le')
+
+    def decrypt(self, cypher: str) -> str:
+        """
+        Decrypt a message with this machine, which is the same as encrypting it.
+        """
+        return self.encrypt(cypher)
+
+    #endregion
+
+def _scan_enigma(rotors: Tuple[str, str, str], reflector: str, ring_settings: str, plugboard: str, cypher: np.ndarray, crib: np.ndarray, offset: int) -> List[str]:
+    table, following = _enigma_tables(rotors, reflector, ring_settings, plugboard)
+    # test all start positions at once, dropping those that contradict the crib
+    candidates = np.arange(26 ** 3)
+    state = candidates
+    for _ in range(offset):
+        state = following[state]
+    for index in range(len(crib)):
+        state = following[state]
+        match = table[state, cypher[offset+index]] == crib[index]
+        candidates, state = candidates[match], state[match]
+    return [''.join(string.ascii_uppercase[letter] for letter in (start // 676, start // 26 % 26, start % 26)) for start in candidates]
+
+def crack_enigma(cypher: str, crib: str, offset: int=0, rotors: Iterable[str]=('I', 'II', 'III', 'IV', 'V'), reflector: str='B', ring_settings: str='AAA', plugboard: str='', workers: int=None) -> List[Enigma]:
+    """
+    Find all enigma configurations that decrypt `cypher` to a known piece of
+    plaintext (the so-called crib) that starts at the `offset`-th letter. Every
+    ordered choice of three `rotors` is tried with all `26^3` start positions,
+    distributed over a pool of `workers` processes (one per CPU by default).
+    Reflector, ring settings and plugboard are assumed to be known.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import cryptography as crypto
+    >>> enigma = crypto.Enigma(rotors=('IV', 'I', 'V'), positions='KEY')
+    >>> cypher = enigma.encrypt('WETTERVORHERSAGEBISKAYA')
+    >>> crypto.crack_enigma(cypher, crib='WETTERVORHERSAGE')
+    [Enigma(Rotors=('IV', 'I', 'V'), Reflector=B, RingSettings=AAA, Positions=KEY, Plugboard=)]
+    ```
+
+    Notes
+    -----
+    - Only English letters of `cypher` and `crib` are taken into account, `offset`
+    counts letters only
+    - Cribs of about ten letters or more usually produce a single candidate
+    - Crib positions where a letter would be encrypted to itself are ruled out
+    immediately; Bletchley Park used this to slide cribs along intercepted messages
+    - This is an exhaustive search, the historical Bombe additionally deduced
+    plugboard connections from loops in the crib
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Cryptanalysis_of_the_Enigma>
+    - <https://en.wikipedia.org/wiki/Bombe>
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    letters, crib_letters = __enigma_letters(cypher), __enigma_letters(crib)
+    if offset < 0 or offset + len(crib_letters) > len(letters) or not len(crib_letters) or workers < 1:
+        logger.error(f"Invalid crib placement: {offset=}, {len(crib_letters)=}, {len(letters)=}, {workers=}")
+        raise ValueError(f"The crib must contain letters and fit into the cypher at {offset=}, {workers=} must be at least 1.")
+
+    if np.any(letters[offset:offset+len(crib_letters)] == crib_letters):
+        return []
+
+    orders = [order for order in permutations(rotors, 3)]
+    for order in orders:
+        _validate_enigma(order, reflector, ring_settings, 'AAA', plugboard)
+    scan = lambda order: (order, reflector, ring_settings, plugboard, letters[:offset+len(crib_letters)], crib_letters, offset)
+
+    if workers == 1:
+        results = [_scan_enigma(*scan(order)) for order in orders]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_scan_enigma, *zip(*map(scan, orders))))
+
+    return [Enigma(order, reflector, ring_settings, positions, plugboard) for order, candidates in zip(orders, results) for positions in candidates]
+
+SubstitutionSolution = namedtuple('SubstitutionSolution', 'key plaintext score')
+
+__quadgram_weights = np.array([26 ** 3, 26 ** 2, 26, 1])
+
+@lru_cache(maxsize=2)
+def _quadgram_table(local_: bool=False) -> np.ndarray:
+    """
+    Return the log10 probabilities of all `26^4` English quadgrams as a flat
+    array indexed in base 26. Unseen quadgrams get a floor value of `0.01/N`.
+    """
+    rows = utils.query_db('quadgrams.db', "SELECT Gram, Count FROM Quadgram", local_=local_)
+    grams = np.frombuffer(''.join(row[0] for row in rows).encode('ascii'), dtype=np.uint8).reshape(-1, 4) - ord('A')
+    counts = np.array([row[1] for row in rows], dtype=np.float64)
+    total = counts.sum()
+    table = np.full(26 ** 4, math.log10(0.01 / total))
+    table[grams.astype(np.int64) @ __quadgram_weights] = np.log10(counts / total)
+    return table
+
+def _climb_substitution(grams: np.ndarray, counts: np.ndarray, time_budget: float, consensus: int, random_state: int, local_: bool) -> Tuple[float, np.ndarray]:
+    table = _quadgram_table(local_)
+    rng = np.random.default_rng(random_state)
+    deadline = time.perf_counter() + time_budget
+    # rows of the distinct quadgram matrix that contain each cypher letter
+    affected = [np.flatnonzero((grams == letter).any(axis=1)) for letter in range(26)]
+    pairs = np.array([(x, y) for x in range(26) for y in range(x+1, 26) if affected[x].size or affected[y].size])
+    # rows to rescore per swap, these don't depend on the key
+    pair_rows = [np.union1d(affected[x], affected[y]) for x, y in pairs]
+    best_score, best_key, hits = -math.inf, None, 0
+
+    while time.perf_counter() < deadline and hits < consensus:
+        key = rng.permutation(26)
+        scores = counts * table[key[grams] @ __quadgram_weights]
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            for pair in rng.permutation(len(pairs)):
+                (x, y), rows = pairs[pair], pair_rows[pair]
+                key[x], key[y] = key[y], key[x]
+                rescored = counts[rows] * table[key[grams[rows]] @ __quadgram_weights]
+                if rescored.sum() > scores[rows].sum():
+                    scores[rows] = rescored
+                    improved = True
+                else:
+                    key[x], key[y] = key[y], key[x]
+
+        score = scores.sum()
+        if math.isclose(score, best_score):
+            hits += 1
+        elif score > best_score:
+            best_score, best_key, hits = score, key.copy(), 1
+
+    return best_score, best_key
+
+def crack_substitution(cypher: str, time_budget: float=10, workers: int=None, consensus: int=3, local_: bool=False) -> SubstitutionSolution:
+    """
+    Break a simple substitution cypher (e.g. `encrypt_caesar_cypher` with a shuffled
+    `seed`) by random-restart hill-climbing. Each climb starts from a random key
+    and keeps swapping two letters for as long as this improves the quadgram fitness
+    of the decrypted text. Climbs are distributed across `workers` processes (one
+    per CPU by default) that stop after `time_budget` seconds, or once the same
+    optimum has been found `consensus` times.
+
+    Example
+    -------
+    ```
+    >>> import random, string
+    >>> from lolicon.compsci import cryptography as crypto
+    >>> msg = ('it is a truth universally acknowledged, that a single man in possession of a good fortune, '
+    ...        'must be in want of a wife. however little known the feelings or views of such a man may be '
+    ...        'on his first entering a neighbourhood, this truth is so well fixed in the minds of the '
+    ...        'surrounding families, that he is considered as the rightful property of some one or other '
+    ...        'of their daughters.')
+    >>> seed = ''.join(random.sample(string.ascii_lowercase, 26))
+    >>> cypher = crypto.encrypt_caesar_cypher(msg, shift=7, seed=seed)
+    >>> solution = crypto.crack_substitution(cypher, time_budget=5)
+    >>> print(solution.plaintext == msg)
+    True
+    ```
+
+    Notes
+    -----
+    - The fitness of a key is the sum of log probabilities of all quadgrams in
+    the decrypted text, which were taken from Isaac Newton's "Opticks"
+    - Quadgrams are scored once per distinct cypher quadgram (weighted by their
+    frequency), and swapping two letters only rescores the quadgrams that contain
+    one of them
+    - Only English letters take part in the attack; the case of `cypher` is preserved
+    in the plaintext and all other characters are left as they are
+    - Short cyphers below the unicity distance (about 28 letters) may decrypt to
+    English-looking text that is not the original message
+    - The returned `key` is the substitution alphabet, i.e. `key[i]` is the cypher
+    letter of `string.ascii_lowercase[i]`
+
+    References
+    ----------
+    - <http://practicalcryptography.com/cryptanalysis/stochastic-searching/cryptanalysis-simple-substitution-cipher/>
+    - <https://en.wikipedia.org/wiki/Hill_climbing>
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if time_budget <= 0 or workers < 1 or consensus < 1:
+        logger.error(f"Invalid search parameters for {time_budget=}, {workers=}, {consensus=}")
+        raise ValueError(f"{time_budget=} must be positive, {workers=} and {consensus=} must be at least 1.")
+
+    letters = np.array([string.ascii_uppercase.find(char) for char in cypher.upper() if char in string.ascii_uppercase], dtype=np.int64)
+    if letters.size < 4:
+        logger.error(f"Cypher is too short for a quadgram analysis: {cypher=}")
+        raise ValueError("The cypher must contain at least four English letters.")
+
+    windows = np.lib.stride_tricks.sliding_window_view(letters, 4) @ __quadgram_weights
+    codes, counts = np.unique(windows, return_counts=True)
+    grams = (codes[:, np.newaxis] // __quadgram_weights) % 26
+    counts = counts.astype(np.float64)
+
+    if workers == 1:
+        results = [_climb_substitution(grams, counts, time_budget, consensus, randrange(2**32), local_)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_climb_substitution, grams, counts, time_budget, consensus, randrange(2**32), local_) for _ in range(workers)]
+            results = [future.result() for future in futures]
+
+    score, key = max(results, key=lambda result: result[0])
+    # key maps cypher letters onto plaintext letters, invert it to get the substitution alphabet
+    alphabet = ''.join(string.ascii_lowercase[cypher_letter] for cypher_letter in np.argsort(key))
+    translation = str.maketrans(alphabet + alphabet.upper(), string.ascii_lowercase + string.ascii_uppercase)
+    return SubstitutionSolution(alphabet, cypher.translate(translation), float(score))
+
+class _MemoryMappedWords(object):
+    """
+    Read-only view over the lines of a sorted, memory-mapped word list. The first
+    line that starts on each page of `page_size` bytes is found by scanning to the
+    nearest line break, and a lookup bisects these lines before it searches the
+    bytes of a single page, so no index of all line offsets is built. Line breaks
+    may be LF or CRLF.
+    """
+    def __init__(self, buffer: mmap.mmap, page_size: int=1 << 9) -> _MemoryMappedWords:
+        self.__buffer = buffer
+        self.__length = None
+        end = buffer.find(b'\n')
+        self.__newline = b'\r\n' if end > 0 and buffer[end-1:end] == b'\r' else b'\n'
+        self.__starts = [0]
+        for boundary in range(page_size, len(buffer), page_size):
+            start = buffer.find(b'\n', boundary - 1) + 1
+            if not 0 < start < len(buffer):
+                break
+            if start > self.__starts[-1]:
+                self.__starts.append(start)
+        self.__firsts = [self.__line(start) for start in self.__starts]
+        self.__starts.append(len(buffer))
+        # the last line may not be terminated
+        self.__last = self.__line(buffer.rfind(b'\n', 0, len(buffer) - 1) + 1) if len(buffer) else b''
+        # frequent words recur in every candidate text, remember the latest lookups
+        self.__lookup = lru_cache(maxsize=1 << 14)(self.__search)
+
+    def __len__(self) -> int:
+        if self.__length is None:
+            self.__length = sum(1 for _ in self)
+        return self.__length
+
+    def __iter__(self) -> Iterator[bytes]:
+        start = 0
+        while start < len(self.__buffer):
+            line = self.__line(start)
+            if line:
+                yield line
+            start = self.__buffer.find(b'\n', start) + 1 or len(self.__buffer)
+
+    def __contains__(self, word: bytes) -> bool:
+        return self.__lookup(word)
+
+    def __search(self, word: bytes) -> bool:
+        page = bisect_right(self.__firsts, word) - 1
+        if page < 0 or not word or b'\n' in word:
+            return False
+        if word in (self.__firsts[page], self.__last):
+            return True
+        # every other line of the page is preceded and followed by a line break
+        return self.__buffer.find(b'\n' + word + self.__newline, self.__starts[page], self.__starts[page+1]) >= 0
+
+    def __line(self, start: int) -> bytes:
+        end = self.__buffer.find(b'\n', start)
+        return self.__buffer[start:end if end >= 0 else len(self.__buffer)].rstrip(b'\r')
+
+class EnglishDictionary(object):
+    """
+    EnglishDictionary
+    =================
+
+    Basic Usage
+    -----------
+        >>> from lolicon.compsci import cryptography as crypto
+        >>> dictionary = crypto.EnglishDictionary()
+        >>> print(b'HELLO' in dictionary)
+        True
+
+    Membership index over the English word list that ships with this package.
+    Words are expected as uppercase ASCII `bytes`. The list is loaded the first
+    time the dictionary is queried, either into a `frozenset` or, if `memory_map`
+    is set, as a memory-mapped file whose sorted lines are searched by bisection.
+    The memory-mapped index caches the results of recent lookups. The optional
+    Bloom filter tests all words of a `count` call at once with NumPy and keeps
+    most non-words away from the index.
+
+    The word list contains 68k frequently used English words from `wordfreq`
+    (CC BY-SA 4.0) that also occur as headwords in GCIDE or Webster's Second
+    International, or are regular inflections of one.
+    """
+    def __init__(self, memory_map: bool=False, bloom_filter: bool=False, local_: bool=False) -> EnglishDictionary:
+        """
+        Create a new (lazily loaded) dictionary index.
+        """
+        self.__memory_map = memory_map
+        self.__bloom_filter = bloom_filter
+        self.__local = local_
+        self.__words = None
+        self.__bloom = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(MemoryMap={self.__memory_map}, BloomFilter={self.__bloom_filter})"
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: bytes) -> bool:
+        if self.__bloom_filter and not self.__maybe_contains([word])[0]:
+            return False
+        return word in self.words
+
+    def count(self, words) -> int:
+        """
+        Return how many `words` are contained in this dictionary. The Bloom filter
+        tests all `words` at once before the index is queried.
+        """
+        if self.__bloom_filter:
+            words = list(words)
+            words = compress(words, self.__maybe_contains(words)) if words else words
+        return sum(map(self.words.__contains__, words))
+
+    #region bloom filter
+
+    __bloom_size = 1 << 20
+    __bloom_steps = np.arange(4)
+
+    def __bloom_indices(self, words: List[bytes]) -> np.ndarray:
+        # double hashing h1 + i * h2, the checksums run in C and are combined for all words at once
+        h1 = np.fromiter(map(zlib.crc32, words), dtype=np.int64, count=len(words))
+        h2 = np.fromiter(map(zlib.adler32, words), dtype=np.int64, count=len(words)) | 1
+        return (h1[:, np.newaxis] + self.__bloom_steps * h2[:, np.newaxis]) & (self.__bloom_size - 1)
+
+    def __maybe_contains(self, words: List[bytes]) -> np.ndarray:
+        bloom = self.__bloom if self.__bloom is not None else self.__build_bloom()
+        indices = self.__bloom_indices(words)
+        return np.all((bloom[indices >> 3] >> (indices & 7).astype(np.uint8)) & 1, axis=1)
+
+    def __build_bloom(self) -> np.ndarray:
+        bloom = BitVector(self.__bloom_size)
+        bloom[self.__bloom_indices(list(self.words)).ravel()] = True
+        # bit i is bit i % 8 of byte i // 8, which is cheaper to test than BitVector's words
+        self.__bloom = np.frombuffer(bloom.tobytes(), dtype=np.uint8)
+        return self.__bloom
+
+    #endregion
+
+    @property
+    def words(self):
+        """
+        Return the underlying word index, loading it on first access.
+        """
+        if self.__words is None:
+            with resource_path('src.lolicon.data' if self.__local else 'lolicon.data', 'dictionary.txt') as resource_handler:
+                with open(resource_handler, mode='rb') as file_handler:
+                    if self.__memory_map:
+                        self.__words = _MemoryMappedWords(mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ))
+                    else:
+                        self.__words = frozenset(file_handler.read().split())
+        return self.__words
+
+__non_letters = bytes(set(range(256)) - set(string.ascii_uppercase.encode('ascii')) - set(b' \t\n'))
+
+@lru_cache(maxsize=1)
+def _default_dictionary() -> EnglishDictionary:
+    return EnglishDictionary()
+
+def is_english(text: str, word_percentage: int=20, letter_percentage: int=85, dictionary: EnglishDictionary=None) -> bool:
+    """
+    Detect whether `text` is likely to be written in English. At least `letter_percentage`
+    of all characters must be letters or whitespace, and at least `word_percentage`
+    of all words must occur in `dictionary` (the package word list by default).
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import cryptography as crypto
+    >>> msg = 'Mathematics is the queen of the sciences.'
+    >>> crypto.is_english(msg)
+    True
+    >>> crypto.is_english(crypto.encrypt_caesar_cypher(msg))
+    False
+    ```
+
+    Notes
+    -----
+    - The word check stops as soon as enough dictionary words were found, or when
+    the remaining words can no longer reach `word_percentage`, which makes this
+    function cheap enough to test the output of brute force attacks
+    - Words are compared case-insensitively, non-ASCII characters count as non-letters
+
+    References
+    ----------
+    - "A Beginner's Guide to Cryptography and Computer Programming with Python" by Al Sweigart (Chapter 12)
+    """
+    if not text:
+        return False
+
+    letters = text.upper().encode('ascii', 'ignore').translate(None, __non_letters)
+    if len(letters) * 100 < letter_percentage * len(text):
+        return False
+
+    dictionary = _default_dictionary() if dictionary is None else dictionary
+    words = letters.split()
+    required = math.ceil(len(words) * word_percentage / 100)
+    matches = 0
+
+    # batches double in size, such that the per-call cost of the Bloom filter is amortized
+    index, size = 0, 16
+    while index < len(words):
+        if matches >= required:
+            return True
+        if matches + len(words) - index < required:
+            return False
+        matches += dictionary.count(words[index:index+size])
+        index, size = index + size, 2 * size
+
+    return bool(words) and matches >= required
+
+def english_score(text: str, dictionary: EnglishDictionary=None) -> float:
+    """
+    Return the fraction of words in `text` that occur in `dictionary` (the package
+    word list by default). Unlike `is_english`, this scans all words and can be
+    used to rank decryption candidates.
+    """
+    dictionary = _default_dictionary() if dictionary is None else dictionary
+    words = text.upper().encode('ascii', 'ignore').translate(None, __non_letters).split()
+    return dictionary.count(words) / len(words) if words else 0.0
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import gc
+import time
+import tracemalloc
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from ..utils import logger
+
+ComplexityFit = namedtuple('ComplexityFit', 'model constants error')
+ComplexityProfile = namedtuple('ComplexityProfile', 'sizes times peaks best fits')
+
+# growth functions g(n) of the candidate models a + b * g(n), from the simplest to the steepest
+_complexity_models: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'O(1)': np.zeros_like,
+    'O(log n)': np.log2,
+    'O(n)': lambda n: n,
+    'O(n log n)': lambda n: n * np.log2(n),
+    'O(n^2)': np.square,
+    'O(2^n)': np.exp2,
+}
+
+def _fit_model(sizes: np.ndarray, values: np.ndarray, model: str) -> ComplexityFit:
+    """
+    Fit `values ~ a + b * g(sizes)` with non-negative constants `(a, b)` by
+    least squares relative to `values`, so that small and large sizes weigh
+    equally. The error is the root mean square of the relative residuals.
+    """
+    with np.errstate(over='ignore'):
+        growth = _complexity_models[model](sizes.astype(np.float64))
+    if not np.all(np.isfinite(growth)):
+        return ComplexityFit(model, (np.nan, np.nan), np.inf)
+
+    values, weights = values.astype(np.float64), 1 / np.maximum(values, 1)
+    # if the unconstrained fit has a negative constant, the best admissible fit lies on a boundary
+    designs = [(0, 1), (0,), (1,)] if model != 'O(1)' else [(0,)]
+    basis, best = np.column_stack((np.ones_like(growth), growth)), ComplexityFit(model, (np.nan, np.nan), np.inf)
+    for columns in designs:
+        design = basis[:, columns]
+        solution, *_ = np.linalg.lstsq(design * weights[:, None], values * weights, rcond=None)
+        if np.any(solution < 0):
+            continue
+        error = float(np.sqrt(np.mean(((design @ solution - values) * weights) ** 2)))
+        if error < best.error:
+            constants = [0.0, 0.0]
+            for column, constant in zip(columns, solution):
+                constants[column] = float(constant)
+            best = ComplexityFit(model, tuple(constants), error)
+    return best
+
+def fit_complexity(sizes: np.ndarray, values: np.ndarray, tolerance: float=0.1) -> Tuple[ComplexityFit, List[ComplexityFit]]:
+    """
+    Fit `values` measured at `sizes` to each complexity model and return the
+    best fit and all fits sorted by their relative error. The best fit is the
+    simplest model whose error is within `tolerance` of the smallest one, such
+    that measurement noise does not favour a steeper model.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import fit_complexity
+    >>> sizes = np.array([10, 100, 1000, 10000])
+    >>> best, fits = fit_complexity(sizes, 5 + 3 * sizes ** 2)
+    >>> best
+    ComplexityFit(model='O(n^2)', constants=(...), error=...)
+    ```
+    """
+    sizes, values = np.asarray(sizes), np.asarray(values)
+    fits = sorted((_fit_model(sizes, values, model) for model in _complexity_models), key=lambda fit: fit.error)
+    threshold = fits[0].error * (1 + tolerance) + 1e-12
+    best = next(fit for fit in sorted(fits, key=lambda fit: list(_complexity_models).index(fit.model)) if fit.error <= threshold)
+    return best, fits
+
+def _measure(function: Callable, setup: Callable[[int], Any], size: int, warmups: int, repeats: int, memory: bool):
+    """
+    Return the fastest of `repeats` calls of `function(setup(size))` in
+    nanoseconds and, if `memory` is set, the peak of memory allocated by a
+    single call in bytes.
+    """
+    for _ in range(warmups):
+        function(setup(size))
+
+    timings, enabled = [], gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            argument = setup(size)
+            start = time.perf_counter_ns()
+            function(argument)
+            timings.append(time.perf_counter_ns() - start)
+    finally:
+        if enabled:
+            gc.enable()
+
+    peak = 0
+    if memory:
+        argument = setup(size)
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        else:
+            # Python 3.8 can only reset the peak by restarting, which discards the caller's traces
+            limit = tracemalloc.get_traceback_limit()
+            tracemalloc.stop()
+            tracemalloc.start(limit)
+        baseline, _ = tracemalloc.get_traced_memory()
+        function(argument)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        if not tracing:
+            tracemalloc.stop()
+    return min(timings), peak
+
+def profile_complexity(
+        function: Callable,
+        setup: Callable[[int], Any]=None,
+        sizes: Iterable[int]=None,
+        start: int=1 << 6,
+        stop: int=1 << 16,
+        factor: float=2,
+        warmups: int=1,
+        repeats: int=5,
+        memory: bool=False,
+        tolerance: float=0.1
+    ) -> ComplexityProfile:
+    """
+    Estimate the time complexity of `function` empirically. For each input
+    size `n`, `function(setup(n))` is called `warmups` times, and then timed
+    `repeats` times with `time.perf_counter_ns`, of which the fastest run is
+    kept. `setup` runs outside of the measurement and defaults to passing `n`
+    itself. Unless `sizes` are given, they form the geometric sequence from
+    `start` to `stop` with ratio `factor`. If `memory` is set, the peak memory
+    allocated by one call is recorded with `tracemalloc` in a separate run.
+
+    The timings are fit to `a + b * g(n)` for each model in `O(1)`, `O(log n)`,
+    `O(n)`, `O(n log n)`, `O(n^2)` and `O(2^n)`, see `fit_complexity`, which
+    also applies to the memory `peaks`.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.compsci import profile_complexity
+    >>> from lolicon.mathematics import sieve_of_eratosthenes
+    >>> profile = profile_complexity(sieve_of_eratosthenes, start=1 << 10, stop=1 << 20)
+    >>> profile.best.model
+    'O(n)'
+    >>> profile = profile_complexity(sorted, setup=lambda n: list(range(n, 0, -1)))
+    >>> profile.best
+    ComplexityFit(model='O(n)', constants=(...), error=...)
+    ```
+
+    Note
+    ----
+    Sizes should span at least two orders of magnitude, else neighbouring models
+    such as `O(n)` and `O(n log n)` cannot be told apart. Constants are in
+    nanoseconds (or bytes) per unit of `g(n)`.
+    """
+    if sizes is None:
+        if start < 1 or stop < start or factor <= 1:
+            logger.error(f"Invalid size sweep: {start=}, {stop=}, {factor=}")
+            raise ValueError(f"Sizes must satisfy 1 <= {start=} <= {stop=} and {factor=} > 1.")
+        sizes = np.unique(np.round(start * factor ** np.arange(int(np.log(stop / start) / np.log(factor) + 1e-9) + 1)).astype(np.int64))
+    sizes = np.asarray(list(sizes), dtype=np.int64)
+    if len(sizes) < 3 or sizes.min() < 1:
+        logger.error(f"Too few or invalid input sizes: {sizes=}")
+        raise ValueError(f"At least three positive input sizes are required, but got {sizes=}.")
+    if repeats < 1:
+        logger.error(f"Invalid number of repetitions: {repeats=}")
+        raise ValueError(f"{repeats=} must be positive.")
+
+    setup = setup or (lambda n: n)
+    measurements = [_measure(function, setup, int(size), warmups, repeats, memory) for size in sizes]
+    times, peaks = (np.array(column, dtype=np.int64) for column in zip(*measurements))
+
+    best, fits = fit_complexity(sizes, times, tolerance)
+    return ComplexityProfile(sizes, times, peaks if memory else None, best, fits)
@@ -1,55 +1,129 @@
 #!/usr/bin/env python3
 
+import decimal
 import math
+import os
 import random
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from multiprocessing import shared_memory
+from pathlib import Path
+from statistics import NormalDist
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
 
 def gcd(a: int, b: int) -> int:
     """
     Return the greatest common denominator of `x` and `y` by using Euclid's GCD algorithm.
+    If either argument is a NumPy array, the result is computed elementwise with
+    broadcasting. Use `gcd.reduce` to fold an entire array.
 
     Example
     -------
     >>> from lolicon.mathematics import gcd
     >>> gcd(24, 30)
     >>> 6
+    >>> gcd(np.array([24, 35, 12]), 30)
+    >>> array([6, 5, 6])
+    >>> gcd.reduce(np.array([24, 36, 60]))
+    >>> 12
     """
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.gcd(a, b)
     while b:
         a, b = b, a % b
     return a
 
+gcd.reduce = np.gcd.reduce
+
+def lcm(a: int, b: int) -> int:
+    """
+    Return the least common multiple of `a` and `b`, elementwise if either
+    argument is a NumPy array. Use `lcm.reduce` to fold an entire array.
+
+    Example
+    -------
+    >>> from lolicon.mathematics import lcm
+    >>> lcm(4, 6)
+    >>> 12
+    """
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.lcm(a, b)
+    return abs(a // gcd(a, b) * b) if a and b else 0
+
+lcm.reduce = np.lcm.reduce
+
+def egcd(a: int, b: int) -> Tuple[int, int, int]:
+    """
+    Return `g, x, y` such that `g = gcd(a, b) = a * x + b * y` by using Euclid's
+    Extended Algorithm, which finds the Bézout coefficients `x` and `y` in the
+    same pass as the greatest common denominator.
+
+    Example
+    -------
+    >>> from lolicon.mathematics import egcd
+    >>> egcd(240, 46)
+    >>> (2, -9, 47)
+    """
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b:
+        q = a // b
+        a, b = b, a - q * b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+def __mod_inverse_array(a: np.ndarray, m) -> np.ma.MaskedArray:
+    # runs the extended algorithm on all elements at once, finished lanes are frozen
+    r0, r1 = np.broadcast_arrays(np.asarray(m, dtype=np.int64), np.asarray(a, dtype=np.int64) % m)
+    r0, r1 = r0.copy(), r1.copy()
+    t0, t1 = np.zeros_like(r0), np.ones_like(r0)
+    while (active := r1 != 0).any():
+        q = r0 // np.where(active, r1, 1)
+        r0, r1 = np.where(active, r1, r0), np.where(active, r0 - q * r1, r1)
+        t0, t1 = np.where(active, t1, t0), np.where(active, t0 - q * t1, t1)
+    return np.ma.masked_array(t0 % m, mask=r0 != 1)
+
 def mod_inverse(a: int, m: int) -> int or None:
     """
     The modular inverse of two numbers `a` and `m` is defined by the equation
     `(a * i) % m = 1`. The value only exists if `a` and `m` are relatively prime.
     If that's not the case, this function will return `None` instead.
 
+    If `a` or `m` is a NumPy array, the inverses are computed elementwise and
+    returned as masked array in which the non-invertible entries are masked.
+
     Example
     -------
     >>> from lolicon.mathematics import mod_inverse
     >>> mod_inverse(5, 7)
     >>> 3
+    >>> mod_inverse(np.arange(6), 6).filled(0)
+    >>> array([0, 1, 0, 0, 0, 5])
 
     Note
     ----
     - This function uses Euclid's Extended Algorithm to find the modular inverse.
+    - Array inputs must fit into `np.int64`.
     """
-    if gcd(a, m) != 1:
-        return None
-    u1, u2, u3 = 1, 0, a
-    v1, v2, v3 = 0, 1, m
-    while v3 != 0:
-        q = u3 // v3
-        v1, v2, v3, u1, u2, u3 = (u1 - q * v1), (u2 - q * v2), (u3 - q * v3), v1, v2, v3
-    return u1 % m
+    if isinstance(a, np.ndarray) or isinstance(m, np.ndarray):
+        return __mod_inverse_array(a, m)
+    g, x, _ = egcd(a % m, m)
+    return x % m if g == 1 else None
 
 def euler(n: int) -> float:
     """
     Uses the series definition to find an approximation of Euler's number.
+    Each term `1/k!` is derived from its predecessor, so this takes `O(n)` float
+    operations. Use `e_digits` for more than 16 significant digits.
 
     Note
     ----
-    It takes `100` terms for this function to pass its unit test, i.e. to be equal
-    when rounded to 7 decimal places.
+    The float sum saturates after `18` terms, well before the `100` terms its
+    unit test uses to be equal when rounded to 7 decimal places.
 
     ```
     >>> from lolicon import mathematics
@@ -61,7 +135,11 @@ def euler(n: int) -> float:
     2.718281828459045
     ```
     """
-    return sum(map(lambda k: 1**k / math.factorial(k), range(n)))
+    total, term = 0.0, 1.0
+    for k in range(n):
+        total += term
+        term /= k + 1
+    return total
 
 def pi(n: int) -> float:
     """
@@ -69,24 +147,502 @@ def pi(n: int) -> float:
 
     Note
     ----
-    It takes `1_000_000` terms for this function to pass its unit test,
-    i.e. to be equal when rounded to 5 decimal places.
+    It takes `1_000_000` terms for this partial sum to be equal to pi when rounded
+    to 5 decimal places. Pass the same terms to `series` with `method='euler'` to
+    reach machine precision after about a hundred terms.
 
     ```
     >>> from lolicon import mathematics
     >>> mathematics.pi(n=1_000_000)
-    3.1415916535897743
+    3.141591653589794
     >>> # compare:
     >>> import lolicon.constants as const
     >>> const.PI
     3.141592653589793
     ```
     """
-    return 4 * sum(map(lambda k: (-1)**k / (2*k+1), range(n)))
+    k = np.arange(n)
+    return 4 * float(np.sum((1 - 2 * (k & 1)) / (2 * k + 1)))
+
+SeriesResult = namedtuple('SeriesResult', 'value error terms')
+
+def __accelerate_none(n: np.ndarray, sums: np.ndarray) -> Tuple[float, float]:
+    return sums[-1], abs(sums[-1] - sums[-2])
+
+def __accelerate_aitken(n: np.ndarray, sums: np.ndarray) -> Tuple[float, float]:
+    # iterated Aitken's delta-squared process, each pass shortens the sequence by two
+    while len(sums) >= 4:
+        d1, d2 = np.diff(sums[1:]), np.diff(sums, 2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            accelerated = sums[2:] - d1 * d1 / d2
+        sums = np.where(np.isfinite(accelerated), accelerated, sums[2:])
+    return sums[-1], abs(sums[-1] - sums[-2])
+
+def __accelerate_euler(n: np.ndarray, sums: np.ndarray) -> Tuple[float, float]:
+    # Euler–van Wijngaarden: repeatedly averaging neighbouring partial sums
+    # applies the Euler transform to the tail of an alternating series
+    while len(sums) > 2:
+        sums = (sums[1:] + sums[:-1]) / 2
+    return sums[-1], abs(sums[-1] - sums[-2])
+
+def __accelerate_richardson(n: np.ndarray, sums: np.ndarray) -> Tuple[float, float]:
+    # polynomial extrapolation of the partial sums to h = 1/n -> 0 in Neville's scheme,
+    # applied to the sums at the end of each block
+    h, table, estimates = 1 / n, sums, [sums[-1]]
+    for j in range(1, len(n)):
+        table = table[1:] + (table[1:] - table[:-1]) / (h[:-j] / h[j:] - 1)
+        estimates.append(table[-1])
+    return estimates[-1], abs(estimates[-1] - estimates[-2])
+
+__accelerators = {
+    'none': __accelerate_none,
+    'aitken': __accelerate_aitken,
+    'euler': __accelerate_euler,
+    'richardson': __accelerate_richardson,
+}
+
+def series(term: Callable[[np.ndarray], np.ndarray], tol: float=1e-12, method: str='aitken', start: int=0, block_size: int=1 << 16, max_terms: int=1 << 26) -> SeriesResult:
+    """
+    Evaluate the infinite series whose `k`-th term is `term(k)` for `k >= start`
+    until the estimated error is below `tol`. `term` is called with an `np.int64`
+    array of indices and must return an array of the same shape, the partial
+    sums are accumulated in blocks which double in size up to `block_size`.
+
+    After each block the last few partial sums are passed through one of the
+    following convergence accelerators:
+
+    - `none`: plain partial sums
+    - `aitken`: iterated Aitken delta-squared process, good for linearly
+      converging and alternating series
+    - `euler`: Euler–van Wijngaarden transform, best for alternating series
+      such as Leibniz' series
+    - `richardson`: Richardson extrapolation, for series whose partial sums
+      approach the limit like a power of `1/n`, such as `1/k^2`
+
+    Richardson extrapolates the sums at the end of each block, the others
+    transform the last 16 partial sums. The change of the accelerated value
+    between the last two blocks relative to the change before is taken as the
+    rate of convergence, from which the remaining error is extrapolated. The
+    estimate is never below the spread within the accelerated sequence. Returns
+    the value, the error estimate and the number of terms used. If `max_terms`
+    is exhausted first, the result is returned anyway and its error exceeds `tol`.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.mathematics import series
+    >>> series(lambda k: 4 * (-1.0)**k / (2*k + 1), tol=1e-12, method='euler')
+    SeriesResult(value=3.141592653589794, error=3.3306690738754696e-15, terms=96)
+    ```
+
+    Note
+    ----
+    - The error is an estimate, not a rigorous bound. It is about right for
+    geometric and power-law convergence, such as `1/k^2` without Richardson
+    extrapolation, but may be off by an order of magnitude for anything else
+    - If the changes between blocks don't shrink, e.g. when an accelerator fails
+    on a slowly converging series, the error is reported as infinite
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Series_acceleration>
+    - <https://en.wikipedia.org/wiki/Van_Wijngaarden_transformation>
+    - Bender & Orszag: Advanced Mathematical Methods for Scientists and Engineers, 8.1
+    """
+    if method not in __accelerators:
+        raise ValueError(f"{method=} must be one of {', '.join(map(repr, __accelerators))}.")
+
+    accelerate, window = __accelerators[method], 16
+    total, terms, size = 0.0, 0, 32
+    sums, ends, value, previous = np.empty(0), [], 0.0, []
+
+    while terms < max_terms:
+        size = min(size, block_size, max_terms - terms)
+        k = np.arange(start + terms, start + terms + size, dtype=np.int64)
+        block = np.cumsum(np.broadcast_to(np.asarray(term(k), dtype=np.float64), k.shape)) + total
+        total, terms = block[-1], terms + size
+        sums = np.concatenate((sums, block))[-window:]
+        ends = (ends + [(terms, total)])[-6:]
+
+        if method == 'richardson':
+            if len(ends) < 3:
+                continue
+            n, sample = map(np.array, zip(*ends))
+        else:
+            if len(sums) < window:
+                continue
+            n, sample = np.arange(terms - window + 1, terms + 1), sums
+
+        value, error = accelerate(n.astype(np.float64), sample)
+        if previous:
+            # the change since the previous block, scaled to the length of the block
+            # before; if changes contract by a ratio r < 1, the remaining error is
+            # about change * r / (1 - r), otherwise it can't be bounded at all
+            change = abs(value - previous[-1][0]) * previous[-1][1] / size
+            before = abs(previous[-1][0] - previous[-2][0]) if len(previous) > 1 else math.inf
+            if change < before:
+                tail = change * change / (before - change)
+            else:
+                tail = change if before <= max(tol, 4 * np.spacing(value)) else math.inf
+            error = max(error, change, tail)
+            if error <= tol:
+                break
+        previous, size = (previous + [(value, size)])[-2:], 2 * size
+
+    return SeriesResult(float(value), float(error), terms)
+
+# 640320^3 / 24, the denominator constant of the Chudnovsky series
+__chudnovsky_c3_24 = 640320**3 // 24
+
+# each term of the Chudnovsky series contributes log10(151931373056000) digits
+__chudnovsky_digits_per_term = 14.181647462725477
+
+# exact integer arithmetic in decimal: libmpdec switches to a number-theoretic
+# transform for huge operands, which is much faster than CPython's Karatsuba
+__exact = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+# binary splitting state (terms, P, Q, T) of the largest sum computed so far,
+# together with the longest verified digit string derived from it
+__chudnovsky_cache = {'terms': 0, 'P': decimal.Decimal(1), 'Q': decimal.Decimal(1), 'T': decimal.Decimal(0), 'digits': ''}
+
+def __chudnovsky_split(a: int, b: int) -> Tuple[decimal.Decimal, decimal.Decimal, decimal.Decimal]:
+    """
+    Evaluate the terms `[a, b)` of the Chudnovsky series by binary splitting.
+    Must be called inside an exact decimal context.
+    """
+    if b - a == 1:
+        if a == 0:
+            P = Q = decimal.Decimal(1)
+        else:
+            P = decimal.Decimal((6*a - 5) * (2*a - 1) * (6*a - 1))
+            Q = decimal.Decimal(a * a * a * __chudnovsky_c3_24)
+        T = P * (13591409 + 545140134 * a)
+        return P, Q, -T if a & 1 else T
 
-def sieve_of_eratosthenes(n: int):
+    m = (a + b) // 2
+    P1, Q1, T1 = __chudnovsky_split(a, m)
+    P2, Q2, T2 = __chudnovsky_split(m, b)
+    return P1 * P2, Q1 * Q2, T1 * Q2 + P1 * T2
+
+def pi_digits(digits: int) -> str:
     """
-    Return a list of all prime numbers in range of `[2, n)`.
+    Return pi truncated to `digits` decimal places by evaluating the Chudnovsky
+    series with binary splitting.
+
+    The partial sum is cached at module level, so asking for more digits than
+    before only evaluates the missing terms, and asking for fewer digits is a
+    slice of the cached result.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.mathematics import pi_digits
+    >>> pi_digits(30)
+    '3.141592653589793238462643383279'
+    ```
+
+    Note
+    ----
+    - Each term adds about 14 correct digits; a million digits take a few seconds.
+    - Ten guard digits are computed to absorb the rounding error of the final
+    division, so the truncated result is exact unless pi happens to contain a
+    run of ten nines right after the requested position. The guard digits are
+    never cached.
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Chudnovsky_algorithm>
+    - <https://en.wikipedia.org/wiki/Binary_splitting>
+    """
+    if digits < 0:
+        raise ValueError(f"{digits=} must be a non-negative integer.")
+
+    cache = __chudnovsky_cache
+    if len(cache['digits']) >= digits + 2:
+        return cache['digits'][:digits + 2].rstrip('.')
+
+    terms = int(digits / __chudnovsky_digits_per_term) + 2
+    if terms > cache['terms']:
+        with decimal.localcontext(__exact):
+            P, Q, T = __chudnovsky_split(cache['terms'], terms)
+            # merge [0, terms) from the cached [0, cached_terms) and the new tail
+            cache['T'] = cache['T'] * Q + cache['P'] * T
+            cache['P'] *= P
+            cache['Q'] *= Q
+            cache['terms'] = terms
+
+    context = decimal.Context(prec=digits + 10, Emax=decimal.MAX_EMAX, rounding=decimal.ROUND_FLOOR)
+    value = context.divide(context.multiply(context.multiply(cache['Q'], 426880), context.sqrt(decimal.Decimal(10005))), cache['T'])
+    # only the requested decimals are verified, the guard digits must not be served later
+    cache['digits'] = str(value)[:digits + 2].rstrip('.')
+    return cache['digits']
+
+def pi_digit_stream(chunk_size: int=64) -> Iterator[int]:
+    """
+    Generate the decimal digits of pi one at a time, starting with `3`.
+
+    The digits are computed in chunks whose size doubles each time the stream
+    runs dry, so that the total work stays proportional to the last chunk.
+
+    Example
+    -------
+    ```
+    >>> from itertools import islice
+    >>> from lolicon.mathematics import pi_digit_stream
+    >>> list(islice(pi_digit_stream(), 8))
+    [3, 1, 4, 1, 5, 9, 2, 6]
+    ```
+    """
+    if chunk_size < 1:
+        raise ValueError(f"{chunk_size=} must be a positive integer.")
+
+    yield 3
+    position = 0
+    while True:
+        decimals = pi_digits(position + chunk_size)[2:]
+        yield from map(int, decimals[position:])
+        position = len(decimals)
+        chunk_size *= 2
+
+# binary splitting state (terms, P, Q) of the largest partial sum of 1/k! computed
+# so far, together with the longest verified digit string derived from it
+__euler_cache = {'terms': 0, 'P': decimal.Decimal(0), 'Q': decimal.Decimal(1), 'digits': ''}
+
+def __euler_split(a: int, b: int) -> Tuple[decimal.Decimal, decimal.Decimal]:
+    """
+    Return `P` and `Q` such that `P / Q` equals the sum of `a! / k!` for `k` in
+    range of `(a, b]`, where `Q = (a+1) * ... * b`. Must be called inside an
+    exact decimal context.
+    """
+    if b - a == 1:
+        return decimal.Decimal(1), decimal.Decimal(b)
+
+    m = (a + b) // 2
+    P1, Q1 = __euler_split(a, m)
+    P2, Q2 = __euler_split(m, b)
+    return P1 * Q2 + P2, Q1 * Q2
+
+def e_digits(digits: int) -> str:
+    """
+    Return Euler's number truncated to `digits` decimal places by evaluating the
+    series of `1/k!` with binary splitting.
+
+    Like `pi_digits`, the partial sum is cached at module level, so asking for
+    more digits than before only evaluates the missing terms.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.mathematics import e_digits
+    >>> e_digits(30)
+    '2.718281828459045235360287471352'
+    ```
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Binary_splitting>
+    """
+    if digits < 0:
+        raise ValueError(f"{digits=} must be a non-negative integer.")
+
+    cache = __euler_cache
+    if len(cache['digits']) >= digits + 2:
+        return cache['digits'][:digits + 2].rstrip('.')
+
+    # the smallest number of terms whose truncation error 1/terms! is below the guard digits
+    bound = (digits + 10) * math.log(10)
+    lo, hi = 1, 2
+    while math.lgamma(hi + 1) < bound:
+        lo, hi = hi, 2 * hi
+    while lo < hi:
+        mid = (lo + hi) // 2
+        lo, hi = (mid + 1, hi) if math.lgamma(mid + 1) < bound else (lo, mid)
+    terms = lo + 1
+
+    if terms > cache['terms']:
+        with decimal.localcontext(__exact):
+            P, Q = __euler_split(cache['terms'], terms)
+            # merge (0, terms] from the cached (0, cached_terms] and the new tail
+            cache['P'] = cache['P'] * Q + P
+            cache['Q'] *= Q
+            cache['terms'] = terms
+
+    context = decimal.Context(prec=digits + 10, Emax=decimal.MAX_EMAX, rounding=decimal.ROUND_FLOOR)
+    value = context.add(1, context.divide(cache['P'], cache['Q']))
+    # only the requested decimals are verified, the guard digits must not be served later
+    cache['digits'] = str(value)[:digits + 2].rstrip('.')
+    return cache['digits']
+
+MonteCarloResult = namedtuple('MonteCarloResult', 'value error interval samples')
+
+def _monte_carlo_block(f: Callable[[np.ndarray], np.ndarray], bounds: np.ndarray, size: int, seed: np.random.SeedSequence) -> Tuple[int, float, float]:
+    """
+    Evaluate `f` at `size` uniform points in `bounds` drawn from the stream of
+    `seed`. Return the sample count, mean and sum of squared deviations.
+    """
+    lo, hi = bounds[:, 0], bounds[:, 1]
+    points = lo + (hi - lo) * np.random.default_rng(seed).random((size, len(bounds)))
+    values = np.asarray(f(points[:, 0] if len(bounds) == 1 else points), dtype=np.float64)
+    mean = values.mean()
+    return size, mean, float(np.sum((values - mean)**2))
+
+def _quarter_disk(points: np.ndarray) -> np.ndarray:
+    return 4.0 * (np.einsum('ij,ij->i', points, points) <= 1)
+
+def monte_carlo_integrate(f: Callable[[np.ndarray], np.ndarray], bounds, samples: int, workers: int=1, seed: int=None, confidence: float=0.95, block_size: int=1 << 20) -> MonteCarloResult:
+    """
+    Estimate the integral of `f` over the box `bounds` from `samples` uniformly
+    distributed points. `bounds` is a `(lo, hi)` pair or a sequence of pairs, one
+    per dimension. `f` is vectorized: it receives an `(n, d)` array of points,
+    or an `(n,)` array in one dimension, and returns `n` function values.
+
+    Points are drawn in blocks of `block_size`, each from its own stream spawned
+    from `np.random.SeedSequence(seed)`, and the block statistics are merged in
+    order, so the result for a given seed doesn't depend on `workers`. Blocks are
+    evaluated on a process pool if `workers > 1`, in which case `f` must be
+    picklable, i.e. defined at module level.
+
+    Returns the estimate, its standard error, the `confidence` interval from
+    the normal approximation and the number of samples.
+
+    Example
+    -------
+    ```
+    >>> import numpy as np
+    >>> from lolicon.mathematics import monte_carlo_integrate
+    >>> monte_carlo_integrate(np.sin, (0, np.pi), 10**6, seed=42).interval
+    (1.9978526623544925, 2.001640278239079)
+    ```
+
+    Note
+    ----
+    - The error shrinks like `1/sqrt(samples)` regardless of the dimension.
+    - Each worker only holds one block of `block_size * d` floats in memory.
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Monte_Carlo_integration>
+    - <https://numpy.org/doc/stable/reference/random/parallel.html>
+    """
+    if samples < 2:
+        raise ValueError(f"{samples=} must be at least 2.")
+    if not 0 < confidence < 1:
+        raise ValueError(f"{confidence=} must be in range of (0, 1).")
+
+    bounds = np.atleast_2d(np.asarray(bounds, dtype=np.float64))
+    sizes = [min(block_size, samples - start) for start in range(0, samples, block_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    task = partial(_monte_carlo_block, f, bounds)
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            blocks = list(executor.map(task, sizes, seeds, chunksize=max(1, len(sizes) // (4 * workers))))
+    else:
+        blocks = list(map(task, sizes, seeds))
+
+    # merge the block statistics pairwise (Chan et al.) in a fixed order
+    n, mean, m2 = blocks[0]
+    for count, block_mean, block_m2 in blocks[1:]:
+        delta = block_mean - mean
+        mean += delta * count / (n + count)
+        m2 += block_m2 + delta**2 * n * count / (n + count)
+        n += count
+
+    volume = float(np.prod(bounds[:, 1] - bounds[:, 0]))
+    value = volume * mean
+    error = volume * math.sqrt(m2 / (n - 1) / n)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    return MonteCarloResult(value, error, (value - z * error, value + z * error), n)
+
+def monte_carlo_pi(samples: int, workers: int=None, seed: int=None, confidence: float=0.95, block_size: int=1 << 20) -> MonteCarloResult:
+    """
+    Estimate pi from the fraction of `samples` uniform points in the unit square
+    that fall inside the quarter disk. See `monte_carlo_integrate` for how the
+    work is split across `workers` processes, one per CPU by default.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.mathematics import monte_carlo_pi
+    >>> monte_carlo_pi(10**8, seed=42).value
+    3.14168988
+    ```
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    return monte_carlo_integrate(_quarter_disk, [(0, 1), (0, 1)], samples, workers=workers, seed=seed, confidence=confidence, block_size=block_size)
+
+def __base_primes(n: int) -> List[int]:
+    """
+    Return all odd primes in range of `[3, n]` by using an odds-only sieve.
+    """
+    sieve = bytearray([1]) * (n // 2 + 1)
+    sieve[0] = 0
+    for i in range(3, math.isqrt(n) + 1, 2):
+        if sieve[i//2]:
+            sieve[i*i//2::i] = bytes(len(range(i*i//2, len(sieve), i)))
+    return [2 * i + 1 for i in np.flatnonzero(np.frombuffer(sieve, dtype=np.uint8)).tolist() if 2 * i + 1 <= n]
+
+def __cross_off(lo: int, hi: int, base_primes: List[int]) -> Tuple[int, bytearray]:
+    """
+    Sieve the odd numbers in range of `[lo, hi)`. Return the first odd number
+    and a flag for each odd number that is set if and only if it's prime.
+    """
+    first = lo | 1
+    if hi <= first:
+        return first, bytearray()
+
+    # segment[i] represents the odd number first + 2 * i
+    segment = bytearray([1]) * ((hi - first + 1) // 2)
+    for p in base_primes:
+        if p * p >= hi:
+            break
+        start = max(p * p, (first + p - 1) // p * p)
+        start += p if start % 2 == 0 else 0
+        index = (start - first) // 2
+        segment[index::p] = bytes(len(range(index, len(segment), p)))
+
+    if first == 1:
+        segment[0] = 0
+    return first, segment
+
+def _sieve_segment(lo: int, hi: int, base_primes: List[int]) -> np.ndarray:
+    """
+    Return all odd primes in range of `[lo, hi)` as NumPy array. `base_primes`
+    must contain all odd primes up to `sqrt(hi)`.
+    """
+    first, segment = __cross_off(lo, hi, base_primes)
+    return np.flatnonzero(np.frombuffer(segment, dtype=np.uint8)).astype(np.uint64) * 2 + first
+
+def primes(lo: int, hi: int, segment_size: int=1 << 20) -> Iterator[int]:
+    """
+    Yield all prime numbers in range of `[lo, hi)` in ascending order. The interval
+    is processed in segments that span `2 * segment_size` integers each, so that
+    memory consumption is bounded by `segment_size` bytes plus the primes up to
+    `sqrt(hi)`, regardless of how large `hi` is.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.mathematics import primes
+    >>> list(primes(100, 130))
+    [101, 103, 107, 109, 113, 127]
+    >>> next(primes(10**12, 10**12 + 1000))
+    1000000000039
+    ```
+    """
+    lo = max(lo, 0)
+    if lo <= 2 < hi:
+        yield 2
+
+    base_primes = __base_primes(math.isqrt(max(hi - 1, 0)))
+    for start in range(lo, hi, 2 * segment_size):
+        yield from _sieve_segment(start, min(start + 2 * segment_size, hi), base_primes).tolist()
+
+def sieve_of_eratosthenes(n: int, container: str='list', segment_size: int=1 << 20):
+    """
+    Return all prime numbers in range of `[2, n)`. By default, the primes are
+    returned as a list. Set `container` to `array` for an `array('Q')` or to `numpy`
+    for an `np.uint64` array, which take 8 bytes per prime instead of about 36.
 
     Example
     -------
@@ -95,14 +651,352 @@ def sieve_of_eratosthenes(n: int):
     >>> sieve_of_eratosthenes(11)
     [2, 3, 5, 7]
     ```
+
+    Note
+    ----
+    - This is a segmented sieve which only stores odd numbers, one byte each, and
+    crosses off multiples of each base prime `p` by slice assignment starting at
+    `p^2`. Use `primes` to iterate over large ranges in bounded memory.
+    """
+    if container not in ('list', 'array', 'numpy'):
+        raise ValueError(f"{container=} must be one of 'list', 'array' or 'numpy'.")
+
+    base_primes = __base_primes(math.isqrt(max(n - 1, 0)))
+    segments = [np.array([2] if n > 2 else [], dtype=np.uint64)]
+    segments += [_sieve_segment(start, min(start + 2 * segment_size, n), base_primes) for start in range(0, n, 2 * segment_size)]
+    result = np.concatenate(segments)
+
+    if container == 'numpy':
+        return result
+    return array('Q', result.tobytes()) if container == 'array' else result.tolist()
+
+SieveTables = namedtuple('SieveTables', 'spf phi mu sigma')
+
+__sieve_table_types = {'spf': np.uint32, 'phi': np.uint32, 'mu': np.int8, 'sigma': np.int64}
+
+def __fill_sieve_tables(spf: np.ndarray, phi: np.ndarray, mu: np.ndarray, sigma: np.ndarray, block_size: int) -> None:
+    """
+    Fill the zero-initialized tables of `sieve_tables` in place.
+    """
+    n = len(spf)
+    for p in [2] + __base_primes(math.isqrt(max(n - 1, 0))):
+        multiples = spf[p*p::p]
+        multiples[multiples == 0] = p
+    for start in range(0, n, block_size):
+        block = spf[start:start + block_size]
+        unmarked = np.flatnonzero(block == 0)
+        block[unmarked] = unmarked + start
+
+    # the largest power of spf[k] that divides k
+    power = np.zeros(n, dtype=np.uint32)
+    for table in (phi, mu, sigma, power):
+        table[1:2] = 1
+
+    lo = 2
+    while lo < n:
+        hi = min(lo + min(lo, block_size), n)
+        k = np.arange(lo, hi, dtype=np.int64)
+        p = spf[lo:hi].astype(np.int64)
+        m = k // p
+        repeated = spf[m] == p
+        power[lo:hi] = np.where(repeated, power[m] * p, p)
+        phi[lo:hi] = np.where(repeated, phi[m] * p, phi[m] * (p - 1))
+        mu[lo:hi] = np.where(repeated, 0, -mu[m])
+        # σ(p^e * r) = σ(p^(e-1) * r) * p + σ(r)
+        sigma[lo:hi] = np.where(repeated, sigma[m] * p + sigma[k // power[lo:hi]], sigma[m] * (p + 1))
+        lo = hi
+
+def sieve_tables(n: int, directory: Path=None, block_size: int=1 << 22) -> SieveTables:
+    """
+    Return tables of the smallest prime factor, Euler's totient `φ`, the Möbius
+    function `μ` and the divisor sum `σ` for all integers in range of `[0, n)`
+    as NumPy arrays, where index `0` holds `0` in every table.
+
+    The smallest prime factors are crossed off with the base primes up to
+    `sqrt(n)`. The other tables are filled as in a linear (Euler) sieve: every
+    `k` is split into `p = spf[k]` and `m = k // p`, and its values follow from
+    those of `m` in constant time. Since `m <= k / 2`, all `k` in a block that
+    starts at `lo` and spans at most `lo` integers only depend on finished
+    entries, so the recurrence is vectorized one block at a time.
+
+    If `directory` is set, the tables are written to `spf.npy`, `phi.npy`,
+    `mu.npy` and `sigma.npy` in that directory and returned as read-only memory
+    maps. Later calls (from any process) reuse existing files that are large
+    enough instead of sieving again. New tables are sieved into temporary files
+    that replace the old ones once they are complete, hence an interrupted or
+    concurrent sieve never leaves partially filled tables behind.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.mathematics import sieve_tables
+    >>> tables = sieve_tables(13)
+    >>> tables.phi.tolist()
+    [0, 1, 1, 2, 2, 4, 2, 6, 4, 6, 4, 10, 4]
+    >>> tables.mu.tolist()
+    [0, 1, -1, -1, 0, -1, 1, -1, 0, 0, 1, -1, 0]
+    ```
+
+    Note
+    ----
+    - The tables take 17 bytes per integer, plus 4 bytes of scratch space
+    during the sieve.
+
+    References
+    ----------
+    - <https://cp-algorithms.com/algebra/prime-sieve-linear.html>
+    """
+    if not 0 < n <= 2**32:
+        raise ValueError(f"{n=} must be in range of [1, 2^32].")
+
+    if directory is None:
+        tables = {name: np.zeros(n, dtype=dtype) for name, dtype in __sieve_table_types.items()}
+        __fill_sieve_tables(*(tables[name] for name in ('spf', 'phi', 'mu', 'sigma')), block_size)
+        return SieveTables(**tables)
+
+    paths = {name: Path(directory) / f"{name}.npy" for name in __sieve_table_types}
+    if all(path.exists() for path in paths.values()):
+        tables = {name: np.load(path, mmap_mode='r') for name, path in paths.items()}
+        if all(len(table) >= n for table in tables.values()):
+            return SieveTables(**{name: table[:n] for name, table in tables.items()})
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+    # the tables are sieved into temporary files which replace the old ones only once
+    # they are complete, such that other processes never map half-filled tables; any
+    # two tables are consistent with each other because smaller ones are prefixes
+    temporaries = {name: path.with_name(f"{path.name}.{os.getpid()}.{os.urandom(8).hex()}.tmp") for name, path in paths.items()}
+    try:
+        tables = {name: np.lib.format.open_memmap(temporaries[name], mode='w+', dtype=dtype, shape=(n,)) for name, dtype in __sieve_table_types.items()}
+        __fill_sieve_tables(*(tables[name] for name in ('spf', 'phi', 'mu', 'sigma')), block_size)
+        for table in tables.values():
+            table.flush()
+        del table, tables
+        for name, path in paths.items():
+            os.replace(temporaries[name], path)
+    finally:
+        for path in temporaries.values():
+            if path.exists():
+                path.unlink()
+    return SieveTables(**{name: np.load(path, mmap_mode='r') for name, path in paths.items()})
+
+__shared_base_primes = None
+
+def _attach_base_primes(name: str, size: int) -> None:
+    global __shared_base_primes
+    memory = shared_memory.SharedMemory(name=name)
+    __shared_base_primes = np.ndarray(size, dtype=np.uint64, buffer=memory.buf).tolist()
+    memory.close()
+
+def _sieve_shared_segment(bounds: Tuple[int, int], count: bool) -> int or np.ndarray:
+    if count:
+        return __cross_off(*bounds, __shared_base_primes)[1].count(1)
+    return _sieve_segment(*bounds, __shared_base_primes)
+
+def parallel_primes(n: int, workers: int=None, count: bool=False, segment_size: int=1 << 22) -> np.ndarray:
+    """
+    Sieve all prime numbers in range of `[2, n)` on a pool of `workers` processes,
+    which defaults to the number of processors on the machine. The base primes up
+    to `sqrt(n)` are computed once and shared with all workers through shared
+    memory, then each worker sieves independent segments that span `2 * segment_size`
+    integers. Return the primes as `np.uint64` array, or the number of primes in
+    each segment if `count` is set.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.mathematics import parallel_primes
+    >>> parallel_primes(10**10, count=True).sum()
+    455052511
+    ```
+
+    Note
+    ----
+    - Counting primes doesn't materialize them, so that each worker only holds
+    one segment of `segment_size` bytes in memory
+    - Since segments are independent, this function scales with the number of
+    available cores
+    """
+    base_primes = np.array(__base_primes(math.isqrt(max(n - 1, 0))), dtype=np.uint64)
+    tasks = [(start, min(start + 2 * segment_size, n)) for start in range(0, n, 2 * segment_size)]
+    memory = shared_memory.SharedMemory(create=True, size=max(base_primes.nbytes, 1))
+
+    try:
+        shared = np.ndarray(len(base_primes), dtype=np.uint64, buffer=memory.buf)
+        shared[:] = base_primes
+        del shared
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_base_primes, initargs=(memory.name, len(base_primes))) as executor:
+            results = list(executor.map(partial(_sieve_shared_segment, count=count), tasks))
+    finally:
+        memory.close()
+        memory.unlink()
+
+    if count:
+        # the segments only count odd primes
+        counts = np.array(results, dtype=np.int64)
+        counts[:1] += n > 2
+        return counts
+    return np.concatenate([np.array([2] if n > 2 else [], dtype=np.uint64)] + results)
+
+@lru_cache(maxsize=1)
+def __small_primes() -> Tuple[List[int], frozenset, int]:
+    """
+    Return the primes below 4096 as list and set, as well as their product.
+    """
+    primes = sieve_of_eratosthenes(1 << 12)
+    return primes, frozenset(primes), math.prod(primes)
+
+def is_prime(n: int, rounds: int=40) -> bool:
+    """
+    Test whether `n` is a prime number. Numbers below 4096 are looked up in a
+    cached sieve table, and a single `gcd` with the product of all these primes
+    replaces trial division for larger numbers. The remaining candidates are
+    subject to the Miller-Rabin test, which is deterministic for `n < 2^64` and
+    uses `rounds` random bases otherwise.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.mathematics import is_prime
+    >>> is_prime(2**61 - 1)
+    True
+    >>> is_prime(561)
+    False
+    ```
+
+    Note
+    ----
+    - For `n >= 2^64`, a composite number passes this test with a probability of
+    at most `4^-rounds`
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Miller%E2%80%93Rabin_primality_test>
     """
-    sieve = [True] * n
-    sieve[0], sieve[1] = (False, False)
+    primes, lookup, primorial = __small_primes()
+    if n <= primes[-1]:
+        return n in lookup
+    if gcd(primorial, n) != 1:
+        return False
 
-    for i in range(2, int(math.sqrt(n))+1):
-        pointer = i * 2
-        while pointer < n:
-            sieve[pointer] = False
-            pointer += i
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
 
-    return list(filter(lambda i: sieve[i] is True, range(n)))
\ No newline at end of file
+    # these bases are sufficient to prove primality of any 64-bit integer
+    bases = primes[:12] if n < 1 << 64 else (random.randrange(2, n - 1) for _ in range(rounds))
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def next_prime(n: int) -> int:
+    """
+    Return the smallest prime number greater than `n`.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.mathematics import next_prime
+    >>> next_prime(10**12)
+    1000000000039
+    ```
+    """
+    if n < 2:
+        return 2
+    candidate = n + 1 + n % 2
+    while not is_prime(candidate):
+        candidate += 2
+    return candidate
+
+def pollard_rho(n: int) -> int:
+    """
+    Return a non-trivial factor of the composite number `n` by using Pollard's
+    rho algorithm with Brent's cycle detection. Instead of computing a `gcd` in
+    each step, the differences of up to 128 steps are multiplied together and
+    tested at once.
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Pollard%27s_rho_algorithm>
+    - Richard P. Brent: "An Improved Monte Carlo Factorization Algorithm", BIT 20 (1980)
+    """
+    if n % 2 == 0:
+        return 2
+
+    while True:
+        y, c, m = random.randrange(1, n), random.randrange(1, n), 128
+        factor, r, q = 1, 1, 1
+        while factor == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and factor == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                factor = gcd(q, n)
+                k += m
+            r *= 2
+
+        if factor == n:
+            # the batched product overshot, so backtrack one step at a time
+            factor = 1
+            while factor == 1:
+                ys = (ys * ys + c) % n
+                factor = gcd(abs(x - ys), n)
+
+        if factor != n:
+            return factor
+
+def factorize(n: int) -> Dict[int, int]:
+    """
+    Return the prime factorization of `n > 0` as dictionary that maps each prime
+    factor onto its multiplicity. Small factors are removed by trial division
+    with all primes below 4096, the remaining cofactor is split with `pollard_rho`.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.mathematics import factorize
+    >>> factorize(2**64 + 1)
+    {274177: 1, 67280421310721: 1}
+    ```
+    """
+    if n < 1:
+        raise ValueError(f"{n=} must be a positive integer.")
+
+    factors = {}
+    for p in __small_primes()[0]:
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            factor = pollard_rho(m)
+            stack.extend((factor, m // factor))
+
+    return dict(sorted(factors.items()))
+
+def factorize_many(numbers: Iterable[int], workers: int=None, chunksize: int=64) -> List[Dict[int, int]]:
+    """
+    Factorize a batch of integers (e.g. a NumPy array) on a pool of `workers`
+    processes. The order of `numbers` is preserved.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(factorize, map(int, numbers), chunksize=chunksize))
@@ -1,3 +1,5 @@
 #!/usr/bin/env python3
 
 from .astronomy import *
+from .kepler import *
+from .nbody import *
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import math
+from collections import namedtuple
+from typing import List, Tuple
+
+import numpy as np
+from pint.quantity import Quantity
+
+from .. import utils
+from ..utils import UREG, logger
+
+OrbitalElements = namedtuple('OrbitalElements', 'name semi_major_axis eccentricity inclination node periapsis mean_anomaly period')
+
+# longitude of the ascending node, longitude of perihelion and mean longitude in
+# degrees at J2000, and the rate of the mean longitude in degrees per Julian
+# century (Standish, Keplerian Elements for Approximate Positions of the Major
+# Planets, table 1), which are not part of planets.db; Earth refers to the
+# Earth-Moon barycenter
+_j2000_angles = {
+    'Mercury': (48.33076593, 77.45779628, 252.25032350, 149472.67411175),
+    'Venus': (76.67984255, 131.60246718, 181.97909950, 58517.81538729),
+    'Earth': (0.0, 102.93768193, 100.46457166, 35999.37244981),
+    'Mars': (49.55953891, -23.94362959, -4.55343205, 19140.30268499),
+    'Jupiter': (100.47390909, 14.72847983, 34.39644051, 3034.74612775),
+    'Saturn': (113.66242448, 92.59887831, 49.95424423, 1222.49362201),
+    'Uranus': (74.01692503, 170.95427630, 313.23810451, 428.48202785),
+    'Neptune': (131.78422574, 44.96476227, -55.12002969, 218.45945325),
+    'Pluto': (110.30393684, 224.06891629, 238.92903833, 145.20780515),
+}
+
+# Taylor coefficients of sin(x)/x and cos(x) in powers of x^2, accurate to double
+# precision for |x| <= 0.5, and their truncations for steps below 0.1
+_sin_coefficients = [(-1) ** k / math.factorial(2 * k + 1) for k in range(7)]
+_cos_coefficients = [(-1) ** k / math.factorial(2 * k) for k in range(8)]
+
+def _horner(square: np.ndarray, coefficients: List[float], out: np.ndarray) -> np.ndarray:
+    out.fill(coefficients[-1])
+    for coefficient in reversed(coefficients[:-1]):
+        out *= square
+        out += coefficient
+    return out
+
+def _solve_kepler(mean_anomaly: np.ndarray, eccentricity: np.ndarray, tol: float, max_iter: int, buffers: np.ndarray=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return `x = E - M` and the sine and cosine of the eccentric anomaly `E`.
+
+    Sine and cosine are evaluated once for `M`. Halley's method from `E = M`
+    (or Danby's `M + 0.85 * e * sign(sin(M))` for `e >= 0.8`) gives a starting
+    offset `x`, by which they are rotated with the Taylor series of `sin(x)` and
+    `cos(x)`. Each Newton step `d` rotates them again by a shorter series, and
+    once `|d| < 1e-7` the remaining error is below `e * d^2` and the last step
+    is applied to first order. Large steps fall back to NumPy's trigonometry.
+    All arithmetic runs in place on `buffers` of shape `(9,) + M.shape`, since
+    allocating temporaries costs more than the arithmetic itself.
+    """
+    buffers = np.empty((9,) + mean_anomaly.shape) if buffers is None else buffers
+    sin_M, cos_M, x, sin_E, cos_E, step, first, second, third = buffers
+    np.sin(mean_anomaly, out=sin_M)
+    np.cos(mean_anomaly, out=cos_M)
+
+    # Halley: x = e * sin(M) / (1 - e * cos(M) + (e * sin(M))^2 / (2 * (1 - e * cos(M))))
+    np.multiply(cos_M, eccentricity, out=first)
+    np.subtract(1, first, out=first)
+    np.multiply(sin_M, eccentricity, out=x)
+    np.multiply(x, x, out=second)
+    second /= first
+    second *= 0.5
+    first += second
+    x /= first
+    if np.any(eccentricity >= 0.8):
+        np.copyto(x, 0.85 * eccentricity * np.sign(sin_M), where=np.broadcast_to(eccentricity >= 0.8, x.shape))
+
+    if np.abs(x, out=first).max(initial=0) > 0.5:
+        np.add(mean_anomaly, x, out=first)
+        np.sin(first, out=sin_E)
+        np.cos(first, out=cos_E)
+    else:
+        np.multiply(x, x, out=second)
+        _horner(second, _sin_coefficients, step)
+        step *= x
+        _horner(second, _cos_coefficients, first)
+        # E = M + x
+        np.multiply(sin_M, first, out=sin_E)
+        np.multiply(cos_M, step, out=second)
+        sin_E += second
+        np.multiply(cos_M, first, out=cos_E)
+        np.multiply(sin_M, step, out=second)
+        cos_E -= second
+
+    for _ in range(max_iter):
+        # d = (x - e * sin(E)) / (1 - e * cos(E))
+        np.multiply(sin_E, eccentricity, out=step)
+        np.subtract(x, step, out=step)
+        np.multiply(cos_E, eccentricity, out=first)
+        np.subtract(1, first, out=first)
+        step /= first
+        x -= step
+        largest = np.abs(step, out=first).max(initial=0)
+
+        if largest < 1e-7:
+            np.multiply(cos_E, step, out=first)
+            np.multiply(sin_E, step, out=second)
+            sin_E -= first
+            cos_E += second
+            if largest < tol or eccentricity.max(initial=0) * largest < tol:
+                return x, sin_E, cos_E
+            continue
+        if largest > 0.1:
+            np.add(mean_anomaly, x, out=first)
+            np.sin(first, out=sin_E)
+            np.cos(first, out=cos_E)
+            continue
+
+        # rotate (sin(E), cos(E)) by -d, sin_M and cos_M are free for reuse
+        np.multiply(step, step, out=second)
+        _horner(second, _sin_coefficients[:4], first)
+        first *= step
+        _horner(second, _cos_coefficients[:5], third)
+        np.multiply(sin_E, third, out=sin_M)
+        np.multiply(cos_E, first, out=second)
+        sin_M -= second
+        np.multiply(cos_E, third, out=cos_M)
+        np.multiply(sin_E, first, out=second)
+        cos_M += second
+        sin_E, sin_M = sin_M, sin_E
+        cos_E, cos_M = cos_M, cos_E
+
+    logger.error(f"Kepler's equation did not converge within {max_iter=} iterations")
+    raise ValueError(f"Kepler's equation did not converge within {max_iter=} iterations.")
+
+def solve_kepler(mean_anomaly, eccentricity, tol: float=1e-13, max_iter: int=32) -> np.ndarray:
+    """
+    Solve Kepler's equation `M = E - e * sin(E)` for the eccentric anomaly `E`
+    of elliptic orbits (`0 <= e < 1`). The Newton-Raphson iteration runs on
+    whole arrays, `mean_anomaly` and `eccentricity` broadcast against each other.
+
+    Example
+    -------
+    ```
+    >>> from lolicon.physics import solve_kepler
+    >>> solve_kepler(np.linspace(0, np.pi, 5), 0.5)
+    array([0.        , 1.26170306, 2.02097994, 2.60975395, 3.14159265])
+    ```
+
+    References
+    ----------
+    - <https://en.wikipedia.org/wiki/Kepler%27s_equation>
+    """
+    mean_anomaly, eccentricity = np.broadcast_arrays(np.asarray(mean_anomaly, dtype=np.float64), np.asarray(eccentricity, dtype=np.float64))
+    if np.any((eccentricity < 0) | (eccentricity >= 1)):
+        logger.error(f"Eccentricity out of range: {eccentricity=}")
+        raise ValueError(f"{eccentricity=} must be in range of [0, 1).")
+    x, *_ = _solve_kepler(mean_anomaly, eccentricity, tol, max_iter)
+    return mean_anomaly + x
+
+class KeplerPropagator(object):
+    """
+    KeplerPropagator
+    ================
+
+    Basic Usage
+    -----------
+        >>> from lolicon.physics import KeplerPropagator
+        >>> propagator = KeplerPropagator()
+        >>> positions = propagator.positions(np.arange(1_000_000) / 10)
+        >>> positions.shape
+        (9, 3, 1000000)
+
+    Propagates the two-body orbits of the planets around the Sun. The semi-major
+    axis, eccentricity and inclination are read from planets.db, the orientation
+    of each orbit, the position of the planet on it at J2000 and the rate of its
+    mean longitude from the approximate elements published by the JPL. Both are
+    combined into a table of perifocal basis vectors upon construction, such that
+    computing a position is reduced to solving Kepler's equation.
+
+    Note
+    ----
+    The orbits are fixed at their J2000 orientation and perturbations between the
+    planets are ignored. Since the mean longitude advances at its tabulated rate,
+    the heliocentric longitudes stay within about 0.1 degree of the JPL elements
+    for several decades around J2000, and the neglected precession of the node and
+    perihelion adds up to about half a degree per century. The rounded distances
+    of planets.db also offset the positions radially by up to a few percent.
+
+    Positions are heliocentric ecliptic coordinates (J2000) in kilometers, time
+    is measured in days since J2000 (2000-01-01 12:00 TT).
+    """
+    def __init__(self, planets: List[str]=None, local_: bool=False) -> KeplerPropagator:
+        """
+        Instantiate a propagator for `planets`, which defaults to all planets in
+        planets.db.
+        """
+        rows = utils.query_db('planets.db', "SELECT Name, DistanceFromSun, OrbitalEccentricity, OrbitalInclination FROM Planet", local_=local_)
+        table = {row[0]: row for row in rows}
+        names = [name.capitalize() for name in planets] if planets is not None else list(table)
+        if unknown := [name for name in names if name not in table or name not in _j2000_angles]:
+            logger.error(f"Unknown planets: {unknown=}")
+            raise ValueError(f"No orbital elements available for {unknown}.")
+
+        self.__elements = []
+        for name in names:
+            _, distance, eccentricity, inclination = table[name]
+            node, perihelion, longitude, rate = _j2000_angles[name]
+            self.__elements.append(OrbitalElements(
+                name, distance * 1e6, eccentricity, inclination, node, perihelion - node, (longitude - perihelion) % 360, 360 * 36525 / rate
+            ))
+
+        a, e = np.array([elements.semi_major_axis for elements in self.__elements]), np.array([elements.eccentricity for elements in self.__elements])
+        i, node, periapsis = (np.radians([getattr(elements, key) for elements in self.__elements]) for key in ('inclination', 'node', 'periapsis'))
+        # perifocal unit vectors towards the periapsis (P) and 90 degrees ahead of it (Q), scaled by the semi-axes
+        P = np.stack((
+            np.cos(periapsis) * np.cos(node) - np.sin(periapsis) * np.sin(node) * np.cos(i),
+            np.cos(periapsis) * np.sin(node) + np.sin(periapsis) * np.cos(node) * np.cos(i),
+            np.sin(periapsis) * np.sin(i)
+        ))
+        Q = np.stack((
+            -np.sin(periapsis) * np.cos(node) - np.cos(periapsis) * np.sin(node) * np.cos(i),
+            -np.sin(periapsis) * np.sin(node) + np.cos(periapsis) * np.cos(node) * np.cos(i),
+            np.cos(periapsis) * np.sin(i)
+        ))
+        self.__P, self.__Q = (P * a).T, (Q * a * np.sqrt(1 - e ** 2)).T
+        self.__eccentricity = e[:, None]
+        self.__mean_motion = np.radians([_j2000_angles[name][3] / 36525 for name in names])[:, None]
+        self.__mean_anomaly = np.radians([elements.mean_anomaly for elements in self.__elements])[:, None]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(Planets={len(self.__elements)})"
+
+    #region property
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Return the names of the propagated planets in order of the position arrays.
+        """
+        return [elements.name for elements in self.__elements]
+
+    @property
+    def elements(self) -> List[OrbitalElements]:
+        """
+        Return the orbital elements at J2000, with distances in kilometers,
+        angles in degrees and periods in days. The period is the time in which
+        the mean longitude completes a turn.
+        """
+        return list(self.__elements)
+
+    #endregion
+
+    #region methods
+
+    @staticmethod
+    def __days(t) -> np.ndarray:
+        t = t.to(UREG.day).magnitude if isinstance(t, Quantity) else t
+        return np.atleast_1d(np.asarray(t, dtype=np.float64))
+
+    def mean_anomaly(self, t) -> np.ndarray:
+        """
+        Return the mean anomalies in radians in range of `[-pi, pi]` for each
+        planet and time `t` as an array of shape `(planets, len(t))`.
+        """
+        t = self.__days(t)
+        mean_anomaly = self.__mean_motion * t + self.__mean_anomaly
+        mean_anomaly -= 2 * math.pi * np.rint(mean_anomaly / (2 * math.pi))
+        return mean_anomaly
+
+    def eccentric_anomaly(self, t, tol: float=1e-13) -> np.ndarray:
+        """
+        Return the eccentric anomalies in radians for each planet and time `t`
+        as an array of shape `(planets, len(t))`.
+        """
+        mean_anomaly = self.mean_anomaly(t)
+        x, *_ = _solve_kepler(mean_anomaly, self.__eccentricity, tol, 32)
+        return mean_anomaly + x
+
+    def positions(self, t, out: np.ndarray=None, chunksize: int=1 << 14, tol: float=1e-13) -> np.ndarray:
+        """
+        Return the heliocentric positions of all planets at the times `t` as an
+        array of shape `(planets, 3, len(t))` in kilometers, such that `x, y, z =
+        positions[k]` are the coordinates of the `k`-th planet. The result is
+        written into `out` if given.
+
+        Times are processed in chunks of about `chunksize` array elements, which
+        keeps the preallocated buffers of the Newton iteration in the CPU cache.
+
+        Example
+        -------
+        ```
+        >>> from lolicon.physics import KeplerPropagator
+        >>> from lolicon.utils import UREG
+        >>> earth = KeplerPropagator(['Earth'])
+        >>> (earth.positions(0) * UREG.km).to(UREG.au).ravel()
+        <Quantity([-0.17709619  0.96694657  0.        ], 'astronomical_unit')>
+        ```
+        """
+        t = self.__days(t)
+        count = len(self.__elements)
+        out = np.empty((count, 3, len(t))) if out is None else out
+        if out.shape != (count, 3, len(t)):
+            logger.error(f"Invalid output shape: {out.shape=}")
+            raise ValueError(f"{out.shape=} must be {(count, 3, len(t))}.")
+
+        step = max(1, chunksize // max(count, 1))
+        mean_anomaly, buffers = np.empty((count, step)), np.empty((9, count, step))
+        for start in range(0, len(t), step):
+            stop = min(start + step, len(t))
+            M, chunk = mean_anomaly[:, :stop - start], buffers[:, :, :stop - start]
+            np.multiply(self.__mean_motion, t[start:stop], out=M)
+            M += self.__mean_anomaly
+            # reducing M to a single turn beforehand is cheaper than within np.sin and np.cos
+            np.multiply(M, 1 / (2 * math.pi), out=chunk[0])
+            np.rint(chunk[0], out=chunk[0])
+            chunk[0] *= 2 * math.pi
+            M -= chunk[0]
+            _, sin_E, cos_E = _solve_kepler(M, self.__eccentricity, tol, 32, chunk)
+            cos_E -= self.__eccentricity
+            for axis in range(3):
+                target = out[:, axis, start:stop]
+                np.multiply(cos_E, self.__P[:, axis, None], out=target)
+                np.multiply(sin_E, self.__Q[:, axis, None], out=M)
+                target += M
+        return out
+
+    #endregion
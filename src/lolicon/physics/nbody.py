@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from collections import namedtuple
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Tuple, Union
+
+import numpy as np
+from pint.quantity import Quantity
+
+from ..constants import NEWTONIAN_GRAVITATION
+from ..utils import UREG, logger
+from .astronomy import Planet, Satellite
+from .kepler import KeplerPropagator
+
+SimulationResult = namedtuple('SimulationResult', 'time energy drift')
+
+# the gravitational constant in km^3 / (kg s^2), state vectors are in km and km/s
+_G = NEWTONIAN_GRAVITATION.to(UREG.km ** 3 / (UREG.kg * UREG.s ** 2)).magnitude
+# standard gravitational parameter of the sun in km^3 / s^2 (IAU 2015 nominal value)
+_SUN_GM = 1.327_124_4e11
+# body counts up to this size use direct summation in the 'auto' mode
+_direct_threshold = 1 << 11
+
+#region accelerations
+
+def _direct_accelerations(positions: np.ndarray, gm: np.ndarray, softening: float=0, chunksize: int=1 << 20) -> np.ndarray:
+    """
+    Sum the pairwise accelerations with NumPy broadcasting in blocks of rows,
+    such that each temporary holds about `chunksize` pairs.
+    """
+    count = len(positions)
+    accelerations = np.empty_like(positions)
+    step = max(1, chunksize // max(count, 1))
+    for start in range(0, count, step):
+        delta = positions[None, :, :] - positions[start:start + step, None, :]
+        squared = np.einsum('ijk,ijk->ij', delta, delta) + softening ** 2
+        with np.errstate(divide='ignore'):
+            weights = np.where(squared > 0, gm / (squared * np.sqrt(squared)), 0)
+        # a body does not attract itself
+        weights[np.arange(len(weights)), np.arange(start, start + len(weights))] = 0
+        accelerations[start:start + step] = np.einsum('ij,ijk->ik', weights, delta)
+    return accelerations
+
+def _build_octree(positions: np.ndarray, gm: np.ndarray, leaf_size: int) -> Dict[str, np.ndarray]:
+    """
+    Build an octree over `positions` whose leaves hold at most `leaf_size`
+    bodies. Each node stores its total `gm`, center of mass, edge length, the
+    distance between center of mass and geometric center, its children (-1
+    for none) and the range of its bodies in `order` for leaves.
+    """
+    order, nodes = [], []
+    octants = np.array([[(k >> axis) & 1 for axis in range(3)] for k in range(8)]) * 2 - 1
+
+    def build(index: np.ndarray, center: np.ndarray, half: float, depth: int) -> int:
+        node = len(nodes)
+        mass = gm[index].sum()
+        com = (positions[index] * gm[index, None]).sum(axis=0) / mass if mass > 0 else positions[index].mean(axis=0)
+        record = [mass, com, 2 * half, np.linalg.norm(com - center), [-1] * 8, 0, 0]
+        nodes.append(record)
+        # coincident bodies cannot be separated, so the depth is capped
+        if len(index) <= leaf_size or depth >= 48:
+            record[5], record[6] = len(order), len(index)
+            order.extend(index.tolist())
+            return node
+        octant = ((positions[index] > center) * np.array([1, 2, 4])).sum(axis=1)
+        for k in range(8):
+            if (members := index[octant == k]).size:
+                record[4][k] = build(members, center + octants[k] * half / 2, half / 2, depth + 1)
+        return node
+
+    low, high = positions.min(axis=0), positions.max(axis=0)
+    build(np.arange(len(positions)), (low + high) / 2, max(float((high - low).max()) / 2, 1e-9) * (1 + 1e-9), 0)
+    return {
+        'gm': np.array([node[0] for node in nodes]),
+        'com': np.array([node[1] for node in nodes]),
+        'width': np.array([node[2] for node in nodes]),
+        'offset': np.array([node[3] for node in nodes]),
+        'children': np.array([node[4] for node in nodes]),
+        'start': np.array([node[5] for node in nodes]),
+        'count': np.array([node[6] for node in nodes]),
+        'order': np.array(order, dtype=np.int64),
+    }
+
+def _barnes_hut_accelerations(positions: np.ndarray, gm: np.ndarray, softening: float=0, theta: float=0.5, leaf_size: int=8) -> np.ndarray:
+    """
+    Approximate the accelerations with the Barnes-Hut algorithm. The tree is
+    walked for all bodies at once: a frontier of (body, node) pairs is either
+    accepted, if the node is far enough away to be replaced by its center of
+    mass, summed directly for leaves, or replaced by the pairs of the node's
+    children.
+    """
+    count, tree = len(positions), _build_octree(positions, gm, leaf_size)
+    accelerations = np.zeros_like(positions)
+
+    def accumulate(body: np.ndarray, source_gm: np.ndarray, source: np.ndarray) -> None:
+        delta = source - positions[body]
+        squared = np.einsum('ij,ij->i', delta, delta) + softening ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weights = np.where(squared > 0, source_gm / (squared * np.sqrt(squared)), 0)
+        for axis in range(3):
+            accelerations[:, axis] += np.bincount(body, weights * delta[:, axis], minlength=count)
+
+    body, node = np.arange(count), np.zeros(count, dtype=np.int64)
+    while body.size:
+        delta = tree['com'][node] - positions[body]
+        distance = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        # the offset term guarantees that the body lies outside of accepted nodes
+        accept = distance > tree['width'][node] / theta + tree['offset'][node]
+        leaf = ~accept & (tree['count'][node] > 0)
+        accumulate(body[accept], tree['gm'][node[accept]], tree['com'][node[accept]])
+
+        # sum leaves directly, skipping the body itself
+        counts = tree['count'][node[leaf]]
+        pairs = np.repeat(body[leaf], counts)
+        ranks = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        members = tree['order'][np.repeat(tree['start'][node[leaf]], counts) + ranks]
+        pairs, members = pairs[members != pairs], members[members != pairs]
+        accumulate(pairs, gm[members], positions[members])
+
+        opened = ~accept & ~leaf
+        children = tree['children'][node[opened]]
+        body, node = np.repeat(body[opened], 8)[children.ravel() >= 0], children.ravel()[children.ravel() >= 0]
+    return accelerations
+
+#endregion
+
+#region integrators
+
+def _leapfrog_step(positions: np.ndarray, velocities: np.ndarray, accelerations: np.ndarray, dt: float, acceleration: Callable) -> Tuple:
+    """
+    Advance by one kick-drift-kick step, which is symplectic and time-reversible.
+    """
+    velocities = velocities + accelerations * (dt / 2)
+    positions = positions + velocities * dt
+    accelerations = acceleration(positions)
+    return positions, velocities + accelerations * (dt / 2), accelerations
+
+def _rk4_step(positions: np.ndarray, velocities: np.ndarray, accelerations: np.ndarray, dt: float, acceleration: Callable) -> Tuple:
+    """
+    Advance by one step of the classical fourth order Runge-Kutta method.
+    """
+    k1x, k1v = velocities, accelerations
+    k2x, k2v = velocities + k1v * (dt / 2), acceleration(positions + k1x * (dt / 2))
+    k3x, k3v = velocities + k2v * (dt / 2), acceleration(positions + k2x * (dt / 2))
+    k4x, k4v = velocities + k3v * dt, acceleration(positions + k3x * dt)
+    positions = positions + (k1x + 2 * k2x + 2 * k3x + k4x) * (dt / 6)
+    velocities = velocities + (k1v + 2 * k2v + 2 * k3v + k4v) * (dt / 6)
+    return positions, velocities, acceleration(positions)
+
+_integrators: Dict[str, Callable] = {
+    'leapfrog': _leapfrog_step,
+    'rk4': _rk4_step,
+}
+
+#endregion
+
+class NBody(object):
+    """
+    NBody
+    =====
+
+    Basic Usage
+    -----------
+        >>> from lolicon.physics import NBody
+        >>> system = NBody.solar_system()
+        >>> result = system.run(dt=3600, steps=24 * 365, every=24, target='solar_system.npy')
+        >>> result.drift < 1e-8
+        True
+
+    Simulates the gravitational interaction of point masses. Positions are in
+    kilometers, velocities in kilometers per second and time in seconds, and
+    the bodies are described by their standard gravitational parameters `gm`
+    in km^3/s^2. Accelerations are summed pairwise with NumPy broadcasting,
+    or approximated with the Barnes-Hut algorithm for large systems, see
+    `accelerations`. The leapfrog integrator conserves energy over long runs,
+    while RK4 is more accurate per step but drifts, `run` reports the relative
+    energy drift of either.
+    """
+    def __init__(self, positions: np.ndarray, velocities: np.ndarray, gm: np.ndarray, names: List[str]=None, softening: float=0, method: str='auto', theta: float=0.5) -> NBody:
+        """
+        Instantiate a new system from `(N, 3)` arrays of `positions` and `velocities`
+        and the gravitational parameters `gm` of shape `(N,)`. `method` selects
+        the force computation: `direct`, `barnes-hut`, or `auto` for direct
+        summation up to 2048 bodies.
+        """
+        self.__positions = np.array(positions, dtype=np.float64)
+        self.__velocities = np.array(velocities, dtype=np.float64)
+        self.__gm = np.array(gm, dtype=np.float64)
+        count = len(self.__gm)
+        if self.__positions.shape != (count, 3) or self.__velocities.shape != (count, 3):
+            logger.error(f"Inconsistent state shapes: {self.__positions.shape=}, {self.__velocities.shape=}, {self.__gm.shape=}")
+            raise ValueError(f"Positions and velocities must be of shape {(count, 3)}.")
+        if method not in ('auto', 'direct', 'barnes-hut'):
+            logger.error(f"Unsupported force computation: {method=}")
+            raise ValueError(f"{method=} must be one of 'auto', 'direct' or 'barnes-hut'.")
+        self.__names = list(names) if names is not None else [f"Body {i}" for i in range(count)]
+        self.__softening, self.__theta = softening, theta
+        self.__method = ('direct' if count <= _direct_threshold else 'barnes-hut') if method == 'auto' else method
+        self.__time = 0.0
+        self.__accelerations = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(Bodies={len(self.__gm)}, Method={self.__method})"
+
+    def __len__(self) -> int:
+        return len(self.__gm)
+
+    #region property
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Return the names of all bodies.
+        """
+        return list(self.__names)
+
+    @property
+    def gm(self) -> np.ndarray:
+        """
+        Return the standard gravitational parameters of all bodies in km^3/s^2.
+        """
+        return self.__gm.copy()
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        Return the positions of all bodies in kilometers.
+        """
+        return self.__positions.copy()
+
+    @property
+    def velocities(self) -> np.ndarray:
+        """
+        Return the velocities of all bodies in kilometers per second.
+        """
+        return self.__velocities.copy()
+
+    @property
+    def time(self) -> float:
+        """
+        Return the simulated time in seconds.
+        """
+        return self.__time
+
+    @property
+    def kinetic_energy(self) -> float:
+        """
+        Return the total kinetic energy in joules.
+        """
+        return 0.5e6 * float(np.einsum('i,ij,ij->', self.__gm / _G, self.__velocities, self.__velocities))
+
+    @property
+    def potential_energy(self) -> float:
+        """
+        Return the total gravitational potential energy in joules.
+        """
+        count, energy = len(self.__gm), 0.0
+        step = max(1, (1 << 20) // max(count, 1))
+        for start in range(0, count, step):
+            delta = self.__positions[None, :, :] - self.__positions[start:start + step, None, :]
+            distance = np.sqrt(np.einsum('ijk,ijk->ij', delta, delta) + self.__softening ** 2)
+            # count every pair once
+            pairs = np.arange(count)[None, :] > np.arange(start, start + len(distance))[:, None]
+            energy -= float((self.__gm[start:start + step, None] * self.__gm[None, :])[pairs] @ (1 / distance[pairs]))
+        return 1e6 * energy / _G
+
+    @property
+    def energy(self) -> float:
+        """
+        Return the total energy in joules.
+        """
+        return self.kinetic_energy + self.potential_energy
+
+    #endregion
+
+    #region methods
+
+    @staticmethod
+    def __gm_of(body: Union[Planet, Satellite]) -> float:
+        if isinstance(body, Satellite):
+            return body.gm.to(UREG.km ** 3 / UREG.s ** 2).magnitude
+        return _G * body.mass.to(UREG.kg).magnitude
+
+    @classmethod
+    def from_bodies(cls, bodies: List[Union[Planet, Satellite]], positions: np.ndarray, velocities: np.ndarray, **kwargs) -> NBody:
+        """
+        Instantiate a new system of planets and satellites, whose gravitational
+        parameters are derived from `Planet.mass` and `Satellite.gm`. satellites.db
+        has no orbits, so their `positions` and `velocities` must be provided.
+        """
+        return cls(positions, velocities, [NBody.__gm_of(body) for body in bodies], names=[body.name for body in bodies], **kwargs)
+
+    @classmethod
+    def solar_system(cls, t=0, local_: bool=False, **kwargs) -> NBody:
+        """
+        Instantiate the sun and the planets at `t` days since J2000, with states
+        taken from `KeplerPropagator` and shifted into the barycentric frame.
+        """
+        t = t.to(UREG.day).magnitude if isinstance(t, Quantity) else t
+        propagator = KeplerPropagator(local_=local_)
+        planets = [Planet(name, local_=local_) for name in propagator.names]
+        # central difference over a minute, converted from km/day to km/s
+        dt = 1 / 1440
+        positions = propagator.positions([t, t - dt, t + dt])
+        velocities = (positions[:, :, 2] - positions[:, :, 1]) / (2 * dt * 86400)
+        gm = np.array([_SUN_GM] + [NBody.__gm_of(planet) for planet in planets])
+        positions, velocities = np.vstack(([0, 0, 0], positions[:, :, 0])), np.vstack(([0, 0, 0], velocities))
+        positions -= gm @ positions / gm.sum()
+        velocities -= gm @ velocities / gm.sum()
+        return cls(positions, velocities, gm, names=['Sun'] + propagator.names, **kwargs)
+
+    def accelerations(self, positions: np.ndarray=None) -> np.ndarray:
+        """
+        Return the gravitational accelerations of all bodies in km/s^2, for the
+        current or the given `positions`.
+        """
+        positions = self.__positions if positions is None else positions
+        if self.__method == 'direct':
+            return _direct_accelerations(positions, self.__gm, self.__softening)
+        return _barnes_hut_accelerations(positions, self.__gm, self.__softening, self.__theta)
+
+    def step(self, dt: float, method: str='leapfrog') -> NBody:
+        """
+        Advance the system by `dt` seconds with the `leapfrog` or `rk4` integrator.
+        """
+        if (integrator := _integrators.get(method)) is None:
+            logger.error(f"Unsupported integrator: {method=}")
+            raise ValueError(f"{method=} must be one of {list(_integrators)}.")
+        if self.__accelerations is None:
+            self.__accelerations = self.accelerations()
+        self.__positions, self.__velocities, self.__accelerations = integrator(self.__positions, self.__velocities, self.__accelerations, dt, self.accelerations)
+        self.__time += dt
+        return self
+
+    def run(self, dt, steps: int, method: str='leapfrog', every: int=1, target: Union[str, Path, BinaryIO]=None) -> SimulationResult:
+        """
+        Advance the system by `steps` steps of `dt` seconds. Every `every` steps
+        (and at the start) a snapshot is taken: the total energy is recorded,
+        and if `target` is given, the positions and velocities are appended to
+        it as a `(N, 6)` frame. The frames form a `.npy` array of shape
+        `(snapshots, N, 6)`, which is written as a stream and can be read back
+        with `np.load(target, mmap_mode='r')`.
+
+        Return the snapshot times in seconds, their energies in joules, and the
+        largest relative energy drift `|E - E0| / |E0|`.
+
+        Example
+        -------
+        ```
+        >>> from lolicon.physics import NBody
+        >>> system = NBody.solar_system()
+        >>> system.run(86400, 3650, method='rk4', every=365).drift < 1e-6
+        True
+        ```
+        """
+        dt = dt.to(UREG.s).magnitude if isinstance(dt, Quantity) else dt
+        if steps < 0 or every < 1:
+            logger.error(f"Invalid simulation length: {steps=}, {every=}")
+            raise ValueError(f"{steps=} must not be negative and {every=} must be positive.")
+
+        snapshots = steps // every + 1
+        stream = open(target, mode='wb') if isinstance(target, (str, Path)) else target
+        try:
+            if stream is not None:
+                header = {'descr': np.lib.format.dtype_to_descr(np.dtype(np.float64)), 'fortran_order': False, 'shape': (snapshots, len(self), 6)}
+                np.lib.format.write_array_header_2_0(stream, header)
+
+            times, energies = np.empty(snapshots), np.empty(snapshots)
+            for snapshot in range(snapshots):
+                if snapshot:
+                    for _ in range(every):
+                        self.step(dt, method)
+                times[snapshot], energies[snapshot] = self.__time, self.energy
+                if stream is not None:
+                    stream.write(np.hstack((self.__positions, self.__velocities)).tobytes())
+        finally:
+            if stream is not None and stream is not target:
+                stream.close()
+
+        # the remaining steps do not complete another snapshot
+        for _ in range(steps - (snapshots - 1) * every):
+            self.step(dt, method)
+        drift = float(np.abs(energies - energies[0]).max() / abs(energies[0])) if energies[0] else 0.0
+        return SimulationResult(times, energies, drift)
+
+    #endregion
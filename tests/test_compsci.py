@@ -1,8 +1,17 @@
 #!/usr/bin/env python3
 
+import io
+import mmap
+import random
 import string
+import tempfile
 import unittest
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
 
+import numpy as np
 import pytest
 import src.lolicon.compsci as compsci
 from src.lolicon.compsci import cryptography as crypto
@@ -21,12 +30,128 @@ def test_bin2dec(self):
         self.assertEqual(compsci.bin2dec('10110'), 22)
         self.assertEqual(compsci.bin2dec('100110111'), 311)
         self.assertEqual(compsci.bin2dec('1101101101011'), 7019)
+        self.assertEqual(compsci.bin2dec('1' * 100), 2**100 - 1)
 
     def test_dec2bin(self):
         self.assertEqual(compsci.dec2bin(22), '00010110')
         self.assertEqual(compsci.dec2bin(311, padding=10), '0100110111')
         self.assertEqual(compsci.dec2bin(7019, padding=16), '0001101101101011')
 
+    def test_radix(self):
+        self.assertEqual(compsci.to_base(255, 16), 'ff')
+        self.assertEqual(compsci.to_base(0, 7, padding=3), '000')
+        self.assertEqual(compsci.from_base('-ZZ', 36), -1295)
+        n = random.getrandbits(20_000)
+        for base in (3, 10, 36):
+            self.assertEqual(compsci.from_base(compsci.to_base(n, base), base), n)
+        self.assertEqual(compsci.to_base(n >> 10_000, 10), str(n >> 10_000))
+        with self.assertRaises(ValueError):
+            compsci.from_base('102', 2)
+
+    def test_radix_array(self):
+        values = np.array([0, 1, 35, 1295, 2**40])
+        strings = compsci.to_base_array(values, 36)
+        self.assertEqual(strings.tolist(), [compsci.to_base(int(v), 36, padding=8) for v in values])
+        self.assertEqual(compsci.from_base_array(strings, 36).tolist(), values.tolist())
+        self.assertEqual(compsci.from_base_array(np.array(['1', '101']), 2).tolist(), [1, 5])
+        self.assertEqual(compsci.from_base_array(np.array(['1' * 64, '0' * 70 + '1']), 2).tolist(), [2**64 - 1, 1])
+        self.assertEqual(compsci.from_base_array(np.array(['3w5e11264sgsf']), 36).tolist(), [2**64 - 1])
+        for strings, base in ((['1' * 65], 2), (['z' * 14], 36), (['3w5e11264sgsg'], 36)):
+            with self.assertRaises(ValueError):
+                compsci.from_base_array(np.array(strings), base)
+
+    def test_twos_complement(self):
+        self.assertEqual(compsci.to_base(compsci.twos_complement(-5, 8), 2), '11111011')
+        self.assertEqual(compsci.from_twos_complement(0b11111011, 8), -5)
+        self.assertEqual(compsci.from_twos_complement(compsci.twos_complement(-2**99, 128), 128), -2**99)
+        values = np.array([-128, -1, 0, 127])
+        self.assertEqual(compsci.from_twos_complement(compsci.twos_complement(values, 8), 8).tolist(), values.tolist())
+        with self.assertRaises(ValueError):
+            compsci.twos_complement(128, 8)
+
+    def test_bit_vector(self):
+        bits, reference = compsci.BitVector(1000), np.zeros(1000, dtype=bool)
+        bits[10:500], reference[10:500] = True, True
+        bits[::3], reference[::3] = False, False
+        self.assertEqual(bits.indices().tolist(), np.flatnonzero(reference).tolist())
+        self.assertEqual((bits.count(), bits.rank(100), bits.select(0), bits.select(326)), (327, 60, 10, 499))
+        self.assertEqual(((bits << 70) >> 70).indices().tolist(), np.flatnonzero(reference[:930]).tolist())
+        self.assertEqual((~bits).count(), 673)
+        for index in (slice(None), slice(5, 700, 7), slice(990, 3, -13), slice(None, None, -1), slice(600, 400)):
+            self.assertEqual(bits[index].indices().tolist(), np.flatnonzero(reference[index]).tolist(), msg=index)
+        with self.assertRaises(ValueError):
+            bits << -1
+        with self.assertRaises(ValueError):
+            bits >> -1
+        other = compsci.BitVector(1000)
+        other[np.array([0, 11, 999])] = True
+        self.assertEqual(((bits | other).count(), (bits & other).count(), bits.hamming(other)), (329, 1, 328))
+        self.assertEqual(compsci.BitVector.frombuffer(bytearray(bits.buffer), 1000), bits)
+        with tempfile.TemporaryDirectory() as directory:
+            with compsci.BitVector.open(Path(directory) / 'bits', 1 << 16) as mapped:
+                mapped[100:200] = True
+            with compsci.BitVector.open(Path(directory) / 'bits') as mapped:
+                self.assertEqual((len(mapped), mapped.count(), mapped.select(0)), (1 << 16, 100, 100))
+
+    def test_crc(self):
+        for name, (*_, check) in compsci.checksum._crc_presets.items():
+            self.assertEqual(compsci.CRC.preset(name).checksum(b'123456789'), check, msg=name)
+        data = np.random.default_rng(0).bytes(100_003)
+        self.assertEqual(compsci.crc32(data), zlib.crc32(data))
+        self.assertEqual(compsci.crc32(data[5000:], compsci.crc32(data[:5000])), zlib.crc32(data))
+        crc = compsci.CRC.preset('crc64-xz')
+        self.assertEqual(crc.update(data[:50_000]).update(data[50_000:]).value, compsci.crc64(data))
+        self.assertEqual(crc.reset().value, compsci.crc64(b''))
+
+    def test_checksums(self):
+        data = np.random.default_rng(0).bytes(200_001)
+        self.assertEqual(compsci.adler32(data), zlib.adler32(data))
+        self.assertEqual(compsci.adler32(data[7:], compsci.adler32(data[:7])), zlib.adler32(data))
+        self.assertEqual(compsci.adler32(b'Wikipedia'), 0x11E60398)
+        self.assertEqual([compsci.fletcher(b'abcdef', width) for width in (16, 32, 64)], [0x2057, 0x56502D2A, 0xC8C72B276463C8C6])
+
+    def test_bit_stream(self):
+        writer = compsci.BitWriter()
+        writer.write(0b101, 3)
+        writer.write_codes(np.array([1, 0, 0b1111]), np.array([1, 2, 4]))
+        writer.write(1, 1)
+        self.assertEqual(writer.getvalue(), b'\xb3\xe0')
+        # bits above nbits are dropped
+        writer = compsci.BitWriter()
+        writer.write(0b1, 1)
+        writer.write(0b1110, 2)
+        writer.write(0, 5)
+        self.assertEqual(writer.getvalue(), b'\xc0')
+        reader = compsci.BitReader(b'\xb3\xe0')
+        self.assertEqual([reader.read(nbits) for nbits in (3, 1, 2, 4, 1)], [0b101, 1, 0, 0b1111, 1])
+        self.assertEqual(reader.peek(8), 0)
+        with self.assertRaises(EOFError):
+            reader.read(8)
+
+    def test_compression(self):
+        rng = random.Random(0)
+        text = ' '.join(rng.choice(['lorem', 'ipsum', 'dolor', 'sit', 'amet']) for _ in range(20_000)).encode()
+        for data in (b'', b'a', b'a' * 1000, np.random.default_rng(0).bytes(20_000), text):
+            self.assertEqual(compsci.huffman_decode(compsci.huffman_encode(data, chunksize=4096)), data)
+            self.assertEqual(compsci.lz77_decode(compsci.lz77_encode(data, window_bits=10)), data)
+        self.assertLess(len(compsci.huffman_encode(text)), len(text) // 2)
+        self.assertLess(len(compsci.lz77_encode(text)), len(text) // 4)
+        source, target = io.BytesIO(text), io.BytesIO()
+        compsci.lz77_encode_stream(source, target, chunksize=1000)
+        self.assertEqual(compsci.lz77_decode(target.getvalue()), text)
+
+    def test_profile_complexity(self):
+        sizes = np.array([16, 64, 256, 1024, 4096])
+        self.assertEqual(compsci.fit_complexity(sizes, 7 + 2 * sizes * np.log2(sizes))[0].model, 'O(n log n)')
+        self.assertEqual(compsci.fit_complexity(sizes, np.full(5, 100))[0].model, 'O(1)')
+        profile = compsci.profile_complexity(lambda n: sum(i * j for i in range(n) for j in range(n)), start=16, stop=256)
+        self.assertEqual(profile.best.model, 'O(n^2)')
+        self.assertEqual(profile.fits[0].error, min(fit.error for fit in profile.fits))
+        profile = compsci.profile_complexity(bytearray, start=1 << 12, stop=1 << 20, factor=4, repeats=1, memory=True)
+        self.assertEqual(compsci.fit_complexity(profile.sizes, profile.peaks)[0].model, 'O(n)')
+        with self.assertRaises(ValueError):
+            compsci.profile_complexity(len, sizes=[1, 2])
+
 class TestCryptography(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -95,4 +220,170 @@ def test_vigenere_cypher(self):
         sorted(key)
         msg = "Go down deep enough into anything and you will find mathematics."
         cypher = crypto.encrypt_vigenere_cypher(msg, key, string.printable)
-        self.assertEqual(crypto.decrypt_vigenere_cypher(cypher, key, string.printable), msg)
\ No newline at end of file
+        self.assertEqual(crypto.decrypt_vigenere_cypher(cypher, key, string.printable), msg)
+
+    @pytest.mark.filterwarnings('ignore::UserWarning')
+    def test_crack_substitution(self):
+        msg = ("it is a truth universally acknowledged, that a single man in possession of a good fortune, must be in want of a wife. "
+               "however little known the feelings or views of such a man may be on his first entering a neighbourhood, this truth is "
+               "so well fixed in the minds of the surrounding families, that he is considered as the rightful property of some one "
+               "or other of their daughters.")
+        seed = ''.join(random.Random(7).sample(string.ascii_lowercase, 26))
+        cypher = crypto.encrypt_caesar_cypher(msg, shift=5, seed=seed)
+        solution = crypto.crack_substitution(cypher, time_budget=30, workers=1, local_=True)
+        self.assertEqual(solution.plaintext, msg)
+        self.assertEqual(crypto.encrypt_caesar_cypher(msg, shift=5, seed=seed), msg.translate(str.maketrans(string.ascii_lowercase, solution.key)))
+
+    @pytest.mark.filterwarnings('ignore::UserWarning')
+    def test_is_english(self):
+        msg = 'Mathematics is the queen of the sciences and number theory is the queen of mathematics.'
+        for dictionary in (crypto.EnglishDictionary(local_=True), crypto.EnglishDictionary(memory_map=True, bloom_filter=True, local_=True)):
+            self.assertTrue(crypto.is_english(msg, dictionary=dictionary))
+            self.assertFalse(crypto.is_english(crypto.encrypt_caesar_cypher(msg, shift=7), dictionary=dictionary))
+            self.assertFalse(crypto.is_english('0x7f 0x45 0x4c 0x46', dictionary=dictionary))
+            self.assertEqual(crypto.english_score(msg, dictionary=dictionary), 1.0)
+        # word lists checked out with CRLF line endings
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'words.txt'
+            path.write_bytes(b'APPLE\r\nBANANA\r\nCHERRY\r\n')
+            with open(path, mode='rb') as file_handler, mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                words = crypto._MemoryMappedWords(buffer)
+                self.assertEqual((len(words), list(words)), (3, [b'APPLE', b'BANANA', b'CHERRY']))
+                self.assertEqual([word in words for word in (b'APPLE', b'BANANA', b'CHERRY', b'APRICOT', b'')], [True, True, True, False, False])
+
+    @pytest.mark.filterwarnings('ignore::UserWarning')
+    def test_encrypt_many(self):
+        msgs = [f"{name},{age},mathematics is the queen of the sciences" for name, age in zip(('alice', 'bob', 'carol', 'dave', 'eve'), range(20, 70, 10))]
+        batches = [
+            ('caesar', {'shift': 7}, crypto.encrypt_caesar_cypher),
+            ('transposition', {'key': 4}, crypto.encrypt_transposition_cypher),
+            ('affine', {'key': 1734}, crypto.encrypt_affine_cypher),
+            ('vigenere', {'key': 'jacqueline'}, crypto.encrypt_vigenere_cypher),
+            ('binary', {}, crypto.encrypt_binary)
+        ]
+        for method, kwargs, encrypt in batches:
+            for executor in ('thread', 'process'):
+                cyphers = crypto.encrypt_many(msgs, method, workers=2, chunksize=2, executor=executor, **kwargs)
+                self.assertEqual(cyphers, [encrypt(msg, **kwargs) for msg in msgs])
+                self.assertEqual(crypto.decrypt_many(cyphers, method, workers=2, chunksize=2, executor=executor, **kwargs), msgs)
+        with self.assertRaises(ValueError):
+            crypto.encrypt_many(msgs, 'enigma')
+
+    @pytest.mark.filterwarnings('ignore::UserWarning')
+    def test_buffer_cyphers(self):
+        msg = 'Pure mathematics is, in its way, the poetry of logical ideas.'
+        buffer = bytearray(msg.encode('ascii'))
+        crypto.encrypt_caesar_buffer(buffer, shift=5)
+        self.assertEqual(buffer.decode('ascii'), crypto.encrypt_caesar_cypher(msg, shift=5))
+        crypto.decrypt_caesar_buffer(buffer, shift=5)
+        crypto.encrypt_affine_buffer(buffer, key=1734)
+        self.assertEqual(buffer.decode('ascii'), crypto.encrypt_affine_cypher(msg, key=1734))
+        crypto.decrypt_affine_buffer(buffer, key=1734)
+        crypto.encrypt_vigenere_buffer(memoryview(buffer), key='jacqueline')
+        self.assertEqual(buffer.decode('ascii'), crypto.encrypt_vigenere_cypher(msg, key='jacqueline'))
+        crypto.decrypt_vigenere_buffer(memoryview(buffer), key='jacqueline')
+        self.assertEqual(buffer.decode('ascii'), msg)
+        with self.assertRaises(TypeError):
+            crypto.encrypt_caesar_buffer(msg.encode('ascii'))
+
+    def test_one_time_pad(self):
+        msg = b'\x00\xffThe essence of mathematics lies in its freedom.'
+        cypher, key = crypto.encrypt_one_time_pad(msg)
+        self.assertEqual(crypto.decrypt_one_time_pad(cypher, key), msg)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with crypto.OneTimePad.generate(Path(directory).joinpath('alice.pad'), size=192) as pad:
+                offset1, cypher1 = pad.encrypt(msg)
+                offset2, cypher2 = pad.encrypt(msg)
+                self.assertEqual((offset1, offset2, pad.remaining), (0, len(msg), 192 - 2 * len(msg)))
+                self.assertNotEqual(cypher1, cypher2)
+                self.assertEqual(pad.decrypt(cypher2, offset2), msg)
+                target = io.BytesIO()
+                offset = pad.encrypt_stream(io.BytesIO(msg), target, chunksize=8)
+                source, target = io.BytesIO(target.getvalue()), io.BytesIO()
+                pad.decrypt_stream(source, target, offset, chunksize=8)
+                self.assertEqual(target.getvalue(), msg)
+                with self.assertRaises(ValueError):
+                    pad.encrypt_stream(io.BytesIO(msg), io.BytesIO(), chunksize=8)
+            # key bytes consumed by another handle while streaming don't tear the key range apart
+            path = Path(directory).joinpath('stream.pad')
+            with crypto.OneTimePad.generate(path, size=192) as pad, crypto.OneTimePad(path) as other:
+                class Source(io.BytesIO):
+                    def read(self, size=-1):
+                        other.consume(4)
+                        return super().read(size)
+                target = io.BytesIO()
+                offset = pad.encrypt_stream(Source(msg), target, chunksize=8)
+                source, result = io.BytesIO(target.getvalue()), io.BytesIO()
+                other.decrypt_stream(source, result, offset, chunksize=8)
+                self.assertEqual((offset, result.getvalue()), (0, msg))
+            # independent handles on the same key file never hand out overlapping bytes
+            path = Path(directory).joinpath('shared.pad')
+            crypto.OneTimePad.generate(path, size=4000).close()
+            def consume(_):
+                with crypto.OneTimePad(path) as pad:
+                    return [pad.consume(10)[0] for _ in range(50)]
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                offsets = sorted(chain.from_iterable(executor.map(consume, range(8))))
+            self.assertEqual(offsets, list(range(0, 4000, 10)))
+            with self.assertRaises(ValueError):
+                crypto.OneTimePad.generate(Path(directory).joinpath('empty.pad'), size=0)
+
+    @pytest.mark.filterwarnings('ignore::UserWarning')
+    def test_pipeline(self):
+        msg = 'Mathematics is the music of reason.'
+        pipeline = crypto.Pipeline([('caesar', {'shift': 3}), ('affine', {'key': 1734}), ('transposition', {'key': 8})])
+        self.assertEqual(len(pipeline), 2)
+        cypher = crypto.encrypt_transposition_cypher(crypto.encrypt_affine_cypher(crypto.encrypt_caesar_cypher(msg, shift=3), key=1734), key=8)
+        self.assertEqual(pipeline.encrypt(msg), cypher)
+        self.assertEqual(pipeline.decrypt(cypher), msg)
+        self.assertEqual(pipeline.inverse.encrypt(cypher), msg)
+        self.assertIs(pipeline.inverse, pipeline.inverse)
+        self.assertIs(pipeline.inverse.inverse, pipeline)
+        # streaming
+        pipeline = crypto.Pipeline([('vigenere', {'key': 'jacqueline'}), ('caesar', {'shift': 5}), ('affine', {'key': 1734})])
+        chunks = ['mathematics is\n', 'the music\n', 'of reason\n']
+        cyphers = list(pipeline.encrypt_stream(chunks))
+        self.assertEqual(''.join(cyphers), pipeline.encrypt(''.join(chunks)))
+        self.assertEqual(list(pipeline.decrypt_stream(cyphers)), chunks)
+
+    @pytest.mark.filterwarnings('ignore::UserWarning')
+    def test_hill_cypher(self):
+        self.assertEqual(crypto.encrypt_hill_cypher('help', [[3, 3], [2, 5]]), 'hiat')
+        msg = 'Mathematics may be defined as the subject in which we never know what we are talking about.'
+        key = crypto.generate_hill_key(size=4, seed=string.printable)
+        cypher = crypto.encrypt_hill_cypher(msg, key, seed=string.printable)
+        self.assertEqual(crypto.decrypt_hill_cypher(cypher, key, seed=string.printable), msg)
+        self.assertEqual(crypto.decrypt_many([cypher] * 3, 'hill', workers=1, key=key, seed=string.printable), [msg] * 3)
+        with self.assertRaises(ValueError):
+            crypto.encrypt_hill_cypher(msg, [[2, 4], [6, 8]])
+
+    def test_enigma(self):
+        self.assertEqual(crypto.Enigma().encrypt('AAAAA'), 'BDZGO')
+        self.assertEqual(crypto.Enigma(ring_settings='BBB').encrypt('AAAAA'), 'EWTYX')
+        # double step of the middle rotor
+        self.assertEqual(crypto.Enigma(positions='ADU').key_sequence(3).tolist(), [3 * 26 + 21, 4 * 26 + 22, 676 + 5 * 26 + 23])
+        enigma = crypto.Enigma(rotors=('IV', 'I', 'III'), reflector='C', ring_settings='FUN', positions='KEY', plugboard='AB CD EF')
+        cypher = enigma.encrypt('Wetter vorhersage Biskaya')
+        self.assertEqual(enigma.decrypt(cypher), 'WETTER VORHERSAGE BISKAYA')
+        candidates = crypto.crack_enigma(cypher, crib='VORHERSAGE', offset=6, rotors=('I', 'II', 'III', 'IV'), reflector='C', ring_settings='FUN', plugboard='AB CD EF', workers=1)
+        self.assertEqual(candidates, [enigma])
+        # no letter is ever encrypted to itself
+        self.assertEqual(crypto.crack_enigma(cypher, crib=cypher[0], workers=1), [])
+        with self.assertRaises(ValueError):
+            crypto.Enigma(rotors=('I', 'I', 'II'))
+
+    @pytest.mark.filterwarnings('ignore::UserWarning')
+    def test_rsa(self):
+        public_key, private_key = crypto.generate_rsa_keys(bits=512)
+        self.assertEqual(public_key.n.bit_length(), 512)
+        self.assertEqual(private_key.d * public_key.e % ((private_key.p - 1) * (private_key.q - 1)), 1)
+        msg = int.from_bytes(b'God made the integers.', 'big')
+        cypher = crypto.encrypt_rsa(msg, public_key)
+        self.assertEqual(crypto.decrypt_rsa(cypher, private_key), msg)
+        self.assertEqual(crypto.decrypt_rsa(cypher, private_key, crt=False), msg)
+        msgs = list(range(100, 120))
+        cyphers = crypto.encrypt_many(msgs, 'rsa', workers=1, key=public_key)
+        self.assertEqual(crypto.decrypt_many(cyphers, 'rsa', workers=2, key=private_key), msgs)
+        with self.assertRaises(ValueError):
+            crypto.encrypt_rsa(public_key.n, public_key)
@@ -17,7 +17,10 @@ def tearDownClass(cls):
         pass
 
     def test_pi(self):
-        self.assertAlmostEqual(const.PI, mathematics.pi(1_000_000), places=5)
+        self.assertAlmostEqual(const.PI, mathematics.pi(1000), places=2)
+        leibniz = mathematics.series(lambda k: 4 * (-1.0)**k / (2*k + 1), tol=1e-12, method='euler')
+        self.assertAlmostEqual(const.PI, leibniz.value, places=12)
+        self.assertLess(leibniz.terms, 1000)
 
     def test_euler(self):
         self.assertAlmostEqual(const.EULER, mathematics.euler(100), places=7)
@@ -1,6 +1,14 @@
 #!/usr/bin/env python3
 
+import math
+import tempfile
 import unittest
+from array import array
+from itertools import islice
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
 
 from src.lolicon.mathematics import mathematics
 
@@ -22,7 +30,115 @@ def test_mod_inverse(self):
         self.assertEqual(mathematics.mod_inverse(5, 7), 3)
         self.assertEqual(mathematics.mod_inverse(763, 23), 6)
         self.assertEqual(mathematics.mod_inverse(9438274, 40928773), 40286876)
+        self.assertIsNone(mathematics.mod_inverse(6, 9))
+
+    def test_egcd(self):
+        self.assertEqual(mathematics.egcd(240, 46), (2, -9, 47))
+        self.assertEqual(mathematics.lcm(4, 6), 12)
+        self.assertEqual(mathematics.lcm.reduce(np.arange(1, 11)), 2520)
+        self.assertEqual(mathematics.gcd.reduce(np.array([24, 36, 60])), 12)
+        self.assertEqual(mathematics.gcd(np.array([60, 32, 12121]), np.array([48, 24, 37847374])).tolist(), [12, 8, 23])
+
+    def test_mod_inverse_array(self):
+        inverse = mathematics.mod_inverse(np.arange(26), 26)
+        self.assertEqual(inverse.mask.tolist(), [mathematics.gcd(a, 26) != 1 for a in range(26)])
+        self.assertEqual(inverse.compressed().tolist(), [mathematics.mod_inverse(a, 26) for a in range(26) if mathematics.gcd(a, 26) == 1])
 
     def test_sieve_of_eratosthenes(self):
         self.assertEqual(mathematics.sieve_of_eratosthenes(12), [2, 3, 5, 7, 11])
         self.assertEqual(mathematics.sieve_of_eratosthenes(100), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97])
+
+    def test_sieve_containers(self):
+        primes = mathematics.sieve_of_eratosthenes(1000, segment_size=64)
+        self.assertEqual(len(primes), 168)
+        self.assertEqual(mathematics.sieve_of_eratosthenes(1000, container='array'), array('Q', primes))
+        self.assertEqual(mathematics.sieve_of_eratosthenes(1000, container='numpy').tolist(), primes)
+
+    def test_primes(self):
+        self.assertEqual(list(mathematics.primes(100, 130)), [101, 103, 107, 109, 113, 127])
+        self.assertEqual(list(mathematics.primes(0, 1000, segment_size=10)), mathematics.sieve_of_eratosthenes(1000))
+        self.assertEqual(next(mathematics.primes(10**12, 10**12 + 1000)), 1000000000039)
+
+    def test_parallel_primes(self):
+        self.assertEqual(mathematics.parallel_primes(10_000, workers=2, segment_size=256).tolist(), mathematics.sieve_of_eratosthenes(10_000))
+        self.assertEqual(mathematics.parallel_primes(1_000_000, workers=2, count=True, segment_size=1 << 16).sum(), 78498)
+
+    def test_is_prime(self):
+        primes = set(mathematics.sieve_of_eratosthenes(10_000))
+        self.assertTrue(all(mathematics.is_prime(n) == (n in primes) for n in range(10_000)))
+        self.assertTrue(mathematics.is_prime(2**61 - 1))
+        self.assertTrue(mathematics.is_prime(2**127 - 1))
+        self.assertFalse(mathematics.is_prime(3215031751))
+        self.assertEqual(mathematics.next_prime(10**12), 1000000000039)
+
+    def test_factorize(self):
+        self.assertEqual(mathematics.factorize(2**64 + 1), {274177: 1, 67280421310721: 1})
+        self.assertEqual(mathematics.factorize(2**10 * 3**5 * 1000003**2), {2: 10, 3: 5, 1000003: 2})
+        self.assertEqual(mathematics.factorize_many([1, 12, 2**31 - 1], workers=2), [{}, {2: 2, 3: 1}, {2**31 - 1: 1}])
+
+    def test_pi_digits(self):
+        self.assertEqual(mathematics.pi_digits(0), '3')
+        self.assertEqual(mathematics.pi_digits(50), '3.14159265358979323846264338327950288419716939937510')
+        self.assertTrue(mathematics.pi_digits(767).endswith('134999999'))
+        self.assertEqual(mathematics.pi_digits(2000)[:52], mathematics.pi_digits(50))
+        self.assertEqual(''.join(map(str, islice(mathematics.pi_digit_stream(chunk_size=7), 1001))), mathematics.pi_digits(1000).replace('.', ''))
+
+    def test_digits_cache(self):
+        # a short request must not leave unverified guard digits for a longer one
+        pi, e = mathematics.pi_digits(60), mathematics.e_digits(60)
+        for digits, cache in ((mathematics.pi_digits, '__chudnovsky_cache'), (mathematics.e_digits, '__euler_cache')):
+            expected = digits(60)
+            for short in range(1, 40, 3):
+                vars(mathematics)[cache].update(terms=0, digits='', **({'P': 1, 'Q': 1, 'T': 0} if digits is mathematics.pi_digits else {'P': 0, 'Q': 1}))
+                digits(short)
+                for longer in range(short + 1, short + 12):
+                    self.assertEqual(digits(longer), expected[:longer + 2], msg=f"{short=}, {longer=}")
+        self.assertEqual(pi[:21], '3.1415926535897932384')
+        self.assertEqual(e[:21], '2.7182818284590452353')
+
+    def test_e_digits(self):
+        self.assertEqual(mathematics.e_digits(50), '2.71828182845904523536028747135266249775724709369995')
+        self.assertEqual(mathematics.e_digits(3000)[:52], mathematics.e_digits(50))
+        self.assertAlmostEqual(mathematics.euler(18), float(mathematics.e_digits(20)), places=15)
+
+    def test_series(self):
+        basel = mathematics.series(lambda k: 1 / k**2, start=1, tol=1e-12, method='richardson')
+        self.assertAlmostEqual(basel.value, math.pi**2 / 6, places=12)
+        self.assertLess(basel.terms, 10_000)
+        self.assertAlmostEqual(mathematics.series(lambda k: 0.5**k, method='aitken').value, 2, places=12)
+        self.assertGreater(mathematics.series(lambda k: 1 / k, start=1, method='none', max_terms=1000).error, 1e-12)
+        # Aitken doesn't accelerate 1/k^2, the estimate must still reflect the truncation error
+        truncated = mathematics.series(lambda k: 1 / k**2, start=1, method='aitken', max_terms=1 << 20)
+        self.assertGreater(truncated.error, abs(truncated.value - math.pi**2 / 6) / 2)
+
+    def test_monte_carlo(self):
+        estimate = mathematics.monte_carlo_pi(200_000, workers=1, seed=7, block_size=1 << 14)
+        self.assertEqual(estimate, mathematics.monte_carlo_pi(200_000, workers=2, seed=7, block_size=1 << 14))
+        self.assertLess(estimate.interval[0], math.pi)
+        self.assertGreater(estimate.interval[1], math.pi)
+        integral = mathematics.monte_carlo_integrate(lambda x: x.sum(axis=1), [(0, 1), (0, 2)], 100_000, seed=7)
+        self.assertAlmostEqual(integral.value, 3, delta=4 * integral.error)
+
+    def test_sieve_tables(self):
+        tables = mathematics.sieve_tables(13)
+        self.assertEqual(tables.spf.tolist(), [0, 1, 2, 3, 2, 5, 2, 7, 2, 3, 2, 11, 2])
+        self.assertEqual(tables.phi.tolist(), [0, 1, 1, 2, 2, 4, 2, 6, 4, 6, 4, 10, 4])
+        self.assertEqual(tables.mu.tolist(), [0, 1, -1, -1, 0, -1, 1, -1, 0, 0, 1, -1, 0])
+        self.assertEqual(tables.sigma.tolist(), [0, 1, 3, 4, 7, 6, 12, 8, 15, 13, 18, 12, 28])
+        with tempfile.TemporaryDirectory() as directory:
+            stored = mathematics.sieve_tables(10_000, directory=directory, block_size=512)
+            self.assertIsInstance(stored.phi, np.memmap)
+            self.assertEqual(mathematics.sieve_tables(100, directory=directory).sigma.tolist(), mathematics.sieve_tables(100).sigma.tolist())
+            self.assertEqual(stored.spf[2:].tolist(), [min(mathematics.factorize(k)) for k in range(2, 10_000)])
+            # a rebuild replaces the files without touching tables that are still mapped
+            larger = mathematics.sieve_tables(20_000, directory=directory)
+            self.assertEqual((len(stored.sigma), len(larger.sigma)), (10_000, 20_000))
+            self.assertEqual(larger.sigma[:10_000].tolist(), stored.sigma.tolist())
+            self.assertEqual(sorted(path.name for path in Path(directory).iterdir()), ['mu.npy', 'phi.npy', 'sigma.npy', 'spf.npy'])
+            del stored, larger
+        # an interrupted sieve leaves nothing behind that a later call would reuse
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(KeyboardInterrupt), mock.patch.dict(vars(mathematics), {'__fill_sieve_tables': mock.Mock(side_effect=KeyboardInterrupt)}):
+                mathematics.sieve_tables(100, directory=directory)
+            self.assertEqual(list(Path(directory).iterdir()), [])
+            self.assertEqual(mathematics.sieve_tables(100, directory=directory).phi.tolist(), mathematics.sieve_tables(100).phi.tolist())
@@ -1,6 +1,10 @@
+import math
+import tempfile
 import unittest
+from pathlib import Path
 
-from src.lolicon.physics import Planet, Satellite
+import numpy as np
+from src.lolicon.physics import KeplerPropagator, NBody, Planet, Satellite, solve_kepler
 
 class TestPlanet(unittest.TestCase):
     @classmethod
@@ -152,3 +156,93 @@ def test_value_error(self):
         with self.assertRaises(ValueError) as context:
             _ = styx.density
         self.assertTrue(f"Density of {styx.name} is unknown")
+
+class TestKepler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.propagator = KeplerPropagator(local_=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def test_solve_kepler(self):
+        M, e = np.linspace(-10, 10, 1001)[:, None], np.array([0, 0.2, 0.5, 0.9])
+        E = solve_kepler(M, e)
+        self.assertLess(np.abs(E - e * np.sin(E) - M).max(), 1e-12)
+        with self.assertRaises(ValueError):
+            solve_kepler(0, 1)
+
+    def test_positions(self):
+        t = np.linspace(0, 100 * 365.25, 20_001)
+        positions = self.propagator.positions(t)
+        self.assertEqual(positions.shape, (9, 3, len(t)))
+        distances = np.linalg.norm(positions, axis=1)
+        for elements, distance in zip(self.propagator.elements, distances):
+            a, e = elements.semi_major_axis, elements.eccentricity
+            self.assertTrue(np.all((distance > a * (1 - e) - 1) & (distance < a * (1 + e) + 1)), msg=elements.name)
+        # Earth at J2000 is about (-0.18, 0.97, 0) AU from the sun
+        earth = KeplerPropagator(['earth'], local_=True).positions(0)[0, :, 0] / 149_597_870.7
+        np.testing.assert_allclose(earth, [-0.177, 0.967, 0], atol=2e-3)
+        period = self.propagator.elements[3].period
+        np.testing.assert_allclose(self.propagator.positions([0, period])[3, :, 0], self.propagator.positions([0, period])[3, :, 1], atol=1)
+        # Mercury transited the sun on 2019-11-11 15:20 UT, and the equinox of 2020-03-20 03:50 UT
+        # puts Earth at 180 degrees of date, or 179.72 degrees in the J2000 ecliptic
+        x, y, _ = self.propagator.positions([7254.139, 7383.660])[[0, 2]].transpose(1, 0, 2)
+        longitudes = np.degrees(np.arctan2(y, x)) % 360
+        self.assertAlmostEqual(longitudes[0, 0], longitudes[1, 0], delta=0.2)
+        self.assertAlmostEqual(longitudes[1, 1], 179.72, delta=0.2)
+        with self.assertRaises(ValueError):
+            KeplerPropagator(['vulcan'], local_=True)
+
+class TestNBody(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pass
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def test_solar_system(self):
+        system = NBody.solar_system(local_=True)
+        self.assertEqual(system.names[:4], ['Sun', 'Mercury', 'Venus', 'Earth'])
+        self.assertLess(np.abs(system.gm @ system.velocities).max() / system.gm.sum(), 1e-12)
+        with tempfile.TemporaryDirectory() as directory:
+            result = system.run(6 * 3600, 4 * 365, every=73, target=Path(directory) / 'snapshots.npy')
+            snapshots = np.load(Path(directory) / 'snapshots.npy', mmap_mode='r')
+            self.assertEqual(snapshots.shape, (21, 10, 6))
+            np.testing.assert_allclose(snapshots[-1, :, :3], system.positions)
+        self.assertEqual(len(result.energy), 21)
+        self.assertAlmostEqual(system.time, 365 * 86400)
+        self.assertLess(result.drift, 1e-6)
+        # one Earth year later, the Earth is back close to its initial position
+        earth = NBody.solar_system(local_=True).positions[3]
+        self.assertLess(np.linalg.norm(system.positions[3] - earth), 0.02 * np.linalg.norm(earth))
+
+    def test_integrators(self):
+        moon, earth = Satellite('Moon', local_=True), Planet('Earth', local_=True)
+        gm = NBody.from_bodies([earth, moon], np.zeros((2, 3)), np.zeros((2, 3))).gm
+        self.assertAlmostEqual(gm[1], 4902.801)
+        speed = math.sqrt(gm.sum() / 384_400)
+        positions, velocities = [[0, 0, 0], [384_400, 0, 0]], [[0, -speed * gm[1] / gm.sum(), 0], [0, speed * gm[0] / gm.sum(), 0]]
+        period = 2 * math.pi * 384_400 / speed
+        for method in ('leapfrog', 'rk4'):
+            system = NBody.from_bodies([earth, moon], positions, velocities)
+            result = system.run(period / 1000, 1000, method=method, every=100)
+            self.assertLess(result.drift, 1e-5, msg=method)
+            np.testing.assert_allclose(system.positions[1] - system.positions[0], [384_400, 0, 0], atol=100)
+        with self.assertRaises(ValueError):
+            system.step(1, method='euler')
+
+    def test_barnes_hut(self):
+        rng = np.random.default_rng(0)
+        positions, velocities, gm = rng.normal(size=(3000, 3)) * 1e6, np.zeros((3000, 3)), rng.uniform(0, 1e3, 3000)
+        positions[1] = positions[0]
+        direct = NBody(positions, velocities, gm, method='direct', softening=1).accelerations()
+        tree = NBody(positions, velocities, gm, softening=1)
+        self.assertEqual(repr(tree), 'NBody(Bodies=3000, Method=barnes-hut)')
+        errors = np.linalg.norm(tree.accelerations() - direct, axis=1) / np.linalg.norm(direct, axis=1)
+        self.assertLess(np.median(errors), 1e-2)
+        exact = NBody(positions, velocities, gm, method='barnes-hut', softening=1, theta=0.01).accelerations()
+        np.testing.assert_allclose(exact, direct, rtol=1e-9, atol=1e-12 * np.abs(direct).max())